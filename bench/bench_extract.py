@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+Antes/depois da extração de prazo e salário em descrições longas: DATE_PAT
+sem portão, KEYWORD_PAT com IGNORECASE e norm() com re.sub de texto (versão
+antiga, copiada abaixo) contra dates.py/extract.py atuais.
+
+- textos de 5, 15 e 50 KB com a palavra-chave de inscrição no início, no fim
+  ou ausente (pior caso: varredura completa atrás de palavra-chave e de data)
+- mede a parte de texto do detalhe do PCI: prazo (find_deadline_text no texto
+  bruto, depois nos parágrafos), salário (summary + descrição) e find_dates
+- também o _parse_detail_html inteiro sobre bench/fixtures/pci_detail/*.html
+  (ou synthetic.pci_detail())
+- confere que as duas versões devolvem exatamente o mesmo
+
+Uso:
+    python bench/bench_extract.py [--repeat 20] [--parser html.parser]
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+from datetime import date
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "scripts"))
+sys.path.insert(0, HERE)
+
+import html_parser            # noqa: E402
+import dates                  # noqa: E402
+import extract                # noqa: E402
+import scraping_pci3 as pci   # noqa: E402
+from bench_parsers import load_pages  # noqa: E402
+import synthetic              # noqa: E402
+
+REF = date(2026, 10, 1)
+
+# como eram antes do portão: seis alternativas tentadas em cada posição
+LEGACY_DATE_PAT = re.compile(
+    r"(?<![\d/.-])(?P<iy>\d{4})-(?P<im>\d{1,2})-(?P<id>\d{1,2})(?![\d/.-])"
+    r"|(?<![\d/.,-])(?P<nd>\d{1,2})(?P<ns>[/.-])(?P<nm>\d{1,2})"
+    r"(?:(?P=ns)(?P<ny>\d{4}|\d{2}))?(?![\d/])"
+    r"|\b(?P<pd>\d{1,2})(?:º|o)?\s+de\s+(?P<pm>" + dates.PT_MONTHS + r")\b(?:\s+de\s+(?P<py>\d{4}))?"
+    r"|\b(?P<ed>\d{1,2})(?:st|nd|rd|th)?[\s-]+(?P<em>" + dates.EN_MONTHS + r")\b\.?(?:,?[\s-]+(?P<ey>\d{4}))?"
+    r"|\b(?P<fm>" + dates.EN_MONTHS + r")\.?\s+(?P<fd>\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s+(?P<fy>\d{4}))?"
+    r"|\b(?P<bd>\d{1,2})(?=\s*(?:a|à|até|ao|to|-|–)\s*\d{1,2}(?:º|o)?\s+(?:de\s+)?(?:"
+    + dates.PT_MONTHS + "|" + dates.EN_MONTHS + r")\b)",
+    flags=re.I,
+)
+
+def legacy_norm(s: str) -> str:
+    return re.sub(r"\s+", " ", (s or "").strip())
+
+class legacy_dates:
+    """dates.py com os padrões antigos, só durante o bloco."""
+    def __enter__(self):
+        self.saved = dates.DATE_PAT, dates._keyword_ends
+        dates.DATE_PAT = LEGACY_DATE_PAT
+        dates._keyword_ends = lambda text: (m.end() for m in dates.KEYWORD_PAT.finditer(text))
+
+    def __exit__(self, *exc):
+        dates.DATE_PAT, dates._keyword_ends = self.saved
+
+def text_part(raw: str, tx: str, summary: str) -> tuple:
+    deadline = dates.find_deadline_text(raw) or dates.find_deadline_text(tx) or ""
+    return (deadline, extract.salary_max(" ".join([summary, tx[:15000]])),
+            dates.find_dates(raw, REF))
+
+def make_text(size: int, where: str) -> str:
+    """Descrição de ~size bytes; `where`: início, fim ou ausente (palavra-chave)."""
+    parts, k = [], 0
+    while sum(map(len, parts)) < size:
+        parts.append(f"Remuneração de R$ {3000 + 100 * k},00 para o cargo {k}." if k % 7 == 0
+                     else synthetic.FILLER.strip())
+        k += 1
+    line = "Inscrições de 01/11/2026 a 15/12/2026."
+    if where == "início":
+        parts.insert(2, line)
+    elif where == "fim":
+        parts.append(line)
+    else:
+        parts.append("Provas em 10/01/2027.")
+    return " ".join(parts)
+
+def _parse_detail_legacy(html: str) -> tuple[str, str]:
+    """_parse_detail_html como era (copiado do scraping_pci3.py anterior; os seletores
+    são os do baseline): get_text duas vezes por parágrafo e norm() com re.sub de texto."""
+    soup = html_parser.make_soup(html)
+    article = (soup.select_one("article")
+               or soup.select_one("div#content")
+               or soup.select_one("div.content")
+               or soup.select_one("section")
+               or soup.select_one("div[id*='conteudo'], div[class*='conteudo']"))
+    if article:
+        tx = " ".join(legacy_norm(p.get_text()) for p in article.find_all(["p","li"]) if legacy_norm(p.get_text()))
+        raw = legacy_norm(article.get_text(separator=" "))
+    else:
+        tx = " ".join(legacy_norm(p.get_text()) for p in soup.find_all("p") if legacy_norm(p.get_text()))
+        raw = legacy_norm(soup.get_text())
+    deadline_text = dates.find_deadline_text(raw) or dates.find_deadline_text(tx) or ""
+    description = tx if tx else raw
+    return description[:15000], deadline_text
+
+def cpu(fn, args: list[tuple], repeat: int) -> float:
+    t0 = time.process_time()
+    for _ in range(repeat):
+        for a in args:
+            fn(*a)
+    return (time.process_time() - t0) / (repeat * len(args))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Extração de prazo/salário em descrições longas: antes x depois")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--parser", choices=html_parser.BACKENDS, default="html.parser")
+    args = ap.parse_args(argv)
+    html_parser.set_parser(args.parser)
+    same = True
+
+    print("texto             antes (µs)  depois (µs)")
+    for size in (5_000, 15_000, 50_000):
+        for where in ("início", "fim", "ausente"):
+            raw = make_text(size, where)
+            case = [(raw, raw, "Concurso público, salário até R$ 12.000,00")]
+            with legacy_dates():
+                ref_out = text_part(*case[0])
+                before = cpu(text_part, case, args.repeat) * 1e6
+            same &= ref_out == text_part(*case[0])
+            after = cpu(text_part, case, args.repeat) * 1e6
+            print(f"{size // 1000:>3} KB {where:<8} {before:12.0f} {after:12.0f}  ({before / after:.1f}x)")
+
+    pages, origin = load_pages("pci_detail", lambda: [synthetic.pci_detail(i) for i in range(10)])
+    pages = [(p,) for p in pages]
+    with legacy_dates():
+        ref_out = [_parse_detail_legacy(*p) for p in pages]
+        before = cpu(_parse_detail_legacy, pages, max(1, args.repeat // 4)) * 1000
+    same &= ref_out == [pci.parse_detail_html(*p) for p in pages]
+    after = cpu(pci.parse_detail_html, pages, max(1, args.repeat // 4)) * 1000
+    print(f"detalhe PCI ({origin}, {len(pages)} pág., {html_parser.resolve(args.parser)}): "
+          f"{before:.2f} → {after:.2f} ms/página ({before / after:.1f}x)")
+    print(f"saída : {'idêntica' if same else 'DIFERENTE'}")
+
+if __name__ == "__main__":
+    main()
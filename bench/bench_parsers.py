@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark dos backends de parsing (html_parser.py) nos caminhos de parse
+dos scrapers com BeautifulSoup.
+
+- usa as páginas gravadas em bench/fixtures/<caso>/*.html quando existem
+  (ver bench/record.py) e as páginas sintéticas de synthetic.py senão
+- mede tempo de CPU por página e confere que a saída é idêntica à do
+  html.parser (a referência)
+- pci_malformed: detalhes com <div>/<table> dentro de <p>; ali o lxml
+  perde texto do parágrafo (prazo, salário), por isso não é o padrão
+
+Uso:
+    python bench/bench_parsers.py [--repeat 5]
+"""
+
+import os
+import sys
+import time
+import glob
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "scripts"))
+sys.path.insert(0, HERE)
+
+import html_parser            # noqa: E402
+import scraping_pci3 as pci   # noqa: E402
+import scraping_ipea2 as ipea # noqa: E402
+import scraping_capes as capes  # noqa: E402
+import synthetic              # noqa: E402
+
+FIXTURES = os.path.join(HERE, "fixtures")
+
+# caso -> (função de parse sobre o HTML, páginas sintéticas de reserva)
+CASES = {
+    "pci_list":    (pci.parse_list_html, lambda: [synthetic.pci_listing()]),
+    "pci_detail":  (pci.parse_detail_html, lambda: [synthetic.pci_detail(i) for i in range(10)]),
+    "pci_malformed": (pci.parse_detail_html, synthetic.pci_detail_malformed),
+    "ipea_list":   (ipea.parse_listing_html, lambda: [synthetic.ipea_listing()]),
+    "ipea_detail": (ipea.parse_detail_html, lambda: [synthetic.ipea_detail(i) for i in range(10)]),
+    "capes":       (lambda html: capes.parse_anchors(capes.static_anchors(html)),
+                    lambda: [synthetic.capes_page()]),
+}
+
+def load_pages(case: str, fallback) -> tuple[list[str], str]:
+    files = sorted(glob.glob(os.path.join(FIXTURES, case, "*.html")))
+    if files:
+        pages = []
+        for f in files:
+            with open(f, encoding="utf-8") as fh:
+                pages.append(fh.read())
+        return pages, "fixtures"
+    return fallback(), "sintético"
+
+def cpu_per_page(fn, pages: list[str], repeat: int) -> tuple[float, list]:
+    out = [fn(p) for p in pages]  # aquecimento + saída para comparação
+    t0 = time.process_time()
+    for _ in range(repeat):
+        for p in pages:
+            fn(p)
+    return (time.process_time() - t0) / (repeat * len(pages)), out
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="CPU por página de cada backend de parsing")
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args(argv)
+
+    backends = ["html.parser"] + (["lxml"] if html_parser.resolve("auto") == "lxml" else [])
+    if len(backends) == 1:
+        print("lxml não instalado: só a referência html.parser será medida\n")
+
+    print(f"{'caso':<14} {'origem':<10} {'backend':<12} {'ms/página':>10} {'ganho':>7}  saída")
+    for case, (fn, fallback) in CASES.items():
+        pages, origin = load_pages(case, fallback)
+        ref_ms = ref_out = None
+        for b in backends:
+            html_parser.set_parser(b)
+            sec, out = cpu_per_page(fn, pages, args.repeat)
+            ms = sec * 1000
+            if ref_ms is None:
+                ref_ms, ref_out = ms, out
+            same = "idêntica" if out == ref_out else "DIFERENTE"
+            print(f"{case:<14} {origin:<10} {b:<12} {ms:>10.2f} {ref_ms / ms:>6.1f}x  {same}")
+    html_parser.set_parser(html_parser.PARSER)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Antes/depois do parse_list do PCI: texto do contêiner recalculado a cada <a>
+(versão antiga, copiada abaixo) contra o cache por linha de parse_list_html.
+
+- usa bench/fixtures/pci_list/*.html quando existe (snapshot gravado) e
+  synthetic.pci_listing() senão
+- confere que as duas versões devolvem os mesmos itens; a única diferença
+  aceita é a de propósito: item de linha compartilhada (shared, ex. o <div>
+  das notícias) fica sem o prazo da linha, que era de outro item
+
+Uso:
+    python bench/bench_pci_list.py [--repeat 5] [--parser html.parser]
+"""
+
+import os
+import sys
+import time
+import argparse
+from urllib.parse import urljoin
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "scripts"))
+sys.path.insert(0, HERE)
+
+import html_parser            # noqa: E402
+import dates                  # noqa: E402
+import scraping_pci3 as pci   # noqa: E402
+from bench_parsers import load_pages  # noqa: E402
+import synthetic              # noqa: E402
+
+def parse_list_legacy(html: str) -> list[dict]:
+    """parse_list como era: norm(parent.get_text()) + busca do prazo para cada <a>."""
+    soup = html_parser.make_soup(html)
+    candidates, seen = [], set()
+    for a in soup.select("a[href]"):
+        href = a.get("href") or ""
+        title = pci.norm(a.get_text())
+        if not href or not title:
+            continue
+        url = urljoin(pci.BASE, href) if href.startswith("/") else href
+        if not ("/noticias/" in url or "/concursos/" in url):
+            continue
+        if pci.looks_like_menu(title, url):
+            continue
+        parent = a.find_parent(["article", "li", "div"])
+        wrap_text = pci.norm(parent.get_text()) if parent else title
+        deadline_guess = dates.find_deadline_text(wrap_text)
+        key = (title.lower(), url)
+        if key in seen:
+            continue
+        seen.add(key)
+        candidates.append({
+            "title": title[:200],
+            "url": url,
+            "summary": wrap_text[:1000],
+            "deadline_guess": deadline_guess,
+        })
+        if len(candidates) >= pci.MAX_ITEMS:
+            break
+    return candidates
+
+def same_items(old: list[dict], new: list[dict]) -> bool:
+    strip = [{k: v for k, v in it.items() if k != "shared"} for it in new]
+    expected = [{**o, "deadline_guess": None} if n["shared"] else o for o, n in zip(old, new)]
+    return len(old) == len(new) and expected == strip
+
+def cpu(fn, pages: list[str], repeat: int) -> float:
+    t0 = time.process_time()
+    for _ in range(repeat):
+        for p in pages:
+            fn(p)
+    return (time.process_time() - t0) / (repeat * len(pages))
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="parse_list do PCI: antes x depois")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--parser", choices=html_parser.BACKENDS, default="html.parser")
+    args = ap.parse_args(argv)
+    html_parser.set_parser(args.parser)
+
+    pages, origin = load_pages("pci_list", lambda: [synthetic.pci_listing()])
+    same = all(same_items(parse_list_legacy(p), pci.parse_list_html(p)) for p in pages)
+    before = cpu(parse_list_legacy, pages, args.repeat) * 1000
+    after = cpu(pci.parse_list_html, pages, args.repeat) * 1000
+    print(f"origem: {origin} ({len(pages)} página(s)), parser: {html_parser.resolve(args.parser)}")
+    print(f"antes : {before:8.2f} ms/página")
+    print(f"depois: {after:8.2f} ms/página  ({before / after:.1f}x)")
+    print(f"saída : {'idêntica' if same else 'DIFERENTE'}")
+
+if __name__ == "__main__":
+    main()
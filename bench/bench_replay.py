@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+Suíte offline: roda cada scraper inteiro (listagem → detalhes → filtros →
+registros) contra páginas gravadas, sem tocar nos sites reais.
+
+- scrapers com requests (PCI, IPEA, CAPES estático): um servidor HTTP local
+  faz papel de proxy — as URLs continuam as originais (is_allowed, dedup e
+  urljoin se comportam como em produção), só trocando https por http
+- scrapers com Playwright (CAPES --mode browser, UN Careers): a página
+  gravada é servida pelo mesmo servidor como página local e o BASE do
+  scraper aponta para ela (pulados se o Playwright não estiver instalado)
+- conjunto "recorded": bench/fixtures/manifest.json, gravado por record.py;
+  conjunto "synthetic": páginas de synthetic.py (vale sem gravação nenhuma)
+- a data de hoje é congelada (data da gravação / SYNTHETIC_TODAY): filtros
+  de prazo e anos inferidos não mudam com o calendário
+- mede páginas/s (melhor de --repeat), pico de memória Python (tracemalloc,
+  numa passada à parte) e compara a saída com o JSONL de referência em
+  bench/fixtures/golden/<conjunto>/<caso>.jsonl
+
+Uso:
+    python bench/bench_replay.py                       # recorded se houver, senão synthetic
+    python bench/bench_replay.py --set synthetic --cases pci,ipea --repeat 5
+    python bench/bench_replay.py --update-golden       # aceita a saída atual como referência
+
+Sai com código 1 se alguma saída diferir da referência.
+"""
+
+import os
+import re
+import io
+import sys
+import json
+import time
+import tempfile
+import argparse
+import threading
+import tracemalloc
+import contextlib
+from datetime import date
+from urllib.parse import urljoin, urlparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "scripts"))
+sys.path.insert(0, HERE)
+
+# índice de estado, checkpoint e cache num diretório descartável
+_TMP = tempfile.mkdtemp(prefix="bench-replay-")
+os.environ["SCRAPER_STATE"] = os.path.join(_TMP, "state.sqlite")
+os.environ["SCRAPER_CACHE"] = os.path.join(_TMP, "http.sqlite")
+os.environ["SCRAPER_CHECKPOINT"] = _TMP
+
+import http_client                  # noqa: E402
+import dates                        # noqa: E402
+import scraping_pci3 as pci         # noqa: E402
+import scraping_ipea2 as ipea       # noqa: E402
+import scraping_capes as capes      # noqa: E402
+import scraping_un_careers as un    # noqa: E402
+import synthetic                    # noqa: E402
+
+FIXTURES = os.path.join(HERE, "fixtures")
+MANIFEST = os.path.join(FIXTURES, "manifest.json")
+GOLDEN = os.path.join(FIXTURES, "golden")
+SYNTHETIC_TODAY = date(2026, 10, 1)
+
+# caso -> (módulo, argumentos do scraper, fonte no manifest, usa navegador)
+CASES = {
+    "pci":           (pci, ["--no-cache", "--full"], "pci", False),
+    "ipea":          (ipea, ["--no-cache", "--full"], "ipea", False),
+    "capes":         (capes, ["--mode", "static"], "capes", False),
+    "capes_browser": (capes, ["--mode", "browser"], "capes", True),
+    "un":            (un, [], "un", True),
+}
+
+def _http(url: str) -> str:
+    return "http://" + url[len("https://"):] if url.startswith("https://") else url
+
+# ------------------------------------------------------------------ páginas
+
+def load_recorded() -> tuple[dict[str, dict[str, str]], dict[str, date]]:
+    """{fonte: {url: html}} e a data de gravação de cada fonte."""
+    with open(MANIFEST, encoding="utf-8") as f:
+        man = json.load(f)
+    pages: dict[str, dict[str, str]] = {}
+    for url, entry in man["pages"].items():
+        with open(os.path.join(FIXTURES, entry["file"]), encoding="utf-8") as f:
+            pages.setdefault(entry["source"], {})[url] = f.read()
+    return pages, {s: date.fromisoformat(d) for s, d in man["sources"].items()}
+
+def _linked(html: str, pattern: str) -> list[str]:
+    return sorted(set(re.findall(r'href="([^"]*' + pattern + r'[^"]*)"', html)))
+
+def load_synthetic() -> tuple[dict[str, dict[str, str]], dict[str, date]]:
+    """Mesmo formato de load_recorded(), com as páginas de synthetic.py
+    (menores que as do bench_parsers: as referências ficam no repositório)."""
+    listing = synthetic.pci_listing(rows=60, news=30)
+    pci_pages = {pci.LIST_URL: listing}
+    for i, href in enumerate(_linked(listing, "/noticias/")):
+        pci_pages[urljoin(pci.BASE, href)] = synthetic.pci_detail(i, paragraphs=8)
+    listing = synthetic.ipea_listing(rows=40)
+    ipea_pages = {ipea.START_URL: listing}
+    for i, href in enumerate(_linked(listing, "/bolsas-de-pesquisa-lista/")):
+        ipea_pages[urljoin(ipea.BASE, href)] = synthetic.ipea_detail(i, paragraphs=8)
+    pages = {
+        "pci": pci_pages,
+        "ipea": ipea_pages,
+        "capes": {capes.BASE: synthetic.capes_page()},
+        "un": {un.BASE + "/jobopening": synthetic.un_page()},
+    }
+    return pages, {s: SYNTHETIC_TODAY for s in pages}
+
+# ------------------------------------------------------------------ servidor
+
+class ReplayServer(ThreadingHTTPServer):
+    """Serve as páginas por URL absoluta (pedido via proxy) ou pelo caminho
+    (página local aberta pelo navegador); conta as páginas servidas."""
+    daemon_threads = True
+
+    def __init__(self, pages: dict[str, str]):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        hosts = {urlparse(u).netloc for u in pages}
+        self.by_url: dict[str, bytes] = {}
+        self.by_path: dict[str, bytes] = {}
+        for url, html in pages.items():
+            for h in hosts:  # links absolutos também passam pelo proxy
+                html = html.replace("https://" + h, "http://" + h)
+            body = html.encode("utf-8")
+            self.by_url[_http(url)] = body
+            u = urlparse(url)
+            self.by_path.setdefault(u.path + (f"?{u.query}" if u.query else ""), body)
+        self.hits = 0
+        self.lock = threading.Lock()
+        self.origin = f"http://127.0.0.1:{self.server_address[1]}"
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    def lookup(self, target: str) -> bytes | None:
+        with self.lock:
+            self.hits += 1
+        if target.startswith("http://"):
+            return self.by_url.get(target)
+        return self.by_path.get(target)
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, como nos sites reais
+    disable_nagle_algorithm = True  # cabeçalho e corpo saem em writes separados
+
+    def do_GET(self):
+        body = self.server.lookup(self.path)
+        self.send_response(200 if body is not None else 404)
+        body = body if body is not None else b"not recorded"
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+# ------------------------------------------------------------------ execução
+
+class _FrozenDate(date):
+    today_value = SYNTHETIC_TODAY
+
+    @classmethod
+    def today(cls):
+        return cls.today_value
+
+@contextlib.contextmanager
+def replaying(case: str, server: ReplayServer, today: date):
+    """Aponta o scraper do caso para o servidor local, com a data congelada."""
+    mod, _, _, browser = CASES[case]
+    saved = {(m, k): getattr(m, k) for m, k in (
+        (pci, "BASE"), (pci, "LIST_URL"), (pci, "throttle"), (ipea, "BASE"),
+        (ipea, "START_URL"), (ipea, "SLEEP_DETAIL"), (capes, "BASE"), (un, "BASE"),
+        (pci, "date"), (dates, "date"))}
+    _FrozenDate.today_value = today
+    pci.date = dates.date = _FrozenDate
+    pci.throttle, ipea.SLEEP_DETAIL = (lambda *a, **k: 0.0), 0  # sem esperas de cortesia
+    if browser:
+        capes.BASE = server.origin + urlparse(capes.BASE).path
+        un.BASE = server.origin
+    else:
+        pci.BASE, pci.LIST_URL = _http(pci.BASE), _http(pci.LIST_URL)
+        ipea.BASE, ipea.START_URL = _http(ipea.BASE), _http(ipea.START_URL)
+        capes.BASE = _http(capes.BASE)
+    http_client.use_cache(False)
+    s = http_client.session()
+    s.trust_env = False  # HTTP_PROXY/NO_PROXY do ambiente não valem aqui
+    s.proxies = {"http": server.origin}
+    try:
+        yield mod
+    finally:
+        s.proxies = {}
+        for (m, k), v in saved.items():
+            setattr(m, k, v)
+
+def run_once(case: str, server: ReplayServer, today: date) -> tuple[list[dict], float, int]:
+    """(registros, segundos, páginas servidas) de uma execução completa."""
+    mod, argv, _, _ = CASES[case]
+    with contextlib.suppress(FileNotFoundError):  # toda execução como a primeira: change = "new"
+        os.unlink(os.environ["SCRAPER_STATE"])
+    with replaying(case, server, today):
+        args = mod.parse_args(argv)
+        server.hits = 0
+        t0 = time.perf_counter()
+        with contextlib.redirect_stderr(io.StringIO()):  # linhas de stats do scraper
+            out = list(mod.scrape(args))
+        return out, time.perf_counter() - t0, server.hits
+
+def peak_memory(case: str, server: ReplayServer, today: date) -> int:
+    tracemalloc.start()
+    try:
+        run_once(case, server, today)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def golden_path(set_name: str, case: str) -> str:
+    return os.path.join(GOLDEN, set_name, f"{case}.jsonl")
+
+def compare(out: list[dict], path: str) -> str:
+    if not os.path.exists(path):
+        return "sem referência"
+    with open(path, encoding="utf-8") as f:
+        ref = [json.loads(line) for line in f if line.strip()]
+    if out == ref:
+        return "idêntica"
+    if len(out) != len(ref):
+        return f"DIFERENTE ({len(out)} registros, referência {len(ref)})"
+    i = next(i for i, (a, b) in enumerate(zip(out, ref)) if a != b)
+    keys = sorted(k for k in set(out[i]) | set(ref[i]) if out[i].get(k) != ref[i].get(k))
+    return f"DIFERENTE (registro {i}: {', '.join(keys)})"
+
+def write_golden(out: list[dict], path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for rec in out:
+            f.write(json.dumps(rec, ensure_ascii=False, sort_keys=True) + "\n")
+
+def has_playwright() -> bool:
+    try:
+        import playwright  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Scrapers completos contra páginas gravadas (offline)")
+    ap.add_argument("--set", choices=("auto", "recorded", "synthetic"), default="auto")
+    ap.add_argument("--cases", default=",".join(CASES), help="casos separados por vírgula")
+    ap.add_argument("--repeat", type=int, default=3, help="execuções cronometradas por caso")
+    ap.add_argument("--update-golden", action="store_true",
+                    help="grava a saída atual como referência")
+    args = ap.parse_args(argv)
+
+    set_name = args.set
+    if set_name == "auto":
+        set_name = "recorded" if os.path.exists(MANIFEST) else "synthetic"
+    pages, today = load_recorded() if set_name == "recorded" else load_synthetic()
+    browser_ok = has_playwright()
+
+    print(f"conjunto: {set_name}")
+    print(f"{'caso':<14} {'páginas':>7} {'s':>7} {'pág/s':>8} {'pico MB':>8}  saída")
+    failed = False
+    for case in [c.strip() for c in args.cases.split(",") if c.strip()]:
+        if case not in CASES:
+            raise SystemExit(f"caso desconhecido: {case}")
+        source, browser = CASES[case][2], CASES[case][3]
+        if source not in pages:
+            print(f"{case:<14} (sem páginas gravadas)")
+            continue
+        if browser and not browser_ok:
+            print(f"{case:<14} (Playwright não instalado)")
+            continue
+        server = ReplayServer(pages[source])
+        try:
+            best = None
+            for _ in range(max(1, args.repeat)):
+                out, sec, hits = run_once(case, server, today[source])
+                best = sec if best is None else min(best, sec)
+            peak = peak_memory(case, server, today[source])
+        finally:
+            server.shutdown()
+            server.server_close()
+        path = golden_path(set_name, case)
+        if args.update_golden:
+            write_golden(out, path)
+            result = f"referência gravada ({len(out)} registros)"
+        else:
+            result = compare(json.loads(json.dumps(out, sort_keys=True)), path)
+            failed |= result.startswith("DIFERENTE")
+        print(f"{case:<14} {hits:>7} {best:>7.3f} {hits / best:>8.1f} "
+              f"{peak / 2**20:>8.1f}  {result}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""
+Avaliação do pré-classificador local (scripts/relevance.py) sobre um conjunto
+rotulado à mão (bench/fixtures/relevance_labeled.jsonl, campo "label").
+
+Para cada limiar mostra, entre os itens que seguiriam para o LLM:
+- precisão: fração dos encaminhados que é relevante
+- recall: fração dos relevantes que foi encaminhada (perda = 1 - recall)
+- economia: fração de chamadas ao OpenAI evitadas
+
+Uso:
+    python bench/eval_relevance.py [--fixture arq.jsonl] [--thresholds 0 1 2 3 4]
+"""
+
+import os
+import sys
+import argparse
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "scripts"))
+
+import relevance  # noqa: E402
+
+FIXTURE = os.path.join(HERE, "fixtures", "relevance_labeled.jsonl")
+
+def evaluate(items: list[dict], threshold: float) -> dict:
+    tp = fp = fn = 0
+    for it in items:
+        fwd = relevance.score(it) >= threshold
+        if fwd and it["label"]:
+            tp += 1
+        elif fwd:
+            fp += 1
+        elif it["label"]:
+            fn += 1
+    sent = tp + fp
+    return {
+        "sent": sent,
+        "precision": tp / sent if sent else 0.0,
+        "recall": tp / (tp + fn) if tp + fn else 1.0,
+        "saved": 1 - sent / len(items),
+        "missed": fn,
+    }
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Precisão/recall e chamadas economizadas por limiar")
+    ap.add_argument("--fixture", default=FIXTURE)
+    ap.add_argument("--thresholds", type=float, nargs="+", default=[0, 1, 2, 3, 4, 6])
+    args = ap.parse_args(argv)
+
+    with open(args.fixture, encoding="utf-8") as f:
+        items = list(relevance.read_jsonl(f))
+    pos = sum(1 for it in items if it["label"])
+    print(f"{len(items)} itens rotulados ({pos} relevantes), limiar padrão: {relevance.THRESHOLD}")
+    print(f"{'limiar':>7} {'enviados':>9} {'precisão':>9} {'recall':>7} {'perdidos':>9} {'economia':>9}")
+    for t in args.thresholds:
+        r = evaluate(items, t)
+        mark = "  <- padrão" if t == relevance.THRESHOLD else ""
+        print(f"{t:>7.1f} {r['sent']:>9} {r['precision']:>9.0%} {r['recall']:>7.0%} "
+              f"{r['missed']:>9} {r['saved']:>9.0%}{mark}")
+
+if __name__ == "__main__":
+    main()
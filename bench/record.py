@@ -0,0 +1,161 @@
+# -*- coding: utf-8 -*-
+"""
+Grava as páginas reais que cada scraper baixa, para os benchmarks offline
+(bench_replay.py, bench_parsers.py, bench_pci_list.py).
+
+- PCI, IPEA e CAPES: roda o scraper de verdade (com os intervalos de
+  cortesia normais) e guarda o corpo de cada GET bem-sucedido — o replay
+  pede exatamente as mesmas URLs
+- UN Careers (e CAPES quando o HTML estático vem vazio): abre a página no
+  Chromium e guarda o DOM renderizado, sem <script>
+- páginas em bench/fixtures/<caso>/NNN-<slug>.html (pci_list, pci_detail,
+  ipea_list, ipea_detail, capes, un) e o índice URL → arquivo em
+  bench/fixtures/manifest.json, com a data da gravação de cada fonte;
+  *_list é tudo que a função de listagem do scraper baixou (paginação e
+  regionais também), não só a URL inicial
+- regravar uma fonte substitui só as páginas dela
+- ao final grava as referências (golden/recorded/<caso>.jsonl) pelo replay
+
+Uso:
+    python bench/record.py                          # todas as fontes
+    python bench/record.py --sources pci --max-items 40
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import threading
+from datetime import date
+from urllib.parse import urlparse
+
+import bench_replay   # prepara sys.path e os caminhos temporários de estado/cache
+from bench_replay import FIXTURES, MANIFEST, pci, ipea, capes, un
+import http_client
+
+SOURCES = ("pci", "ipea", "capes", "un")
+SCRIPT_PAT = re.compile(r"(?is)<script\b.*?</script>")
+# função do scraper que baixa as páginas de listagem (paginação e regionais incluídas)
+LIST_FETCH = {"pci": "fetch_list_page", "ipea": "fetch_listing_page"}
+
+def case_dir(source: str, url: str, listing: set[str] = frozenset()) -> str:
+    """Pasta da página: listagem = baixada pela função de LIST_FETCH, não só a URL inicial."""
+    if source in LIST_FETCH:
+        return f"{source}_list" if url in listing else f"{source}_detail"
+    return source
+
+def capture_requests(source: str, max_items: int) -> tuple[dict[str, str], set[str]]:
+    """Roda o scraper com requests; devolve ({url: html} de tudo que ele baixou,
+    URLs baixadas pela função de listagem)."""
+    mod, argv = {"pci": (pci, ["--no-cache", "--full"]),
+                 "ipea": (ipea, ["--no-cache", "--full"]),
+                 "capes": (capes, ["--mode", "static"])}[source]
+    if max_items and hasattr(mod, "MAX_ITEMS"):
+        mod.MAX_ITEMS = max_items
+    pages: dict[str, str] = {}
+    listing: set[str] = set()
+    in_list = threading.local()   # a paginação pode buscar em várias threads
+    s = http_client.session()
+    orig_get = s.get
+    fetch_name = LIST_FETCH.get(source)
+    orig_fetch = getattr(mod, fetch_name) if fetch_name else None
+
+    def get(url, **kwargs):
+        r = orig_get(url, **kwargs)
+        if r.ok:
+            pages[url] = r.text
+            if getattr(in_list, "on", False):
+                listing.add(url)
+        return r
+
+    def fetch(url):
+        in_list.on = True
+        try:
+            return orig_fetch(url)
+        finally:
+            in_list.on = False
+
+    s.get = get
+    if orig_fetch:
+        setattr(mod, fetch_name, fetch)
+    try:
+        out = list(mod.scrape(mod.parse_args(argv)))
+    finally:
+        s.get = orig_get
+        if orig_fetch:
+            setattr(mod, fetch_name, orig_fetch)
+    if source == "capes" and not out:
+        return {}, set()  # HTML estático sem chamadas: grava pelo navegador
+    return pages, listing
+
+async def _dom(pool, url: str) -> str:
+    async with pool.page() as page:
+        await page.goto(url, timeout=120000)
+        await page.wait_for_load_state("networkidle")
+        return await page.content()
+
+def capture_browser(url: str) -> dict[str, str]:
+    import browser_pool
+    return {url: SCRIPT_PAT.sub("", browser_pool.run(_dom, url))}
+
+def save(source: str, pages: dict[str, str], manifest: dict,
+         listing: set[str] = frozenset()) -> None:
+    for url, entry in list(manifest["pages"].items()):
+        if entry["source"] == source:
+            try:
+                os.unlink(os.path.join(FIXTURES, entry["file"]))
+            except FileNotFoundError:
+                pass
+            del manifest["pages"][url]
+    for n, (url, html) in enumerate(pages.items()):
+        slug = re.sub(r"[^\w-]+", "-", urlparse(url).path.rstrip("/").rsplit("/", 1)[-1])[:60]
+        rel = f"{case_dir(source, url, listing)}/{n:03d}-{slug or 'index'}.html"
+        os.makedirs(os.path.join(FIXTURES, os.path.dirname(rel)), exist_ok=True)
+        with open(os.path.join(FIXTURES, rel), "w", encoding="utf-8", newline="") as f:
+            f.write(html)
+        manifest["pages"][url] = {"source": source, "file": rel}
+    manifest["sources"][source] = date.today().isoformat()
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Grava as páginas reais dos scrapers para replay offline")
+    ap.add_argument("--sources", default=",".join(SOURCES),
+                    help="fontes separadas por vírgula (padrão: todas)")
+    ap.add_argument("--max-items", type=int, default=0,
+                    help="limita os itens da listagem (PCI/IPEA): menos páginas de detalhe")
+    ap.add_argument("--no-golden", action="store_true",
+                    help="não regrava as referências JSONL depois de gravar")
+    args = ap.parse_args(argv)
+    names = [s.strip() for s in args.sources.split(",") if s.strip()]
+    unknown = [s for s in names if s not in SOURCES]
+    if unknown:
+        raise SystemExit(f"fontes desconhecidas: {', '.join(unknown)}")
+
+    manifest = {"sources": {}, "pages": {}}
+    if os.path.exists(MANIFEST):
+        with open(MANIFEST, encoding="utf-8") as f:
+            manifest = json.load(f)
+    http_client.use_cache(False)
+
+    for name in names:
+        listing: set[str] = set()
+        if name == "un":
+            pages = capture_browser(un.BASE + "/jobopening")
+        else:
+            pages, listing = capture_requests(name, args.max_items)
+            if name == "capes" and not pages:
+                pages = capture_browser(capes.BASE)
+        save(name, pages, manifest, listing)
+        print(f"{name}: {len(pages)} páginas", file=sys.stderr)
+
+    with open(MANIFEST, "w", encoding="utf-8", newline="\n") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+
+    if not args.no_golden:
+        cases = [c for c, spec in bench_replay.CASES.items() if spec[2] in names]
+        bench_replay.main(["--set", "recorded", "--cases", ",".join(cases),
+                           "--repeat", "1", "--update-golden"])
+
+if __name__ == "__main__":
+    main()
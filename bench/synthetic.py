@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Páginas sintéticas com a mesma estrutura das fontes reais, para benchmarks
+quando não há fixtures gravadas em bench/fixtures/.
+
+- pci_listing(): linhas div.ca dentro de um div#concursos grande, mais um
+  bloco de notícias com dezenas de <a> soltos no mesmo <div> (o caso que
+  torna cara a leitura do texto do contêiner em parse_list)
+- pci_detail(), ipea_listing(), ipea_detail(), capes_page(), un_page()
+- pci_detail_malformed(): <div>/<table> dentro de <p>, como em editais
+  colados de editor de texto — onde lxml e html.parser divergem
+"""
+
+import random
+
+UFS = ("SP", "RJ", "MG", "RS", "PR", "BA", "PE", "CE", "DF", "GO")
+ORGAOS = ("Prefeitura de", "Câmara Municipal de", "Tribunal de Justiça de",
+          "Universidade Federal de", "Instituto Federal de", "Companhia de Saneamento de")
+CIDADES = ("Campinas", "Niterói", "Uberlândia", "Pelotas", "Londrina", "Feira de Santana",
+           "Caruaru", "Sobral", "Brasília", "Anápolis")
+FILLER = ("O edital prevê provas objetivas, discursivas e de títulos, além de "
+          "avaliação de saúde e investigação social para os cargos de nível superior. ")
+
+def _rng(seed: int) -> random.Random:
+    return random.Random(seed)
+
+def pci_listing(rows: int = 150, news: int = 100, seed: int = 1) -> str:
+    r = _rng(seed)
+    menu = "".join(f'<li><a href="/concursos/{reg}/">{reg.title()}</a></li>'
+                   for reg in ("nacional", "sudeste", "sul", "norte", "nordeste", "centro-oeste"))
+    body = []
+    for i in range(rows):
+        org = f"{r.choice(ORGAOS)} {r.choice(CIDADES)} {i}"
+        sal = f"{r.randrange(2000, 30000, 250):,}".replace(",", ".") + ",00"
+        d1 = r.randint(1, 28)
+        body.append(
+            f'<div class="ca"><a href="https://www.pciconcursos.com.br/noticias/concurso-{i}" '
+            f'title="{org}">{org}</a><div class="cc">{r.choice(UFS)}</div>'
+            f'<div class="cd">{r.randint(1, 90)} vagas. Analista, Técnico e Assistente. '
+            f'Até R$ {sal}<span>Superior</span></div>'
+            f'<div class="ce"><span>{d1:02d}/11/2026 a {d1:02d}/12/2026</span></div></div>')
+    links = "".join(
+        f'<a href="/noticias/edital-retificado-{i}">Edital retificado do concurso {i} '
+        f'de {r.choice(CIDADES)}</a> — inscrições até {r.randint(1, 28):02d}/12/2026. '
+        for i in range(news))
+    return ("<html><head><title>Concursos</title></head><body>"
+            f'<div id="menu"><ul>{menu}</ul></div>'
+            f'<div id="conteudo"><div class="noticias">{links}{FILLER * 100}</div>'
+            f'<div id="concursos">{"".join(body)}</div></div>'
+            "</body></html>")
+
+def pci_detail(i: int = 0, paragraphs: int = 60, seed: int = 2) -> str:
+    r = _rng(seed + i)
+    ps = []
+    for k in range(paragraphs):
+        if k == 5:
+            ps.append(f"<p>Inscrições de 01/11/2026 a {r.randint(1, 28):02d}/12/2026.</p>")
+        elif k % 7 == 0:
+            ps.append(f"<p>Remuneração de R$ {r.randrange(3000, 25000, 100)},00 para o cargo {k}.</p>")
+        else:
+            ps.append(f"<p>{FILLER}</p>")
+    items = "".join(f"<li>Cargo {k}: Analista de Sistemas</li>" for k in range(30))
+    return (f"<html><body><div id='menu'><a href='/'>Início</a></div>"
+            f"<article><h1>Concurso {i}</h1>{''.join(ps)}<ul>{items}</ul></article>"
+            "<footer>PCI Concursos</footer></body></html>")
+
+def ipea_listing(rows: int = 120, seed: int = 3) -> str:
+    r = _rng(seed)
+    lis = []
+    for i in range(rows):
+        lis.append(
+            f'<li><h4 class="result-title"><a href="/portal/bolsas-de-pesquisa-lista/item/{i}-chamada">'
+            f'Chamada Pública nº {i}/2026 — Programa de Pesquisa para o Desenvolvimento Nacional</a></h4>'
+            f'<p class="objetivo">Objetivo: apoiar estudos em análise de dados e avaliação de políticas {i}.</p>'
+            f'<p>Situação: {r.choice(("Aberta", "Encerrada", "Em andamento"))}</p>'
+            f'<p>Programa: PNPD</p><p>Ano: 2026</p>'
+            f'<p>Prazo de inscrição: {r.randint(1, 28):02d}/11/2026 a {r.randint(1, 28):02d}/12/2026</p></li>')
+    return ("<html><body><div id='content'>"
+            f'<ul class="search-resultsbolsas list-striped">{"".join(lis)}</ul>'
+            "</div></body></html>")
+
+def ipea_detail(i: int = 0, paragraphs: int = 40) -> str:
+    ps = "".join(f"<p>{FILLER}</p>" for _ in range(paragraphs))
+    return ("<html><body><main>"
+            f"<div itemprop='articleBody'><h2>Chamada {i}</h2>{ps}"
+            "<p>Período de inscrições: 10 de novembro de 2026 a 15 de dezembro de 2026.</p></div>"
+            "<div class='informacoes-bolsa'><p>Situação: Aberta</p><p>Programa: PNPD</p>"
+            "<p>Ano: 2026</p><p>Prazo: 10/11/2026 a 15/12/2026</p></div>"
+            "</main></body></html>")
+
+def capes_page(rows: int = 80) -> str:
+    lis = "".join(
+        f'<li><a href="/capes/pt-br/chamadas/chamada-{i}-2026">Chamada Pública nº {i}/2026</a> '
+        f'Inscrições até {1 + i % 28:02d}/12/2026</li>' for i in range(rows))
+    return (f"<html><body><nav>{''.join('<a href=/x>Menu</a>' for _ in range(50))}</nav>"
+            f"<div id='content'><ul>{lis}</ul></div></body></html>")
+
+def un_page(cards: int = 60, seed: int = 4) -> str:
+    r = _rng(seed)
+    divs = "".join(
+        f'<div class="job-card"><a href="/jobdetail/{250000 + i}">'
+        f'Programme Management Officer, P-{r.randint(2, 5)}</a>'
+        f'<p>Duty Station: {r.choice(("New York", "Geneva", "Nairobi", "Bangkok"))}</p>'
+        f'<p>Deadline: {r.choice(("Nov", "Dec"))} {r.randint(1, 28)}, 2026</p></div>'
+        for i in range(cards))
+    return f"<html><body><main>{divs}</main></body></html>"
+
+def pci_detail_malformed() -> list[str]:
+    return [
+        "<html><body><article><p>Inscrições<div>de 01/11/2026 a 15/12/2026</div></p>"
+        "<p>Remuneração de R$ 12.000,00.</p></article></body></html>",
+        "<html><body><article><p>Texto <table><tr><td>R$ 15.000,00</td></tr></table></p>"
+        "<p>Inscrições até 15/12/2026.</p></article></body></html>",
+    ]
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+"""
+Pool de navegador Playwright compartilhado pelos scrapers com JS (CAPES, UN Careers).
+- um único Chromium headless por execução; cada scraper pega abas emprestadas
+- o navegador só é aberto no primeiro page(): quem não precisar dele
+  (ex.: CAPES pelo caminho HTML estático) não paga a inicialização nem
+  precisa do Playwright instalado
+- imagens, fontes, CSS e mídia são bloqueados via page.route (só o DOM interessa)
+- vários scrapers podem dividir o mesmo pool em abas paralelas (ver run_all.py)
+
+Uso:
+    async def scrape_async(pool, args):
+        async with pool.page() as page:
+            await page.goto(URL)
+            ...
+    browser_pool.run(scrape_async, args)   # navegador só para este scraper
+
+    async def scrape_async(pool, args):    # versão em streaming
+        ...
+            yield rec
+    for rec in browser_pool.iterate(scrape_async, args):
+        ...                                # cada registro assim que sai
+"""
+
+import queue
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+
+# --------- Config ---------
+MAX_PAGES = 4          # abas abertas ao mesmo tempo
+HEADLESS = True
+BLOCKED_RESOURCES = {"image", "font", "stylesheet", "media"}
+# --------------------------
+
+async def _block_assets(route):
+    if route.request.resource_type in BLOCKED_RESOURCES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class BrowserPool:
+    def __init__(self, max_pages: int = MAX_PAGES, headless: bool = HEADLESS):
+        self.max_pages = max_pages
+        self.headless = headless
+        self._pw = None
+        self.browser = None
+        self.context = None
+        self._slots = asyncio.Semaphore(max_pages)
+        self._start_lock = asyncio.Lock()
+
+    async def start(self) -> "BrowserPool":
+        async with self._start_lock:
+            if self.browser is None:
+                from playwright.async_api import async_playwright
+                self._pw = await async_playwright().start()
+                self.browser = await self._pw.chromium.launch(headless=self.headless)
+                self.context = await self.browser.new_context()
+                await self.context.route("**/*", _block_assets)
+        return self
+
+    async def close(self) -> None:
+        if self.browser:
+            await self.browser.close()
+        if self._pw:
+            await self._pw.stop()
+        self.browser = self._pw = self.context = None
+
+    async def __aenter__(self):
+        return self  # start() acontece no primeiro page()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @asynccontextmanager
+    async def page(self):
+        """Empresta uma aba do contexto compartilhado (fechada ao sair)."""
+        await self.start()
+        async with self._slots:
+            page = await self.context.new_page()
+            try:
+                yield page
+            finally:
+                await page.close()
+
+def run(fn, *args):
+    """Executa um scraper assíncrono `fn(pool, *args)` com um navegador próprio."""
+    async def _main():
+        async with BrowserPool() as pool:
+            return await fn(pool, *args)
+    return asyncio.run(_main())
+
+class _Failed:
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+def iterate(fn, *args):
+    """Gerador síncrono sobre um scraper assíncrono que faz `yield` dos
+    registros (`fn(pool, *args)`), com navegador próprio: cada registro é
+    entregue assim que sai, sem esperar o fim da coleta."""
+    q: queue.Queue = queue.Queue()
+    end = object()
+
+    def worker():
+        async def _main():
+            async with BrowserPool() as pool:
+                async for rec in fn(pool, *args):
+                    q.put(rec)
+        try:
+            asyncio.run(_main())
+        except BaseException as e:
+            q.put(_Failed(e))
+        finally:
+            q.put(end)
+
+    threading.Thread(target=worker, daemon=True).start()
+    while True:
+        item = q.get()
+        if item is end:
+            return
+        if isinstance(item, _Failed):
+            raise item.exc
+        yield item
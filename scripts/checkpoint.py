@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoint de execução para os scrapers com muitas páginas de detalhe
+(PCI, IPEA): se a coleta morrer no meio, --resume retoma de onde parou.
+
+- guarda, por fonte, as URLs já concluídas e o registro emitido para cada
+  uma (None = processada mas filtrada)
+- gravação atômica: arquivo temporário + os.replace, no máximo a cada
+  FLUSH_SECONDS durante a execução e sempre ao sair (inclusive por erro)
+- execução que termina bem apaga o checkpoint
+- com --resume, URLs concluídas não são baixadas de novo: o registro
+  guardado é reemitido na mesma posição da saída
+
+Arquivo: scripts/.cache/checkpoint-<fonte>.json (ou pasta SCRAPER_CHECKPOINT).
+"""
+
+import os
+import json
+import time
+import argparse
+import tempfile
+
+# --------- Config ---------
+CHECKPOINT_DIR = os.environ.get(
+    "SCRAPER_CHECKPOINT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"),
+)
+FLUSH_SECONDS = 2.0   # intervalo mínimo entre gravações durante a execução
+# --------------------------
+
+_MISSING = object()
+
+class Checkpoint:
+    def __init__(self, source: str, resume: bool = False, directory: str = CHECKPOINT_DIR):
+        os.makedirs(directory, exist_ok=True)
+        self.path = os.path.join(directory, f"checkpoint-{source}.json")
+        self.source = source
+        self.done: dict[str, dict | None] = {}
+        self.dirty = False
+        self.last_flush = time.monotonic()
+        if resume:
+            self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return  # sem checkpoint (ou ilegível): começa do zero
+        if data.get("source") == self.source:
+            self.done = data.get("done") or {}
+
+    def __len__(self) -> int:
+        return len(self.done)
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.done
+
+    def get(self, url: str, default=None):
+        rec = self.done.get(url, _MISSING)
+        return default if rec is _MISSING else rec
+
+    def mark(self, url: str, record: dict | None) -> None:
+        """Registra `url` como concluída (com o registro emitido, se houver)."""
+        self.done[url] = record
+        self.dirty = True
+        if time.monotonic() - self.last_flush >= FLUSH_SECONDS:
+            self.save()
+
+    def save(self) -> None:
+        """Grava o estado atual de forma atômica (nunca deixa arquivo pela metade)."""
+        if not self.dirty:
+            return
+        fd, tmp = tempfile.mkstemp(prefix=".checkpoint-", dir=os.path.dirname(self.path))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"source": self.source, "saved_at": time.time(), "done": self.done},
+                          f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+        self.dirty = False
+        self.last_flush = time.monotonic()
+
+    def finish(self) -> None:
+        """Execução completa: o checkpoint não é mais necessário."""
+        self.done.clear()
+        self.dirty = False
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+def add_cli_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--resume", action="store_true",
+                    help="retoma a execução interrompida a partir do checkpoint")
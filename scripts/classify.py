@@ -0,0 +1,347 @@
+# -*- coding: utf-8 -*-
+"""
+Classificação (relevância + extração de campos) em lote e com cache,
+no lugar do nó OpenAI do n8n (uma requisição e um prompt completo POR ITEM).
+
+- agrupa BATCH_SIZE itens por requisição; o modelo devolve um resultado por
+  "id" (saída estruturada em JSON)
+- título, fonte, link, resumo, descrição e prazo (já normalizado por
+  dates.py nos scrapers) são copiados do próprio item: o modelo só devolve
+  o que precisa julgar/extrair (menos tokens de entrada e de saída)
+- cache SQLite por sha256(título + resumo + descrição) e backend: um item
+  rejeitado semana passada não é reclassificado quando reaparece
+- backends plugáveis: "openai" (API de chat completions) e "stub"
+  (determinístico e local, baseado em relevance.py; para testes)
+
+A saída tem o mesmo formato do nó OpenAI ({"message": {"content": {...}}}),
+então os nós If e Code1 do fluxo continuam iguais.
+
+Uso:
+    python run_all.py --dedup | python relevance.py | python classify.py
+    python classify.py itens.jsonl --backend stub --only-relevant
+
+Variáveis: OPENAI_API_KEY, OPENAI_MODEL, OPENAI_API_URL (servidor local/mocks).
+Cache: scripts/.cache/classify.sqlite (ou variável SCRAPER_CLASSIFY).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+import relevance
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+    sys.stdin.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+# --------- Config ---------
+CLASSIFY_PATH = os.environ.get(
+    "SCRAPER_CLASSIFY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "classify.sqlite"),
+)
+OPENAI_API_URL = os.environ.get("OPENAI_API_URL", "https://api.openai.com/v1").rstrip("/")
+OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4o")
+BATCH_SIZE = 10       # itens por requisição
+WORKERS = 3           # requisições simultâneas
+MAX_DESC = 1500       # caracteres da descrição enviados ao modelo
+TIMEOUT = 120
+PROMPT_VERSION = "2"  # mude ao alterar o prompt: invalida o cache do openai
+# --------------------------
+
+# campos copiados do item (o modelo não precisa repeti-los)
+LOCAL_FIELDS = {"title": "title", "source": "source", "link": "url",
+                "summary": "summary", "description": "description",
+                "deadline_text": "deadline", "deadline_iso_start": "deadline_iso_start",
+                "deadline_iso_end": "deadline_iso_end", "change": "change",
+                "fingerprint": "fingerprint"}
+# campos que o modelo devolve (ou o stub deduz do item)
+MODEL_FIELDS = ("kind", "location", "status", "program", "year")
+# derivados localmente: não vão no prompt
+PROMPT_SKIP = ("deadline_iso_start", "deadline_iso_end", "deadline_end_iso", "relevance_score",
+               "change", "fingerprint")
+
+SYSTEM_PROMPT = """Você é um extrator + classificador de oportunidades.
+
+Você recebe uma LISTA JSON de objetos (PCI, IPEA, CAPES, UN Careers etc.), cada um com um "id".
+Para CADA objeto:
+1) Julgue se é RELEVANTE aos temas: transformação digital, business intelligence, estatística, análise de dados, análise estatística, ciência de dados, automação de processo, tomada de decisão usando dados.
+2) EXTRAIA os campos abaixo. Use SOMENTE informações presentes no objeto. Se não houver, retorne null.
+   (Prazos já vêm normalizados no objeto: não os devolva.)
+
+RETORNE JSON EXATO com este schema, um resultado por objeto recebido:
+{
+  "results": [
+    {
+      "id": <id do objeto>,
+      "relevante": true|false,
+      "tags": ["..."],
+      "justificativa": "...",
+      "fields": {
+        "kind": "...|null",
+        "location": "...|null",
+        "status": "...|null",
+        "program": "...|null",
+        "year": "...|null"
+      }
+    }
+  ]
+}
+
+Regras:
+- Não invente. Se o valor não existir no objeto, retorne null.
+- Justificativa curta (uma frase)."""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    hash       TEXT NOT NULL,
+    backend    TEXT NOT NULL,
+    result     TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (hash, backend)
+)
+"""
+
+def item_hash(item: dict) -> str:
+    """sha256 de título + resumo + descrição (espaços normalizados)."""
+    h = hashlib.sha256()
+    for k in ("title", "summary", "description"):
+        h.update(re.sub(r"\s+", " ", str(item.get(k) or "")).strip().encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+# --------- Backends ---------
+class StubBackend:
+    """Determinístico e sem rede: relevância pelo relevance.score()."""
+    name = "stub"
+
+    def __init__(self, threshold: float = relevance.THRESHOLD):
+        self.threshold = threshold
+        self.cache_key = f"stub:{threshold}"
+
+    def classify_batch(self, items: list[dict]) -> list[dict]:
+        out = []
+        for it in items:
+            s = relevance.score(it)
+            tags = sorted({m.group(1) for k in relevance.FIELD_WEIGHTS
+                           for m in relevance.TERMS_PAT.finditer(relevance.fold(str(it.get(k) or "")))
+                           if relevance.TERMS[m.group(1)] > 0})
+            out.append({
+                "relevante": s >= self.threshold,
+                "tags": tags,
+                "justificativa": f"pontuação local {s}",
+                "fields": {
+                    "kind": it.get("kind"),
+                    "location": it.get("location") or None,
+                    "status": it.get("status"),
+                    "program": it.get("program"),
+                    "year": it.get("year"),
+                },
+            })
+        return out
+
+class OpenAIBackend:
+    """Chat completions com resposta JSON; um prompt de sistema por lote."""
+    name = "openai"
+
+    def __init__(self, model: str = OPENAI_MODEL, api_key: str | None = None):
+        api_key = api_key or os.environ.get("OPENAI_API_KEY", "")
+        if not api_key:
+            raise RuntimeError("OPENAI_API_KEY não definido")
+        self.model = model
+        self.cache_key = f"openai:{model}:{PROMPT_VERSION}"
+        retry = Retry(total=5, backoff_factor=2.0, status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=("POST",), respect_retry_after_header=True,
+                      raise_on_status=False)
+        self.s = requests.Session()
+        self.s.mount("http://", HTTPAdapter(max_retries=retry, pool_maxsize=WORKERS))
+        self.s.mount("https://", HTTPAdapter(max_retries=retry, pool_maxsize=WORKERS))
+        self.s.headers.update({"Authorization": f"Bearer {api_key}",
+                               "Content-Type": "application/json"})
+
+    @staticmethod
+    def _payload(i: int, it: dict) -> dict:
+        obj = {k: v for k, v in it.items() if v not in (None, "") and k not in PROMPT_SKIP}
+        if isinstance(obj.get("description"), str):
+            obj["description"] = obj["description"][:MAX_DESC]
+        obj["id"] = i
+        return obj
+
+    def _call(self, items: list[dict]) -> dict[int, dict]:
+        body = {
+            "model": self.model,
+            "temperature": 0,
+            "response_format": {"type": "json_object"},
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": json.dumps(
+                    [self._payload(i, it) for i, it in enumerate(items)], ensure_ascii=False)},
+            ],
+        }
+        r = self.s.post(f"{OPENAI_API_URL}/chat/completions", json=body, timeout=TIMEOUT)
+        r.raise_for_status()
+        content = r.json()["choices"][0]["message"]["content"]
+        try:
+            results = json.loads(content).get("results") or []
+        except (ValueError, AttributeError):
+            results = []
+        by_id = {}
+        for res in results:
+            if isinstance(res, dict) and isinstance(res.get("id"), int) and 0 <= res["id"] < len(items):
+                by_id[res["id"]] = res
+        return by_id
+
+    def classify_batch(self, items: list[dict]) -> list[dict | None]:
+        by_id = self._call(items)
+        missing = [i for i in range(len(items)) if i not in by_id]
+        if missing and len(items) > 1:
+            # o modelo pulou itens: uma nova tentativa só com os que faltaram
+            again = self._call([items[i] for i in missing])
+            for j, i in enumerate(missing):
+                if j in again:
+                    by_id[i] = again[j]
+        out = []
+        for i in range(len(items)):
+            res = by_id.get(i)
+            if res is not None:
+                res = {"relevante": res.get("relevante") is True,
+                       "tags": res.get("tags") or [],
+                       "justificativa": res.get("justificativa"),
+                       "fields": {k: (res.get("fields") or {}).get(k) for k in MODEL_FIELDS}}
+            out.append(res)
+        return out
+
+BACKENDS = {"openai": OpenAIBackend, "stub": StubBackend}
+
+# --------- Cache ---------
+class ResultCache:
+    def __init__(self, path: str = CLASSIFY_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=60)
+        self.db.execute(SCHEMA)
+
+    def get_many(self, hashes: list[str], backend: str) -> dict[str, dict]:
+        found = {}
+        for h in set(hashes):
+            row = self.db.execute("SELECT result FROM results WHERE hash = ? AND backend = ?",
+                                  (h, backend)).fetchone()
+            if row:
+                found[h] = json.loads(row[0])
+        return found
+
+    def put_many(self, rows: list[tuple[str, dict]], backend: str) -> None:
+        now = time.time()
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                ((h, backend, json.dumps(res, ensure_ascii=False), now) for h, res in rows))
+
+    def close(self) -> None:
+        self.db.close()
+
+# --------- Pipeline ---------
+def merge(item: dict, res: dict) -> dict:
+    """Resultado no formato do nó OpenAI, com os campos locais do item."""
+    fields = {k: item.get(src) for k, src in LOCAL_FIELDS.items()}
+    fields.update(res.get("fields") or {})
+    for k in MODEL_FIELDS:  # o que o modelo não achou, o item pode ter
+        if fields.get(k) in (None, "", "null"):
+            fields[k] = item.get(k) or None
+    content = {"relevante": bool(res.get("relevante")), "tags": res.get("tags") or [],
+               "justificativa": res.get("justificativa"), "fields": fields}
+    return {"message": {"content": content}}
+
+def classify(items: list[dict], backend, cache: ResultCache | None = None,
+             batch_size: int = BATCH_SIZE, workers: int = WORKERS) -> tuple[list, dict]:
+    """Classifica `items` (na ordem); devolve (saídas, estatísticas).
+    Itens sem resposta do backend saem como None."""
+    hashes = [item_hash(it) for it in items]
+    results = cache.get_many(hashes, backend.cache_key) if cache else {}
+    stats = {"items": len(items), "cached": sum(1 for h in hashes if h in results),
+             "requests": 0, "failed": 0}
+
+    # um item repetido no mesmo lote só é enviado uma vez
+    todo, queued = [], set()
+    for it, h in zip(items, hashes):
+        if h not in results and h not in queued:
+            queued.add(h)
+            todo.append((h, it))
+    batches = [todo[i:i + batch_size] for i in range(0, len(todo), batch_size)]
+
+    def run(batch):
+        try:
+            return batch, backend.classify_batch([it for _, it in batch])
+        except Exception as e:
+            print(f"classify: lote de {len(batch)} falhou: {e}", file=sys.stderr)
+            return batch, [None] * len(batch)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+        for batch, outs in ex.map(run, batches):
+            stats["requests"] += 1
+            fresh = [(h, res) for (h, _), res in zip(batch, outs) if res is not None]
+            results.update(fresh)
+            if cache and fresh:
+                cache.put_many(fresh, backend.cache_key)
+
+    out = []
+    for it, h in zip(items, hashes):
+        if h in results:
+            out.append(merge(it, results[h]))
+        else:
+            stats["failed"] += 1
+            out.append(None)
+    return out, stats
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Classifica o JSONL em lotes, com cache local")
+    ap.add_argument("input", nargs="?", help="arquivo JSONL (padrão: stdin)")
+    ap.add_argument("--backend", choices=sorted(BACKENDS), default="openai")
+    ap.add_argument("--model", default=OPENAI_MODEL, help="modelo do backend openai")
+    ap.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    ap.add_argument("--workers", type=int, default=WORKERS)
+    ap.add_argument("--no-cache", action="store_true", help="não lê nem grava o cache")
+    ap.add_argument("--only-relevant", action="store_true",
+                    help="emite só os itens julgados relevantes")
+    return ap.parse_args(argv)
+
+def make_backend(args):
+    if args.backend == "openai":
+        return OpenAIBackend(model=args.model)
+    return BACKENDS[args.backend]()
+
+def main(argv=None):
+    args = parse_args(argv)
+    src = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    try:
+        items = [it for it in relevance.read_jsonl(src) if "_meta" not in it]
+    finally:
+        if args.input:
+            src.close()
+
+    cache = None if args.no_cache else ResultCache()
+    try:
+        out, stats = classify(items, make_backend(args), cache, args.batch_size, args.workers)
+    finally:
+        if cache:
+            cache.close()
+    for res in out:
+        if res is None or (args.only_relevant and not res["message"]["content"]["relevante"]):
+            continue
+        print(json.dumps(res, ensure_ascii=False))
+    print(f"classify: itens={stats['items']}, cache={stats['cached']}, "
+          f"lotes={stats['requests']}, falhas={stats['failed']}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# -*- coding: utf-8 -*-
+"""
+Datas e prazos de inscrição — parser único, local e determinístico,
+compartilhado pelos scrapers (antes cada um tinha suas regex parciais e o
+LLM normalizava deadline_iso_start/deadline_iso_end).
+
+Formatos (português e inglês), todos com regex pré-compiladas:
+  07/08/2025 · 7-8-25 · 07.08.2025 · 2025-08-07
+  12 de março de 2025 · 12 de março · 1º de abril de 2025
+  March 12, 2025 · Mar 12 2025 · 12 March 2025 · 12-Mar-2025
+Intervalos: "07/08/2025 à 19/08/2025", "01/11 a 15/12/2026",
+  "10 a 20 de março de 2025", "Nov 3 - Dec 1, 2025"
+Ano ausente: herdado da outra ponta do intervalo ou inferido pela data
+de referência (hoje), escolhendo o ano que não deixa o prazo meses no passado.
+
+Uso:
+    from dates import find_deadline_text, parse_range, deadline_fields
+    txt = find_deadline_text(texto)           # "01/11/2026 a 15/12/2026"
+    start, end = parse_range(txt)             # date(2026, 11, 1), date(2026, 12, 15)
+    rec.update(deadline_fields(txt))          # deadline_iso_start / deadline_iso_end
+"""
+
+import re
+from datetime import date, timedelta
+
+# --------- Config ---------
+KEYWORD_WINDOW = 80   # caracteres entre a palavra-chave e a data
+SPAN_MAX = 80         # tamanho máximo de um intervalo ("10 de novembro de 2026 a ...")
+PAST_TOLERANCE = 180  # dias: data sem ano mais antiga que isso vai para o ano seguinte
+# --------------------------
+
+MONTHS = {
+    "janeiro": 1, "fevereiro": 2, "março": 3, "marco": 3, "abril": 4, "maio": 5,
+    "junho": 6, "julho": 7, "agosto": 8, "setembro": 9, "outubro": 10,
+    "novembro": 11, "dezembro": 12,
+    "january": 1, "february": 2, "march": 3, "april": 4, "may": 5, "june": 6,
+    "july": 7, "august": 8, "september": 9, "october": 10, "november": 11,
+    "december": 12,
+    "jan": 1, "feb": 2, "mar": 3, "apr": 4, "jun": 6, "jul": 7, "aug": 8,
+    "sep": 9, "sept": 9, "oct": 10, "nov": 11, "dec": 12,
+}
+PT_MONTHS = ("janeiro|fevereiro|março|marco|abril|maio|junho|julho|agosto|setembro|"
+             "outubro|novembro|dezembro")
+EN_MONTHS = ("january|february|march|april|may|june|july|august|september|october|"
+             "november|december|sept|jan|feb|mar|apr|jun|jul|aug|sep|oct|nov|dec")
+
+# um token de data; cada alternativa com grupos próprios. As alternativas
+# que começam por dígito ficam atrás de um único (?=\d) e a do mês em inglês
+# atrás de (?=[jfmasond]): nas posições sem dígito nem inicial de mês o
+# padrão falha no primeiro teste em vez de tentar as seis alternativas
+# (varredura completa de um texto de 10 KB ~3x mais rápida)
+DATE_PAT = re.compile(
+    r"(?=\d)(?:"
+    # ISO: 2025-08-07
+    r"(?<![\d/.-])(?P<iy>\d{4})-(?P<im>\d{1,2})-(?P<id>\d{1,2})(?![\d/.-])"
+    # numérico: 07/08/2025, 7-8-25, 07.08.2025, 01/11 (sem ano)
+    r"|(?<![\d/.,-])(?P<nd>\d{1,2})(?P<ns>[/.-])(?P<nm>\d{1,2})"
+    r"(?:(?P=ns)(?P<ny>\d{4}|\d{2}))?(?![\d/])"
+    # português: 12 de março de 2025, 1º de abril
+    r"|\b(?P<pd>\d{1,2})(?:º|o)?\s+de\s+(?P<pm>" + PT_MONTHS + r")\b(?:\s+de\s+(?P<py>\d{4}))?"
+    # inglês dia-mês: 12 March 2025, 12-Mar-2025
+    r"|\b(?P<ed>\d{1,2})(?:st|nd|rd|th)?[\s-]+(?P<em>" + EN_MONTHS + r")\b\.?(?:,?[\s-]+(?P<ey>\d{4}))?"
+    # dia solto no início de intervalo: "10 a 20 de março de 2025"
+    r"|\b(?P<bd>\d{1,2})(?=\s*(?:a|à|até|ao|to|-|–)\s*\d{1,2}(?:º|o)?\s+(?:de\s+)?(?:"
+    + PT_MONTHS + "|" + EN_MONTHS + r")\b)"
+    r")"
+    # inglês mês-dia: March 12, 2025 · Mar 12 2025 (num dígito nunca casa,
+    # então a ordem em relação às alternativas acima não muda o resultado)
+    r"|(?=[jfmasond])\b(?P<fm>" + EN_MONTHS + r")\.?\s+(?P<fd>\d{1,2})(?:st|nd|rd|th)?\b(?:,?\s+(?P<fy>\d{4}))?",
+    flags=re.I,
+)
+# o que pode separar as duas pontas de um intervalo
+CONNECTOR_PAT = re.compile(r"\s*(?:a|à|até|ao|to|until|through|-|–|—)\s*", flags=re.I)
+KEYWORD_PAT = re.compile(
+    r"inscri(?:ç|c)(?:ão|ao|ões|oes)|prazo|per[íi]odo|submiss(?:ão|ao|ões|oes)|encerramento"
+    r"|deadline|closing|closes|apply by",
+    flags=re.I,
+)
+# a mesma lista sem IGNORECASE, aplicada ao texto já em minúsculas: com re.I
+# cada posição custa bem mais (~5x numa descrição longa sem palavra-chave)
+KEYWORD_LOWER_PAT = re.compile(KEYWORD_PAT.pattern)
+WS_PAT = re.compile(r"\s+")
+
+def _parts(m: re.Match) -> tuple[int, int | None, int | None, str] | None:
+    """(dia, mês, ano, tipo) de um token; mês/ano None quando ausentes."""
+    g = m.groupdict()
+    if g["iy"]:
+        return int(g["id"]), int(g["im"]), int(g["iy"]), "iso"
+    if g["nd"]:
+        y = g["ny"]
+        if not y and g["ns"] != "/":
+            return None  # "10.5" / "3-4" sem ano não são datas
+        year = int(y) + 2000 if y and len(y) == 2 else int(y) if y else None
+        return int(g["nd"]), int(g["nm"]), year, "num"
+    for d, mo, y in (("pd", "pm", "py"), ("ed", "em", "ey"), ("fd", "fm", "fy")):
+        if g[d]:
+            return int(g[d]), MONTHS[g[mo].lower()], int(g[y]) if g[y] else None, "text"
+    return int(g["bd"]), None, None, "day"
+
+def _iter_tokens(text: str, pos: int = 0, endpos: int | None = None):
+    """Gera (match, partes) dos tokens válidos, sob demanda: quem só quer a
+    primeira data de um texto longo não paga pela varredura inteira."""
+    prev = None
+    for m in DATE_PAT.finditer(text, pos, len(text) if endpos is None else endpos):
+        p = _parts(m)
+        if not p or not 1 <= p[0] <= 31 or (p[1] is not None and not 1 <= p[1] <= 12):
+            continue
+        # numérico sem ano e dia solto só valem como início de um intervalo
+        if prev and (prev[1][2] is not None or prev[1][3] not in ("num", "day")
+                     or CONNECTOR_PAT.fullmatch(text[prev[0].end():m.start()])):
+            yield prev
+        prev = (m, p)
+    if prev and (prev[1][2] is not None or prev[1][3] not in ("num", "day")):
+        yield prev
+
+def _keyword_ends(text: str):
+    """Posição logo após cada palavra-chave de prazo, na ordem."""
+    low = text.lower()
+    if len(low) != len(text):  # minúscula com outro tamanho ("İ"): posições não batem
+        return (m.end() for m in KEYWORD_PAT.finditer(text))
+    return (m.end() for m in KEYWORD_LOWER_PAT.finditer(low))
+
+def _infer_year(d: int, mth: int, ref: date) -> int | None:
+    for y in (ref.year, ref.year + 1):
+        try:
+            if date(y, mth, d) >= ref - timedelta(days=PAST_TOLERANCE):
+                return y
+        except ValueError:
+            return None
+    return ref.year + 1
+
+def find_dates(text: str, ref: date | None = None) -> list[date]:
+    """Todas as datas do texto, na ordem, com mês/ano completados."""
+    if not text:
+        return []
+    ref = ref or date.today()
+    toks = [list(p[:3]) + [p[2] is not None] for _, p in _iter_tokens(text)]
+    # mês e ano ausentes vêm da próxima data que os tenha ("10 a 20 de março de 2025")
+    for i, t in enumerate(toks):
+        if t[1] is None or t[2] is None:
+            for nxt in toks[i + 1:]:
+                if t[1] is None and nxt[1] is not None:
+                    t[1] = nxt[1]
+                if t[2] is None and nxt[2] is not None:
+                    t[2] = nxt[2]
+                if t[1] is not None and t[2] is not None:
+                    break
+    out = []
+    for i, (d, mth, y, explicit) in enumerate(toks):
+        if mth is None:
+            continue
+        if y is None:
+            y = _infer_year(d, mth, ref)
+        try:
+            dt = date(y, mth, d)
+        except (ValueError, TypeError):
+            continue
+        # intervalo que cruza o ano: "15/12 a 10/01/2027" → início em 2026
+        if not explicit and i + 1 < len(toks) and toks[i + 1][2] == y:
+            nd, nm = toks[i + 1][0], toks[i + 1][1]
+            if nm is not None and (mth, d) > (nm, nd):
+                dt = dt.replace(year=y - 1)
+        out.append(dt)
+    return out
+
+def find_deadline_text(text: str, require_keyword: bool = False) -> str | None:
+    """Trecho da data/intervalo de inscrição, como está no texto.
+    Prefere a primeira data logo após uma palavra-chave (inscrições, prazo,
+    deadline...); sem palavra-chave, a primeira data do texto
+    (ou None com require_keyword)."""
+    if not text:
+        return None
+    for end in _keyword_ends(text):
+        toks = _iter_tokens(text, end, end + KEYWORD_WINDOW + SPAN_MAX)
+        first = next(toks, None)
+        if first and first[0].start() - end <= KEYWORD_WINDOW:
+            return _span(text, first[0], next(toks, None))
+    if require_keyword:
+        return None
+    toks = _iter_tokens(text)
+    first = next(toks, None)
+    return _span(text, first[0], next(toks, None)) if first else None
+
+def _span(text: str, first: re.Match, nxt: tuple | None) -> str:
+    end = first.end()
+    if nxt and CONNECTOR_PAT.fullmatch(text[end:nxt[0].start()]):
+        end = nxt[0].end()
+    return WS_PAT.sub(" ", text[first.start():end]).strip()
+
+def parse_range(text: str, ref: date | None = None) -> tuple[date | None, date | None]:
+    """(início, fim) do texto de prazo: menor e maior data. Com uma só data,
+    ela é o fim e o início fica None."""
+    found = find_dates(text, ref)
+    if not found:
+        return None, None
+    if len(found) == 1:
+        return None, found[0]
+    return min(found), max(found)
+
+def deadline_fields(text: str | None, ref: date | None = None) -> dict:
+    """deadline_iso_start / deadline_iso_end (AAAA-MM-DD ou None) para o registro."""
+    start, end = parse_range(text or "", ref)
+    return {"deadline_iso_start": start.isoformat() if start else None,
+            "deadline_iso_end": end.isoformat() if end else None}
+
+def is_expired(item: dict, today: date | None = None) -> bool:
+    """True se o registro tem deadline_iso_end anterior a hoje."""
+    end = item.get("deadline_iso_end")
+    if not end:
+        return False
+    try:
+        return date.fromisoformat(end) < (today or date.today())
+    except ValueError:
+        return False
@@ -0,0 +1,202 @@
+# -*- coding: utf-8 -*-
+"""
+Deduplicação local do JSONL dos scrapers contra o banco do Notion.
+
+Substitui o par NotionGet → If1 do n8n (uma consulta ao Notion POR ITEM):
+  1) sincroniza o índice local com o banco inteiro numa única varredura
+     paginada (databases/{id}/query), no máximo uma vez a cada SYNC_MAX_AGE
+  2) lê o JSONL (stdin ou arquivo) e emite só os itens cuja URL canônica
+     ainda não está no índice (mesma chave do NotionGet, que buscava pelo
+     Link) — e os que o scraper marcou como alterados (change = changed,
+     ver state_index.py), que seguem para atualizar a página existente
+  --title também descarta o item de mesmo título, mesma fonte e mesmo
+  prazo final (repostagem com outra URL); título sozinho não basta: um
+  novo edital do mesmo órgão ou vaga da ONU de mesmo nome é outro item
+
+Uso:
+    python scraping_pci3.py | python dedup.py > novos.jsonl
+    python dedup.py merged.jsonl --no-sync
+
+Sem NOTION_TOKEN/NOTION_DATABASE_ID o índice local é usado como está.
+Índice: scripts/.cache/dedup.sqlite (ou variável SCRAPER_DEDUP).
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import argparse
+import unicodedata
+import notion_api
+from state_index import canonical_url
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+    sys.stdin.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+# --------- Config ---------
+DEDUP_PATH = os.environ.get(
+    "SCRAPER_DEDUP",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "dedup.sqlite"),
+)
+SYNC_MAX_AGE = 30 * 60   # s; evita ressincronizar quando vários pipes rodam juntos
+MIN_TITLE_LEN = 20       # títulos curtos/genéricos não servem de impressão digital
+# --------------------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS seen (
+    key      TEXT PRIMARY KEY,
+    origin   TEXT NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name  TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+def title_fingerprint(title: str) -> str | None:
+    """Título sem acentos/pontuação/caixa → sha1; None se curto demais."""
+    t = unicodedata.normalize("NFKD", title or "")
+    t = "".join(c for c in t if not unicodedata.combining(c)).lower()
+    t = re.sub(r"[^a-z0-9]+", " ", t).strip()
+    if len(t) < MIN_TITLE_LEN:
+        return None
+    return hashlib.sha1(t.encode("utf-8")).hexdigest()
+
+def is_duplicate(item: dict, keys: list[str], known: set[str]) -> bool:
+    """Já visto e sem alteração de conteúdo desde a última coleta."""
+    return item.get("change") != "changed" and any(k in known for k in keys)
+
+def title_key(item: dict) -> str | None:
+    """Título + fonte + prazo final; None se faltar algum (título sozinho é fraco demais)."""
+    fp = title_fingerprint(item.get("title"))
+    source = str(item.get("source") or "").strip().lower()
+    deadline = item.get("deadline_iso_end")
+    if not (fp and source and deadline):
+        return None
+    return "title:" + hashlib.sha1(f"{fp}\x1f{source}\x1f{deadline}".encode("utf-8")).hexdigest()
+
+def item_keys(item: dict, use_title: bool = False) -> list[str]:
+    keys = []
+    url = item.get("url") or item.get("link")
+    if url:
+        keys.append("url:" + canonical_url(url))
+    tk = title_key(item) if use_title else None
+    if tk:
+        keys.append(tk)
+    return keys
+
+class DedupIndex:
+    def __init__(self, path: str = DEDUP_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path, timeout=300)
+        self.db.executescript(SCHEMA)
+
+    def last_sync(self) -> float:
+        row = self.db.execute("SELECT value FROM meta WHERE name = 'last_sync'").fetchone()
+        return float(row[0]) if row else 0.0
+
+    def sync_from_notion(self, database_id: str, token: str | None = None,
+                         max_age: float = 0) -> int | None:
+        """Recarrega as chaves vindas do Notion numa única varredura do banco.
+        Com max_age, não faz nada se outra execução sincronizou há pouco."""
+        # BEGIN IMMEDIATE serializa os dedup.py que rodam em paralelo no n8n:
+        # o primeiro sincroniza, os demais esperam e reaproveitam
+        self.db.execute("BEGIN IMMEDIATE")
+        try:
+            if max_age and time.time() - self.last_sync() <= max_age:
+                self.db.rollback()
+                return None
+            s = notion_api.session(token)
+            keys = set()
+            for page in notion_api.query_database(s, database_id):
+                # as duas chaves: --title decide depois se a de título conta
+                keys.update(item_keys(notion_api.page_fields(page), use_title=True))
+            now = time.time()
+            self.db.execute("DELETE FROM seen WHERE origin = 'notion'")
+            self.db.executemany("INSERT OR REPLACE INTO seen VALUES (?, 'notion', ?)",
+                                ((k, now) for k in keys))
+            self.db.execute("INSERT OR REPLACE INTO meta VALUES ('last_sync', ?)", (str(now),))
+            self.db.commit()
+        except BaseException:
+            self.db.rollback()
+            raise
+        return len(keys)
+
+    def known(self) -> set[str]:
+        return {k for (k,) in self.db.execute("SELECT key FROM seen")}
+
+    def remember(self, keys) -> None:
+        now = time.time()
+        with self.db:
+            self.db.executemany("INSERT OR IGNORE INTO seen VALUES (?, 'local', ?)",
+                                ((k, now) for k in keys))
+
+    def close(self) -> None:
+        self.db.close()
+
+def filter_new(lines, known: set[str], use_title: bool = False):
+    """Passo único: gera (item, chaves) só para itens ainda não vistos.
+    Duplicatas dentro do próprio lote também são descartadas."""
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except ValueError:
+            continue  # ignora linhas não-JSON (mesmo critério do Code do n8n)
+        keys = item_keys(item, use_title)
+        if not keys or is_duplicate(item, keys, known):
+            continue
+        known.update(keys)
+        yield item, keys
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Remove do JSONL os itens já presentes no Notion")
+    ap.add_argument("input", nargs="?", help="arquivo JSONL (padrão: stdin)")
+    ap.add_argument("--database-id", default=os.environ.get("NOTION_DATABASE_ID", ""))
+    ap.add_argument("--no-sync", action="store_true", help="usa só o índice local")
+    ap.add_argument("--force-sync", action="store_true",
+                    help="sincroniza mesmo se a última sync for recente")
+    ap.add_argument("--title", action="store_true",
+                    help="descarta também o item de mesmo título, fonte e prazo final "
+                         "de um já visto (padrão: só a URL)")
+    ap.add_argument("--remember", action="store_true",
+                    help="grava os itens emitidos no índice local")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    index = DedupIndex()
+
+    can_sync = args.database_id and os.environ.get("NOTION_TOKEN")
+    if can_sync and not args.no_sync:
+        n = index.sync_from_notion(args.database_id,
+                                   max_age=0 if args.force_sync else SYNC_MAX_AGE)
+        if n is not None:
+            print(f"dedup: {n} chaves sincronizadas do Notion", file=sys.stderr)
+
+    known = index.known()
+    src = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    emitted = []
+    try:
+        for item, keys in filter_new(src, known, use_title=args.title):
+            print(json.dumps(item, ensure_ascii=False))
+            emitted.extend(keys)
+    finally:
+        if args.input:
+            src.close()
+    if args.remember:
+        index.remember(emitted)
+    index.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Extração de valores do texto dos anúncios, compartilhada pelos scrapers
+(antes cada um tinha sua cópia de norm() e o PCI a do salário).
+
+- norm(): espaços normalizados com regex pré-compilada (antes re.sub com o
+  padrão em texto a cada chamada, milhares de vezes por execução)
+- salary_max(): o MAIOR valor em R$ do texto, uma passada de SAL_PAT;
+  faixa "R$ 5.000,00 a R$ 8.000,00" vale o maior
+- datas e prazos continuam em dates.py
+
+Uso:
+    from extract import norm, salary_max
+    salary_max("Remuneração de R$ 9.000 a R$ 14.000")   # 14000.0
+"""
+
+import re
+
+# R$ 12.345,67 | R$12.000 | até R$ 18.000 | R$ 9.000 a R$ 14.000
+SAL_PAT = re.compile(
+    r"R\$\s*([0-9.\s]+(?:,[0-9]{2})?)"
+    r"(?:\s*(?:a|até|-|–|ao)\s*R?\$?\s*([0-9.\s]+(?:,[0-9]{2})?))?",
+    flags=re.I
+)
+WS_PAT = re.compile(r"\s+")
+
+def norm(s: str) -> str:
+    return WS_PAT.sub(" ", (s or "").strip())
+
+def money_to_float(txt: str) -> float | None:
+    if not txt:
+        return None
+    val = txt.replace(".", "").replace(" ", "").replace("\xa0","")
+    val = val.replace(",", ".")
+    try:
+        return float(val)
+    except Exception:
+        return None
+
+def salary_max(text: str) -> float | None:
+    """Retorna o MAIOR salário (em R$) encontrado no texto."""
+    if not text:
+        return None
+    mx = None
+    for m in SAL_PAT.finditer(text):
+        a = money_to_float(m.group(1))
+        b = money_to_float(m.group(2)) if m.group(2) else None
+        cand = max([x for x in (a, b) if isinstance(x, (int,float))], default=None)
+        if cand is not None:
+            mx = cand if (mx is None or cand > mx) else mx
+    return mx
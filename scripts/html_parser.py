@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+"""
+Backend de parsing HTML compartilhado pelos scrapers com BeautifulSoup.
+- padrão: html.parser (puro Python), o de sempre
+- lxml (C, bem mais rápido) só quando pedido: SCRAPER_PARSER=lxml ou
+  --parser lxml; "auto" = lxml se instalado, html.parser senão
+- em HTML malformado os dois backends NÃO dão a mesma árvore: com <div> ou
+  <table> dentro de <p>, o lxml fecha o <p> antes e o texto (prazo, R$) sai
+  do parágrafo — o filtro de salário do PCI depende dele. Trocar o padrão
+  só depois de conferir as páginas gravadas em bench/bench_parsers.py
+
+Uso:
+    from html_parser import make_soup
+    soup = make_soup(r.text)
+"""
+
+import os
+import argparse
+from bs4 import BeautifulSoup
+
+# --------- Config ---------
+PARSER = os.environ.get("SCRAPER_PARSER", "html.parser")   # html.parser | lxml | auto
+# --------------------------
+
+BACKENDS = ("auto", "lxml", "html.parser")
+
+def _lxml_available() -> bool:
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+def resolve(name: str | None = None) -> str:
+    """Nome do backend efetivo para o BeautifulSoup."""
+    name = name or PARSER
+    if name not in BACKENDS:
+        raise ValueError(f"parser desconhecido: {name}")
+    if name == "auto":
+        return "lxml" if _lxml_available() else "html.parser"
+    return name
+
+def set_parser(name: str) -> None:
+    global _backend
+    _backend = resolve(name)
+
+_backend = resolve()
+
+def make_soup(markup: str | bytes, parser: str | None = None) -> BeautifulSoup:
+    return BeautifulSoup(markup, resolve(parser) if parser else _backend)
+
+def add_cli_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--parser", choices=BACKENDS, default=PARSER,
+                    help="backend do BeautifulSoup (padrão html.parser; "
+                         "auto = lxml se instalado)")
+
+def apply_cli_args(args: argparse.Namespace) -> None:
+    set_parser(args.parser)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+"""
+Cache HTTP persistente (SQLite) para GET condicional.
+- guarda corpo + ETag/Last-Modified das páginas que os informam
+- http_client.get() envia If-None-Match / If-Modified-Since e, no 304,
+  reaproveita o corpo guardado
+- despejo por idade (MAX_AGE_DAYS sem uso) e por tamanho total (MAX_BYTES, LRU)
+
+Arquivo padrão: scripts/.cache/http.sqlite (ou variável SCRAPER_CACHE).
+"""
+
+import os
+import time
+import json
+import sqlite3
+import threading
+
+# --------- Config ---------
+CACHE_PATH = os.environ.get(
+    "SCRAPER_CACHE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "http.sqlite"),
+)
+MAX_AGE_DAYS = 30                # entradas sem uso há mais tempo são descartadas
+MAX_BYTES = 200 * 1024 * 1024    # teto do total de corpos guardados
+# --------------------------
+
+# cabeçalhos da resposta que vale guardar junto com o corpo
+KEEP_HEADERS = ("content-type", "etag", "last-modified")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS http_cache (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    headers       TEXT NOT NULL,
+    encoding      TEXT,
+    body          BLOB NOT NULL,
+    size          INTEGER NOT NULL,
+    stored_at     REAL NOT NULL,
+    used_at       REAL NOT NULL
+)
+"""
+
+class HttpCache:
+    def __init__(self, path: str = CACHE_PATH, max_age_days: float = MAX_AGE_DAYS,
+                 max_bytes: int = MAX_BYTES):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_age = max_age_days * 86400
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(SCHEMA)
+        self.evict()
+
+    def lookup(self, url: str) -> dict | None:
+        with self.lock:
+            row = self.db.execute(
+                "SELECT etag, last_modified, headers, encoding, body FROM http_cache WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if not row:
+            return None
+        etag, last_modified, headers, encoding, body = row
+        return {
+            "etag": etag,
+            "last_modified": last_modified,
+            "headers": json.loads(headers),
+            "encoding": encoding,
+            "body": body,
+        }
+
+    def store(self, url: str, headers, encoding: str | None, body: bytes) -> None:
+        kept = {k: headers[k] for k in KEEP_HEADERS if k in headers}
+        now = time.time()
+        with self.lock, self.db:
+            self.db.execute(
+                "INSERT OR REPLACE INTO http_cache VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, kept.get("etag"), kept.get("last-modified"), json.dumps(kept),
+                 encoding, body, len(body), now, now),
+            )
+
+    def touch(self, url: str) -> None:
+        with self.lock, self.db:
+            self.db.execute("UPDATE http_cache SET used_at = ? WHERE url = ?", (time.time(), url))
+
+    def evict(self) -> None:
+        """Remove entradas velhas e, se passar de max_bytes, as menos usadas."""
+        with self.lock, self.db:
+            self.db.execute("DELETE FROM http_cache WHERE used_at < ?",
+                            (time.time() - self.max_age,))
+            total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            for url, size in self.db.execute(
+                    "SELECT url, size FROM http_cache ORDER BY used_at").fetchall():
+                self.db.execute("DELETE FROM http_cache WHERE url = ?", (url,))
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+    def close(self) -> None:
+        if self.db is None:
+            return
+        self.evict()
+        with self.lock:
+            self.db.close()
+            self.db = None
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+Cliente HTTP compartilhado pelos scrapers baseados em requests (PCI, IPEA).
+- Session keep-alive com pool de conexões (evita TCP+TLS a cada página)
+- retry com backoff exponencial em 429/5xx (respeita Retry-After)
+- timeouts configuráveis (conexão / leitura)
+- negociação gzip/deflate (+ brotli/zstd quando os pacotes estão instalados)
+- token bucket por host, para manter os limites de cortesia com os sites
+- cache em disco com GET condicional (ETag/Last-Modified), ver http_cache.py
+
+Uso:
+    from http_client import get, throttle
+    throttle(url, rate=1.5)   # opcional: espera a vez do host
+    r = get(url)              # requests.Response (raise_for_status já aplicado)
+
+O cache só é usado depois de use_cache() (os scrapers chamam via --no-cache/--refresh).
+"""
+
+import time
+import atexit
+import argparse
+import threading
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util import Retry, make_headers
+from http_cache import HttpCache
+import metrics
+
+# --------- Config ---------
+CONNECT_TIMEOUT = 10   # s
+READ_TIMEOUT    = 60   # s
+RETRIES   = 3          # tentativas extras em erro de conexão / 429 / 5xx
+BACKOFF   = 1.0        # espera 1s, 2s, 4s... entre tentativas
+POOL_SIZE = 8          # conexões mantidas por host
+# --------------------------
+
+RETRY_STATUS = (429, 500, 502, 503, 504)
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+                  "AppleWebKit/537.36 (KHTML, like Gecko) "
+                  "Chrome/123.0 Safari/537.36",
+    # inclui "br"/"zstd" só se o urllib3 conseguir decodificar
+    "Accept-Encoding": make_headers(accept_encoding=True)["accept-encoding"],
+}
+
+_session: requests.Session | None = None
+_session_lock = threading.Lock()
+
+def configure(connect_timeout: float | None = None, read_timeout: float | None = None,
+              retries: int | None = None, backoff: float | None = None,
+              pool_size: int | None = None) -> None:
+    """Ajusta timeouts/retry/pool; a Session é recriada no próximo get()."""
+    global CONNECT_TIMEOUT, READ_TIMEOUT, RETRIES, BACKOFF, POOL_SIZE, _session
+    with _session_lock:
+        if connect_timeout is not None:
+            CONNECT_TIMEOUT = connect_timeout
+        if read_timeout is not None:
+            READ_TIMEOUT = read_timeout
+        if retries is not None:
+            RETRIES = retries
+        if backoff is not None:
+            BACKOFF = backoff
+        if pool_size is not None:
+            POOL_SIZE = pool_size
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def session() -> requests.Session:
+    """Session única do processo (thread-safe para GETs simples)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            retry = Retry(
+                total=RETRIES,
+                backoff_factor=BACKOFF,
+                status_forcelist=RETRY_STATUS,
+                allowed_methods=("GET", "HEAD"),
+                respect_retry_after_header=True,
+                raise_on_status=False,  # devolve a última resposta; raise_for_status decide
+            )
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE,
+                                  max_retries=retry)
+            s = requests.Session()
+            s.headers.update(HEADERS)
+            s.mount("http://", adapter)
+            s.mount("https://", adapter)
+            _session = s
+        return _session
+
+_cache: HttpCache | None = None
+_cache_refresh = False
+
+def use_cache(enabled: bool = True, refresh: bool = False, path: str | None = None) -> None:
+    """Liga/desliga o cache em disco. refresh=True rebaixa tudo e regrava o cache."""
+    global _cache, _cache_refresh
+    if _cache is not None:
+        atexit.unregister(_cache.close)
+        _cache.close()
+        _cache = None
+    _cache_refresh = refresh
+    if enabled:
+        _cache = HttpCache(path) if path else HttpCache()
+        atexit.register(_cache.close)
+
+def add_cli_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--no-cache", action="store_true",
+                    help="não lê nem grava o cache HTTP em disco")
+    ap.add_argument("--refresh", action="store_true",
+                    help="ignora o cache na leitura (baixa tudo) mas regrava as respostas")
+
+def apply_cli_args(args: argparse.Namespace) -> None:
+    use_cache(enabled=not args.no_cache, refresh=args.refresh)
+
+def _from_cache(url: str, entry: dict) -> requests.Response:
+    r = requests.Response()
+    r.status_code = 200
+    r.url = url
+    r.headers = CaseInsensitiveDict(entry["headers"])
+    r.encoding = entry["encoding"]
+    r._content = entry["body"]
+    r.from_cache = True
+    return r
+
+def get(url: str, headers: dict | None = None,
+        timeout: float | tuple[float, float] | None = None) -> requests.Response:
+    cache = _cache
+    entry = cache.lookup(url) if cache and not _cache_refresh else None
+    if entry:
+        headers = dict(headers or {})
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+    t0 = time.perf_counter()
+    try:
+        r = session().get(url, headers=headers,
+                          timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT))
+    except requests.RequestException:
+        metrics.record_fetch(url, time.perf_counter() - t0, 0, None)
+        raise
+    # latência até o corpo chegar (stream=False: r.content já está em memória)
+    metrics.record_fetch(url, time.perf_counter() - t0, len(r.content), r.status_code,
+                         cached=bool(entry) and r.status_code == 304)
+    if entry and r.status_code == 304:
+        cache.touch(url)
+        return _from_cache(url, entry)
+    r.raise_for_status()
+    # só vale guardar o que o servidor consegue revalidar
+    if cache and ("ETag" in r.headers or "Last-Modified" in r.headers):
+        cache.store(url, r.headers, r.encoding, r.content)
+    return r
+
+class TokenBucket:
+    """Token bucket: libera `rate` requisições/s com no máximo `burst` acumuladas."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Reserva uma ficha e dorme o necessário; retorna o tempo de espera."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            self.tokens -= 1  # pode ficar negativo: quem vier depois espera mais
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            time.sleep(wait)
+        return wait
+
+_buckets: dict[str, TokenBucket] = {}
+_buckets_lock = threading.Lock()
+
+def throttle(url: str, rate: float, burst: int = 1) -> float:
+    """Espera a vez do host de `url` (o primeiro uso do host fixa rate/burst)."""
+    host = urlparse(url).netloc.lower()
+    with _buckets_lock:
+        bucket = _buckets.get(host)
+        if bucket is None:
+            bucket = _buckets[host] = TokenBucket(rate, burst)
+    wait = bucket.acquire()
+    if wait:
+        metrics.add_time("throttle", wait)
+    return wait
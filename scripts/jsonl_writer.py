@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Saída JSONL em streaming, comum a todos os scrapers e ao run_all.py.
+
+- cada registro é escrito e descarregado (flush) assim que fica pronto:
+  o próximo estágio do pipe começa a trabalhar sem esperar o fim da coleta
+- ao fechar, escreve um registro de resumo no fim do stream:
+    {"_meta": "summary", "source": "ipea", "ok": true, "records": 37, "seconds": 52.1}
+  se o scraper quebrar no meio, o resumo sai com "ok": false e "error",
+  e os registros já emitidos continuam válidos para quem consome
+- linhas com "_meta" são ignoradas pelos consumidores (Code do n8n,
+  relevance.py, classify.py, notion_sink.py)
+
+Uso:
+    with JsonlWriter(source="ipea") as out:
+        for rec in scrape(args):
+            out.write(rec)
+"""
+
+import sys
+import json
+import time
+
+class JsonlWriter:
+    def __init__(self, stream=None, source: str | None = None, summary: bool = True):
+        self.stream = stream or sys.stdout
+        self.source = source
+        self.summary = summary
+        self.records = 0
+        self.t0 = time.monotonic()
+        self.closed = False
+
+    def _line(self, obj: dict) -> None:
+        self.stream.write(json.dumps(obj, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def write(self, rec: dict) -> None:
+        """Um registro de dados (contado no resumo)."""
+        self._line(rec)
+        self.records += 1
+
+    def write_meta(self, meta: dict) -> None:
+        """Linha de controle (status etc.), fora da contagem."""
+        self._line(meta)
+
+    def close(self, error: BaseException | None = None, **extra) -> None:
+        if self.closed:
+            return
+        self.closed = True
+        if not self.summary:
+            return
+        rec = {"_meta": "summary"}
+        if self.source:
+            rec["source"] = self.source
+        rec["ok"] = error is None
+        if error is not None:
+            rec["error"] = f"{type(error).__name__}: {error}"
+        rec.update(records=self.records, seconds=round(time.monotonic() - self.t0, 2), **extra)
+        try:
+            self._line(rec)
+        except (BrokenPipeError, ValueError):
+            pass  # consumidor já fechou o pipe
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(exc)
+        return False
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+Métricas de execução compartilhadas pelos scrapers: para saber se uma
+coleta lenta é culpa da rede, do parsing, das esperas ou do navegador.
+
+- fetch: latência, bytes e status por URL (http_client.get), com totais
+- timers: tempo acumulado por etapa ("pci.parse.list", "regex.deadline",
+  "sleep", "throttle", "browser.goto"...), com contagem e máximo; tempos de
+  threads paralelas são somados (podem passar do tempo de parede)
+- filtros: itens mantidos/descartados por filtro ("pci.menu", "pci.salary",
+  "pci.deadline", "ipea.is_allowed"...)
+- resumo em JSON ao fim do processo: --stats - (stderr) ou --stats arquivo
+  (uma linha JSONL por execução, acrescentada: dá para comparar execuções)
+- --profile arquivo.prof: cProfile de todas as threads (as dos pools de
+  detalhe e de paginação e, no run_all, a de cada scraper), somadas num
+  arquivo só ao fim do processo
+
+A coleta é sempre ligada (custo desprezível); só a emissão é opcional.
+Variável SCRAPER_STATS equivale a --stats.
+
+Uso:
+    import metrics
+    with metrics.timer("pci.parse.detail"):
+        ...
+    metrics.count("pci.salary", kept=False)
+    metrics.sleep(0.7)
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import threading
+from contextlib import contextmanager
+
+# --------- Config ---------
+STATS = os.environ.get("SCRAPER_STATS", "")   # "" = não emite; "-" = stderr
+MAX_FETCHES = 2000    # URLs individuais guardadas no resumo (os totais contam todas)
+# --------------------------
+
+_lock = threading.Lock()
+_timers: dict[str, list] = {}          # nome -> [n, total, max]
+_filters: dict[str, list] = {}         # nome -> [mantidos, descartados]
+_fetches: list[dict] = []
+_fetch_tot = {"n": 0, "bytes": 0, "seconds": 0.0, "cached": 0, "errors": 0}
+_t0 = time.time()
+
+def add_time(name: str, seconds: float) -> None:
+    with _lock:
+        t = _timers.get(name)
+        if t is None:
+            t = _timers[name] = [0, 0.0, 0.0]
+        t[0] += 1
+        t[1] += seconds
+        if seconds > t[2]:
+            t[2] = seconds
+
+@contextmanager
+def timer(name: str):
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(name, time.perf_counter() - t0)
+
+def timed(name: str, fn, *args, **kwargs):
+    """fn(*args, **kwargs) com o tempo somado em `name`."""
+    t0 = time.perf_counter()
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        add_time(name, time.perf_counter() - t0)
+
+def sleep(seconds: float, name: str = "sleep") -> None:
+    time.sleep(seconds)
+    add_time(name, seconds)
+
+def count(filter_name: str, kept: bool) -> bool:
+    """Conta um item que passou (kept=True) ou foi descartado por um filtro;
+    devolve `kept` para usar direto em condições."""
+    with _lock:
+        f = _filters.get(filter_name)
+        if f is None:
+            f = _filters[filter_name] = [0, 0]
+        f[0 if kept else 1] += 1
+    return kept
+
+def record_fetch(url: str, seconds: float, nbytes: int, status: int | None,
+                 cached: bool = False) -> None:
+    with _lock:
+        _fetch_tot["n"] += 1
+        _fetch_tot["bytes"] += nbytes
+        _fetch_tot["seconds"] += seconds
+        _fetch_tot["cached"] += int(cached)
+        _fetch_tot["errors"] += int(status is None or status >= 400)
+        if len(_fetches) < MAX_FETCHES:
+            _fetches.append({"url": url, "seconds": round(seconds, 4), "bytes": nbytes,
+                             "status": status, "cached": cached})
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            "_meta": "metrics",
+            "started": round(_t0, 3),
+            "wall_seconds": round(time.time() - _t0, 3),
+            "fetch": {**_fetch_tot, "seconds": round(_fetch_tot["seconds"], 4)},
+            "timers": {k: {"n": n, "seconds": round(tot, 4), "max": round(mx, 4)}
+                       for k, (n, tot, mx) in sorted(_timers.items())},
+            "filters": {k: {"kept": a, "dropped": b} for k, (a, b) in sorted(_filters.items())},
+            "fetches": list(_fetches),
+        }
+
+def emit(dest: str | None = None) -> None:
+    """Escreve o resumo: "-" = stderr; caminho = acrescenta uma linha JSONL."""
+    dest = dest if dest is not None else STATS
+    if not dest:
+        return
+    line = json.dumps(snapshot(), ensure_ascii=False)
+    if dest == "-":
+        print(line, file=sys.stderr, flush=True)
+        return
+    if os.path.dirname(dest):
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+    with open(dest, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
+
+_profilers: list = []    # um cProfile por thread (até o 3.11 cada um só vê a sua)
+
+def _profile_thread(frame, event, arg) -> None:
+    """Gancho de threading.setprofile: liga um cProfile na thread nova."""
+    import cProfile
+    p = cProfile.Profile()
+    with _lock:
+        _profilers.append(p)
+    p.enable()
+
+def _finish(dest: str, profile: str | None) -> None:
+    if _profilers:
+        import pstats
+        threading.setprofile(None)
+        with _lock:
+            profilers = list(_profilers)
+        stats = pstats.Stats(profilers[0])
+        for p in profilers[1:]:
+            stats.add(p)
+        stats.dump_stats(profile)
+    emit(dest)
+
+def add_cli_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--stats", default=STATS, metavar="ARQ",
+                    help="resumo de métricas em JSON ao final: '-' = stderr, ou arquivo (JSONL)")
+    ap.add_argument("--profile", metavar="ARQ.prof",
+                    help="grava um cProfile de todas as threads (ver pstats/snakeviz)")
+
+def apply_cli_args(args: argparse.Namespace) -> None:
+    if getattr(args, "profile", None):
+        import cProfile
+        p = cProfile.Profile()
+        _profilers.append(p)
+        p.enable()
+        if sys.version_info < (3, 12):  # a partir do 3.12 o cProfile já vê todas as threads
+            threading.setprofile(_profile_thread)
+    atexit.register(_finish, getattr(args, "stats", STATS), getattr(args, "profile", None))
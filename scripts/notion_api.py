@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+Acesso mínimo à API do Notion usado pelos scripts de pipeline.
+- credenciais: NOTION_TOKEN e NOTION_DATABASE_ID (variáveis de ambiente)
+- NOTION_API_URL permite apontar para um servidor local (testes/mocks)
+- nomes das propriedades iguais aos do banco "Monitoramento concursos"
+- montagem de páginas (propriedades + blocos) igual à do Code1 do n8n, mas
+  sem truncar: texto longo vira blocos de parágrafo no corpo da página
+"""
+
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+
+NOTION_API_URL = os.environ.get("NOTION_API_URL", "https://api.notion.com/v1").rstrip("/")
+NOTION_VERSION = "2022-06-28"
+TIMEOUT = 60
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# limites da API
+TEXT_CHUNK = 1900      # caracteres por rich_text (limite 2000, com margem)
+MAX_CHILDREN = 100     # blocos por requisição de criação/append
+
+# propriedades do banco (mesmas chaves usadas no fluxo do n8n)
+PROP_TITLE  = "Título"
+PROP_SOURCE = "Fonte"
+PROP_LINK   = "Link"
+PROP_KIND   = "Tipo"
+PROP_SUMMARY = "Resumo"
+PROP_DESCRIPTION = "Descrição completa"
+PROP_DEADLINE = "Prazo"
+PROP_COLLECTED = "Data de coleta"
+
+def session(token: str | None = None,
+            retry_statuses: tuple = RETRY_STATUSES) -> requests.Session:
+    token = token or os.environ.get("NOTION_TOKEN", "")
+    if not token:
+        raise RuntimeError("NOTION_TOKEN não definido")
+    # a consulta ao banco é um POST idempotente: pode repetir em 429/5xx
+    # (quem cria páginas passa retry_statuses=() e trata 429 por conta própria)
+    # Sem retry_statuses, só falha de CONEXÃO é repetida aqui (a requisição
+    # não saiu); timeout de leitura ou conexão caída vão para quem chamou:
+    # um POST /pages repetido às cegas cria a página duas vezes
+    retry = Retry(total=5, backoff_factor=1.0, status_forcelist=retry_statuses,
+                  allowed_methods=("GET", "POST"),
+                  read=None if retry_statuses else False,
+                  # urllib3 repete 429 com Retry-After mesmo fora da lista
+                  respect_retry_after_header=bool(retry_statuses),
+                  raise_on_status=False)
+    s = requests.Session()
+    s.mount("http://", HTTPAdapter(max_retries=retry))
+    s.mount("https://", HTTPAdapter(max_retries=retry))
+    s.headers.update({
+        "Authorization": f"Bearer {token}",
+        "Notion-Version": NOTION_VERSION,
+        "Content-Type": "application/json",
+    })
+    return s
+
+def query_database(s: requests.Session, database_id: str, page_size: int = 100):
+    """Itera sobre todas as páginas do banco (paginação por start_cursor)."""
+    body = {"page_size": page_size}
+    while True:
+        r = s.post(f"{NOTION_API_URL}/databases/{database_id}/query", json=body, timeout=TIMEOUT)
+        r.raise_for_status()
+        data = r.json()
+        yield from data.get("results", [])
+        if not data.get("has_more"):
+            break
+        body["start_cursor"] = data.get("next_cursor")
+
+def link_query(url: str) -> dict:
+    """Corpo de databases/{id}/query que acha a página pelo Link."""
+    return {"filter": {"property": PROP_LINK, "url": {"equals": url}}, "page_size": 1}
+
+def page_fields(page: dict) -> dict:
+    """Extrai título, fonte, link e prazo final de uma página do banco."""
+    props = page.get("properties") or {}
+    title = "".join(t.get("plain_text") or (t.get("text") or {}).get("content", "")
+                    for t in (props.get(PROP_TITLE) or {}).get("title") or [])
+    source = ((props.get(PROP_SOURCE) or {}).get("select") or {}).get("name")
+    link = (props.get(PROP_LINK) or {}).get("url")
+    deadline = (props.get(PROP_DEADLINE) or {}).get("date") or {}
+    return {"title": title, "source": source, "url": link,
+            "deadline_iso_end": deadline.get("end") or deadline.get("start")}
+
+def chunks(text: str | None, n: int = TEXT_CHUNK) -> list[str]:
+    t = str(text or "")
+    return [t[i:i + n] for i in range(0, len(t), n)]
+
+def rich_text(text: str | None) -> list[dict]:
+    return [{"text": {"content": c}} for c in chunks(text)]
+
+def paragraph_blocks(text: str | None) -> list[dict]:
+    """Texto inteiro como blocos de parágrafo (um por pedaço de TEXT_CHUNK)."""
+    return [{"object": "block", "type": "paragraph",
+             "paragraph": {"rich_text": [{"type": "text", "text": {"content": c}}]}}
+            for c in chunks(text)]
+
+def page_properties(f: dict, collected: str | None = None) -> dict:
+    """Propriedades do banco a partir dos campos do item (mesmo mapeamento do
+    Code1/Notion do n8n). A descrição completa vai no corpo da página; a
+    propriedade guarda só o primeiro pedaço."""
+    props = {
+        PROP_TITLE: {"title": [{"text": {"content": str(f.get("title") or "Sem título")[:200]}}]},
+        PROP_SOURCE: {"select": {"name": str(f.get("source") or "—")}},
+        PROP_KIND: {"select": {"name": str(f.get("kind") or "N/D")}},
+    }
+    link = f.get("link") or f.get("url")
+    if link:
+        props[PROP_LINK] = {"url": link}
+    if f.get("summary"):
+        props[PROP_SUMMARY] = {"rich_text": rich_text(f["summary"])[:MAX_CHILDREN]}
+    if f.get("description"):
+        props[PROP_DESCRIPTION] = {"rich_text": rich_text(f["description"])[:1]}
+    start, end = f.get("deadline_iso_start"), f.get("deadline_iso_end")
+    if start or end:
+        props[PROP_DEADLINE] = {"date": {"start": start or end, "end": end if start else None}}
+    if collected:
+        props[PROP_COLLECTED] = {"date": {"start": collected}}
+    return props
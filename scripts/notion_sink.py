@@ -0,0 +1,314 @@
+# -*- coding: utf-8 -*-
+"""
+Gravação em lote no Notion (substitui os nós Code1 → Notion do n8n, que
+criavam uma página por vez e perdiam a descrição além do 2º/3º pedaço).
+
+- lê o JSONL final: saída do classify.py ({"message": {"content": ...}},
+  só os relevantes) ou registros crus dos scrapers
+- cria as páginas com WORKERS requisições simultâneas, dentro do limite
+  médio da API (RATE req/s, token bucket compartilhado)
+- 429: respeita Retry-After e pausa TODAS as threads, não só a que levou
+  o 429; a mesma requisição é repetida até MAX_ATTEMPTS vezes
+- criação e append não são idempotentes: só são reenviados após 429 ou
+  falha de conexão; depois de um timeout de leitura a página é procurada
+  pelo Link antes de reenviar (a primeira criação pode ter chegado)
+- descrição completa no corpo da página, em blocos de parágrafo
+  (100 na criação e o resto por PATCH blocks/{id}/children), sem truncar
+- item marcado como alterado pelo scraper (change = changed: prazo, situação,
+  salário ou descrição mudaram) atualiza as propriedades da página que já
+  tem o mesmo Link, em vez de criar outra; sem página, cria normalmente.
+  Se a descrição mudou, os parágrafos do corpo são trocados (apaga os
+  antigos, acrescenta os novos); se isso falhar no meio, o item sai como
+  partial, não updated
+- emite um resultado JSONL por item: created | updated | partial | failed | skipped
+- created/updated confirmam a entrega no índice de estado (state_index.confirm):
+  só então o item deixa de sair como new/changed nas próximas coletas
+
+Uso:
+    python classify.py --only-relevant < itens.jsonl | python notion_sink.py
+    NOTION_API_URL=http://127.0.0.1:8766/v1 python notion_sink.py final.jsonl
+
+Requer NOTION_TOKEN e NOTION_DATABASE_ID (ou --database-id).
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from urllib3.exceptions import ConnectTimeoutError
+
+import notion_api
+import state_index
+from http_client import TokenBucket
+from relevance import read_jsonl
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+    sys.stdin.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+# --------- Config ---------
+WORKERS = 3          # páginas criadas em paralelo
+RATE = 3.0           # req/s em média (limite documentado da API do Notion)
+BURST = 3
+MAX_ATTEMPTS = 6     # tentativas por requisição (429 / erro de rede)
+RETRY_AFTER_DEFAULT = 1.0
+# --------------------------
+
+class Unconfirmed(Exception):
+    """Requisição não idempotente que pode ter chegado ao servidor sem resposta."""
+    def __init__(self, attempts: int, error: str):
+        super().__init__(error)
+        self.attempts = attempts
+
+def never_sent(e: Exception) -> bool:
+    """True se a requisição com certeza não saiu (conexão recusada / sem conectar)."""
+    if isinstance(e, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(e.args[0], "reason", None) if e.args else None
+    return isinstance(e, requests.exceptions.ConnectionError) and isinstance(reason, ConnectTimeoutError)
+
+def item_fields(item: dict) -> dict | None:
+    """Campos da página; None para itens que não devem ir ao Notion."""
+    if "_meta" in item:
+        return None
+    content = (item.get("message") or {}).get("content")
+    if content is not None:
+        if not content.get("relevante"):
+            return None
+        return content.get("fields") or {}
+    return {**item, "link": item.get("url") or item.get("link"),
+            "deadline_text": item.get("deadline")}
+
+class NotionWriter:
+    def __init__(self, database_id: str, token: str | None = None,
+                 rate: float = RATE, burst: int = BURST, max_attempts: int = MAX_ATTEMPTS):
+        if not database_id:
+            raise RuntimeError("NOTION_DATABASE_ID não definido")
+        self.database_id = database_id
+        # sem retry automático por status: 429 é tratado aqui, com pausa global
+        self.s = notion_api.session(token, retry_statuses=())
+        self.bucket = TokenBucket(rate, burst)
+        self.max_attempts = max_attempts
+        self.pause_until = 0.0
+        self.lock = threading.Lock()
+        self.rate_limited = 0
+        self.collected = date.today().isoformat()
+
+    def _wait_pause(self) -> None:
+        while True:
+            with self.lock:
+                wait = self.pause_until - time.monotonic()
+            if wait <= 0:
+                return
+            time.sleep(wait)
+
+    def _send(self, method: str, path: str, body: dict | None, idempotent: bool = True):
+        """Uma chamada à API; devolve (resposta ou None, tentativas, erro).
+        Não idempotente: erro depois do envio levanta Unconfirmed em vez de repetir."""
+        err = None
+        for attempt in range(1, self.max_attempts + 1):
+            self._wait_pause()
+            self.bucket.acquire()
+            try:
+                r = self.s.request(method, f"{notion_api.NOTION_API_URL}{path}",
+                                   json=body, timeout=notion_api.TIMEOUT)
+            except Exception as e:
+                err = str(e)
+                if not idempotent and not never_sent(e):
+                    raise Unconfirmed(attempt, err)
+                time.sleep(min(2 ** attempt, 30))
+                continue
+            if r.status_code != 429:
+                return r, attempt, None
+            try:
+                retry_after = float(r.headers.get("Retry-After") or RETRY_AFTER_DEFAULT)
+            except ValueError:
+                retry_after = RETRY_AFTER_DEFAULT
+            with self.lock:
+                self.rate_limited += 1
+                self.pause_until = max(self.pause_until, time.monotonic() + retry_after)
+            err = "429 rate_limited"
+        return None, self.max_attempts, err
+
+    def _find_page(self, link: str) -> tuple[str | None, int, str | None]:
+        """(id da página com esse Link ou None, tentativas, erro)."""
+        r, attempts, err = self._send("POST", f"/databases/{self.database_id}/query",
+                                      notion_api.link_query(link))
+        if r is None or not r.ok:
+            return None, attempts, err or f"HTTP {r.status_code}: {r.text[:300]}"
+        pages = r.json().get("results") or []
+        return (pages[0].get("id") if pages else None), attempts, None
+
+    def _create(self, body: dict, link: str | None) -> tuple[str | None, int, str | None]:
+        """POST /pages sem duplicar; devolve (id da página ou None, tentativas, erro)."""
+        attempts, err = 0, None
+        while attempts < self.max_attempts:
+            try:
+                r, n, err = self._send("POST", "/pages", body, idempotent=False)
+            except Unconfirmed as u:
+                attempts += u.attempts
+                err = str(u)
+                if not link:
+                    break  # sem Link não há como conferir: melhor falhar que duplicar
+                page_id, n, find_err = self._find_page(link)
+                attempts += n
+                if page_id:
+                    return page_id, attempts, None  # a criação tinha chegado
+                if find_err:
+                    return None, attempts, f"{err}; busca pelo Link: {find_err}"
+                continue
+            attempts += n
+            if r is None or not r.ok:
+                return None, attempts, err or f"HTTP {r.status_code}: {r.text[:300]}"
+            return r.json().get("id"), attempts, None
+        return None, attempts, err
+
+    def _append(self, page_id: str, blocks: list[dict]) -> tuple[int, int, str | None]:
+        """Acrescenta os blocos em lotes de MAX_CHILDREN; (blocos gravados, tentativas, erro)."""
+        attempts = 0
+        for i in range(0, len(blocks), notion_api.MAX_CHILDREN):
+            try:
+                r, n, err = self._send("PATCH", f"/blocks/{page_id}/children",
+                                       {"children": blocks[i:i + notion_api.MAX_CHILDREN]},
+                                       idempotent=False)
+            except Unconfirmed as u:  # reenviar poderia duplicar os blocos
+                r, n, err = None, u.attempts, f"não confirmado: {u}"
+            attempts += n
+            if r is None or not r.ok:
+                return i, attempts, err or f"HTTP {r.status_code}: {r.text[:300]}"
+        return len(blocks), attempts, None
+
+    def _paragraphs(self, page_id: str) -> tuple[list[dict] | None, int, str | None]:
+        """Blocos de parágrafo do corpo da página (todas as páginas da listagem)."""
+        found, attempts, cursor = [], 0, None
+        while True:
+            path = f"/blocks/{page_id}/children?page_size=100"
+            r, n, err = self._send("GET", path + (f"&start_cursor={cursor}" if cursor else ""), None)
+            attempts += n
+            if r is None or not r.ok:
+                return None, attempts, err or f"HTTP {r.status_code}: {r.text[:300]}"
+            data = r.json()
+            found += [b for b in data.get("results") or [] if b.get("type") == "paragraph"]
+            cursor = data.get("next_cursor")
+            if not data.get("has_more") or not cursor:
+                return found, attempts, None
+
+    def _replace_body(self, page_id: str, description: str | None) -> tuple[int, str | None]:
+        """Troca os parágrafos do corpo pela descrição nova, se ela mudou; (tentativas, erro)."""
+        old, attempts, err = self._paragraphs(page_id)
+        if err:
+            return attempts, f"leitura do corpo: {err}"
+        text = "".join(t.get("plain_text") or (t.get("text") or {}).get("content", "")
+                       for b in old for t in b["paragraph"].get("rich_text") or [])
+        if text == str(description or ""):
+            return attempts, None
+        for b in old:
+            r, n, err = self._send("DELETE", f"/blocks/{b['id']}", None)
+            attempts += n
+            if r is None or not (r.ok or r.status_code == 404):
+                return attempts, f"remoção do corpo antigo: {err or f'HTTP {r.status_code}: {r.text[:300]}'}"
+        blocks = notion_api.paragraph_blocks(description)
+        done, n, err = self._append(page_id, blocks)
+        attempts += n
+        if err:
+            return attempts, f"corpo novo ({done}/{len(blocks)} blocos): {err}"
+        return attempts, None
+
+    def update(self, f: dict) -> dict | None:
+        """Atualiza as propriedades da página com o mesmo Link e, se a descrição
+        mudou, o corpo; None se a página não existe. A data de coleta fica."""
+        res = {"title": f.get("title"), "url": f.get("link") or f.get("url")}
+        if not res["url"]:
+            return None
+        page_id, attempts, err = self._find_page(res["url"])
+        if err:
+            return {**res, "status": "failed", "attempts": attempts, "error": err}
+        if not page_id:
+            return None
+        r, n, err = self._send("PATCH", f"/pages/{page_id}",
+                               {"properties": notion_api.page_properties(f)})
+        attempts += n
+        if r is None or not r.ok:
+            return {**res, "status": "failed", "page_id": page_id, "attempts": attempts,
+                    "error": err or f"HTTP {r.status_code}: {r.text[:300]}"}
+        n, err = self._replace_body(page_id, f.get("description"))
+        attempts += n
+        if err:  # propriedades novas, corpo antigo ou pela metade
+            return {**res, "status": "partial", "page_id": page_id, "attempts": attempts,
+                    "error": err}
+        return {**res, "status": "updated", "page_id": page_id, "attempts": attempts}
+
+    def write(self, f: dict) -> dict:
+        if f.get("change") == "changed":
+            updated = self.update(f)
+            if updated is not None:
+                return updated
+        res = {"title": f.get("title"), "url": f.get("link") or f.get("url")}
+        blocks = notion_api.paragraph_blocks(f.get("description"))
+        body = {
+            "parent": {"database_id": self.database_id},
+            "properties": notion_api.page_properties(f, self.collected),
+            "children": blocks[:notion_api.MAX_CHILDREN],
+        }
+        page_id, attempts, err = self._create(body, res["url"])
+        if not page_id:
+            return {**res, "status": "failed", "attempts": attempts, "error": err}
+        done, n, err = self._append(page_id, blocks[notion_api.MAX_CHILDREN:])
+        attempts += n
+        if err:
+            return {**res, "status": "partial", "page_id": page_id, "attempts": attempts,
+                    "blocks": min(len(blocks), notion_api.MAX_CHILDREN) + done, "error": err}
+        return {**res, "status": "created", "page_id": page_id, "attempts": attempts,
+                "blocks": len(blocks)}
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Cria no Notion as páginas do JSONL final")
+    ap.add_argument("input", nargs="?", help="arquivo JSONL (padrão: stdin)")
+    ap.add_argument("--database-id", default=os.environ.get("NOTION_DATABASE_ID", ""))
+    ap.add_argument("--workers", type=int, default=WORKERS)
+    ap.add_argument("--rate", type=float, default=RATE, help="requisições/s em média")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    src = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    try:
+        items = list(read_jsonl(src))
+    finally:
+        if args.input:
+            src.close()
+
+    writer = NotionWriter(args.database_id, rate=args.rate)
+    stats = {"created": 0, "updated": 0, "partial": 0, "failed": 0, "skipped": 0}
+
+    def run(item):
+        f = item_fields(item)
+        if f is None:
+            if "_meta" in item:
+                return None
+            content = (item.get("message") or {}).get("content") or {}
+            return {"title": (content.get("fields") or item).get("title"), "status": "skipped"}
+        return writer.write(f)
+
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as ex:
+        for item, res in zip(items, ex.map(run, items)):  # resultados na ordem da entrada
+            if res is None:
+                continue
+            stats[res["status"]] += 1
+            f = item_fields(item) or {}
+            if res["status"] in ("created", "updated") and res.get("url") and f.get("fingerprint"):
+                state_index.confirm(res["url"], f["fingerprint"])
+            print(json.dumps(res, ensure_ascii=False), flush=True)
+    print("notion: " + ", ".join(f"{k}={v}" for k, v in stats.items())
+          + f", 429={writer.rate_limited}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
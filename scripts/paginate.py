@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Varredura de páginas de listagem (paginação, listagens regionais) com
+busca concorrente, compartilhada pelo PCI e pelo IPEA.
+
+- começa pelas páginas iniciais e segue os links de listagem que cada página
+  traz (parse_page devolve itens + links), cada URL uma única vez
+- até `workers` páginas baixadas ao mesmo tempo; o limite de cortesia por
+  host continua no throttle() de quem baixa
+- orçamento global de itens (max_items) e de páginas (max_pages)
+- página que não traz nenhum item novo não tem seus links seguidos: a
+  paginação para sozinha quando começa a repetir ou vem vazia
+- resultados consumidos na ordem de descoberta: a lista de itens (e a
+  saída do scraper) é determinística, não depende de qual página chega antes
+
+Uso:
+    items, pages = paginate.crawl([LIST_URL], fetch_list_page,
+                                  max_pages=20, max_items=200, workers=3, name="pci")
+"""
+
+import argparse
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+
+def crawl(seeds: list[str], parse_page, max_pages: int, max_items: int,
+          workers: int = 3, key=lambda it: it["url"], name: str = "list") -> tuple[list[dict], int]:
+    """parse_page(url) -> (itens, links de listagem). Devolve (itens únicos, páginas lidas).
+    Erro numa página inicial é propagado; nas demais, a página é só pulada."""
+    queue = deque(dict.fromkeys(seeds))
+    seen_pages = set(queue)
+    seen_items: set = set()
+    items: list[dict] = []
+    submitted = done = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        inflight: deque = deque()
+        while queue or inflight:
+            while queue and len(inflight) < max(1, workers) and submitted < max_pages:
+                url = queue.popleft()
+                inflight.append((url, pool.submit(parse_page, url)))
+                submitted += 1
+            if not inflight:
+                break
+            url, job = inflight.popleft()
+            done += 1
+            try:
+                page_items, links = job.result()
+            except Exception:
+                if url in seeds:
+                    raise
+                metrics.count(f"{name}.list_page", kept=False)
+                continue
+            new = 0
+            for it in page_items:
+                k = key(it)
+                if k in seen_items:
+                    continue
+                seen_items.add(k)
+                items.append(it)
+                new += 1
+                if len(items) >= max_items:
+                    break
+            metrics.count(f"{name}.list_page", kept=new > 0)
+            if len(items) >= max_items:
+                for _, pending in inflight:  # orçamento cheio: o que não começou nem sai
+                    pending.cancel()
+                break
+            if not new:
+                continue  # nada novo aqui: não segue a paginação desta página
+            for link in links:
+                if link not in seen_pages:
+                    seen_pages.add(link)
+                    queue.append(link)
+    return items, done
+
+def add_cli_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--list-pages", type=int, default=None, metavar="N",
+                    help="máximo de páginas de listagem lidas (1 = só a página inicial)")
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Pré-classificador local de relevância (antes do nó OpenAI do n8n).
+
+Pontua cada item do JSONL por palavras-chave ponderadas dos temas do prompt
+(dados, estatística, BI, transformação digital, automação...), com peso maior
+no título que no resumo/descrição. Itens com pontuação abaixo de THRESHOLD
+são claramente irrelevantes e saem do fluxo sem chamada paga; o resto
+(ambíguos e positivos) segue para o LLM com o campo "relevance_score".
+Itens com prazo já encerrado (deadline_iso_end < hoje, ver dates.py) também
+são descartados, salvo com --keep-expired.
+
+Uso:
+    python run_all.py --dedup | python relevance.py [--threshold 2]
+    python relevance.py itens.jsonl --keep-all     # só anota a pontuação
+
+Avaliação (precisão/recall e chamadas economizadas): bench/eval_relevance.py
+"""
+
+import re
+import sys
+import json
+import argparse
+import unicodedata
+import dates
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+    sys.stdin.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+# --------- Config ---------
+THRESHOLD = 2.0      # abaixo disso o item é descartado sem ir ao LLM
+MAX_HITS  = 3        # repetições do mesmo termo contam no máximo N vezes
+# --------------------------
+
+# peso por campo (o título diz mais que a descrição)
+FIELD_WEIGHTS = {"title": 3.0, "summary": 2.0, "description": 1.0, "program": 1.0}
+
+# termos já sem acento e em minúsculas; peso negativo = indício de irrelevância.
+# "data" (= date) e "dados" soltos ficam de fora: todo edital tem "data da
+# prova", "dados pessoais", "dados cadastrais" — só entram em expressões
+TERMS = {
+    # temas centrais do prompt
+    "ciencia de dados": 4, "cientista de dados": 4, "data science": 4, "data scientist": 4,
+    "analise de dados": 4, "analista de dados": 4, "data analyst": 4, "data analysis": 4,
+    "business intelligence": 4, "inteligencia de negocios": 4, "power bi": 3,
+    "estatistica": 3, "estatistico": 3, "estatisticas": 2, "statistics": 3, "statistician": 3,
+    "analise estatistica": 4, "econometria": 3, "jurimetria": 3,
+    "transformacao digital": 4, "governo digital": 3, "digital transformation": 4,
+    "automacao de processos": 4, "automacao de processo": 4, "rpa": 3,
+    "tomada de decisao": 2, "baseada em evidencias": 2, "orientada a dados": 3,
+    "machine learning": 3, "aprendizado de maquina": 3, "inteligencia artificial": 2,
+    "big data": 3, "engenharia de dados": 3, "governanca de dados": 3,
+    "data engineering": 3, "data engineer": 3, "data management": 2, "data visualization": 3,
+    "visualizacao de dados": 3, "mineracao de dados": 3, "modelagem de dados": 3,
+    "gestao de dados": 2, "dados abertos": 2, "dados administrativos": 1.5,
+    # sinais mais fracos
+    "banco de dados": 1.5, "bancos de dados": 1.5, "base de dados": 1, "bases de dados": 1,
+    "indicadores": 1, "indicators": 1, "dashboard": 1.5, "painel": 0.5, "python": 1.5,
+    "sql": 1.5, "analytics": 2, "avaliacao de politicas": 1.5, "monitoramento e avaliacao": 1.5,
+    "monitoring and evaluation": 1.5,
+    "tecnologia da informacao": 1, "informatica": 0.5, "sistemas de informacao": 1,
+    "pesquisa quantitativa": 2, "metodos quantitativos": 2,
+    # áreas que quase nunca interessam
+    "enfermagem": -2, "enfermeiro": -2, "medico": -2, "odontologo": -2, "veterinario": -2,
+    "motorista": -2, "gari": -2, "vigilante": -2, "cozinheiro": -2, "merendeira": -2,
+    "professor de educacao basica": -1, "educacao fisica": -1, "fisioterapeuta": -2,
+}
+
+def fold(s: str) -> str:
+    """Minúsculas e sem acentos (mesma forma dos TERMS)."""
+    s = unicodedata.normalize("NFKD", s or "")
+    return "".join(c for c in s if not unicodedata.combining(c)).lower()
+
+# uma única alternância pré-compilada: um passe de finditer por campo;
+# termos mais longos primeiro para "analise de dados" vencer "dados"
+TERMS_PAT = re.compile(
+    r"\b(" + "|".join(re.escape(t) for t in sorted(TERMS, key=len, reverse=True)) + r")\b"
+)
+
+def score(item: dict) -> float:
+    total = 0.0
+    for field, fw in FIELD_WEIGHTS.items():
+        text = item.get(field)
+        if not text:
+            continue
+        hits: dict[str, int] = {}
+        for m in TERMS_PAT.finditer(fold(str(text))):
+            hits[m.group(1)] = hits.get(m.group(1), 0) + 1
+        total += fw * sum(TERMS[t] * min(n, MAX_HITS) for t, n in hits.items())
+    return round(total, 2)
+
+def classify(items, threshold: float = THRESHOLD, keep_all: bool = False,
+             keep_expired: bool = False):
+    """Gera os itens que seguem para o LLM, anotados com relevance_score."""
+    for item in items:
+        if "_meta" in item:  # linhas de status do run_all.py passam direto
+            yield item
+            continue
+        if not keep_expired and dates.is_expired(item):
+            continue
+        s = score(item)
+        if s < threshold and not keep_all:
+            continue
+        item["relevance_score"] = s
+        yield item
+
+def read_jsonl(src):
+    for line in src:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            continue
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Descarta localmente itens claramente irrelevantes")
+    ap.add_argument("input", nargs="?", help="arquivo JSONL (padrão: stdin)")
+    ap.add_argument("--threshold", type=float, default=THRESHOLD,
+                    help="pontuação mínima para seguir ao LLM")
+    ap.add_argument("--keep-all", action="store_true",
+                    help="não descarta por pontuação, só anota relevance_score")
+    ap.add_argument("--keep-expired", action="store_true",
+                    help="mantém itens com prazo de inscrição já encerrado")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    src = open(args.input, encoding="utf-8") if args.input else sys.stdin
+    try:
+        for item in classify(read_jsonl(src), args.threshold, args.keep_all,
+                             args.keep_expired):
+            print(json.dumps(item, ensure_ascii=False), flush=True)
+    finally:
+        if args.input:
+            src.close()
+
+if __name__ == "__main__":
+    main()
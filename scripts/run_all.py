@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Executa os quatro scrapers num único processo, em paralelo, e emite um
+JSONL único, mesclado e deduplicado (substitui os 4 Exec + 3 Merge do n8n).
+
+- cada fonte roda numa thread; os registros saem assim que a fonte os entrega,
+  então uma fonte lenta não segura as demais
+- CAPES e UN Careers dividem um único Chromium (browser_pool), em abas paralelas
+- registro com URL canônica repetida é descartado; título igual não basta
+  (vagas da ONU de mesmo nome, dois editais da mesma prefeitura)
+- --dedup também filtra contra o banco do Notion (mesma lógica do dedup.py)
+- ao fim de cada fonte sai uma linha de status:
+    {"_meta": "status", "source": "pci", "ok": true, "items": 12, "seconds": 41.2}
+  e no fim do stream um resumo (jsonl_writer.py):
+    {"_meta": "summary", "source": "run_all", "ok": true, "records": 40, ...}
+  (o Code do n8n ignora linhas com "_meta")
+- --stats - / --stats arquivo: métricas de todas as fontes somadas (metrics.py)
+
+Uso:
+    python run_all.py                      # todas as fontes
+    python run_all.py --sources pci,ipea --no-cache
+"""
+
+import os
+import sys
+import time
+import queue
+import asyncio
+import argparse
+import importlib
+import threading
+import http_client
+import html_parser
+import state_index
+import dedup
+import checkpoint
+import paginate
+import metrics
+from jsonl_writer import JsonlWriter
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+# nome curto -> módulo do scraper (todos expõem parse_args() e scrape(args))
+SOURCES = {
+    "pci":   "scraping_pci3",
+    "ipea":  "scraping_ipea2",
+    "capes": "scraping_capes",
+    "un":    "scraping_un_careers",
+}
+
+# fontes com Playwright: rodam juntas, em abas do mesmo navegador
+BROWSER_SOURCES = ("capes", "un")
+
+_DONE = object()
+
+def source_args(mod, args: argparse.Namespace) -> argparse.Namespace:
+    """Defaults do scraper sobrepostos pelas opções comuns passadas ao runner."""
+    ns = mod.parse_args([])
+    for k, v in vars(args).items():
+        if hasattr(ns, k):
+            setattr(ns, k, v)
+    return ns
+
+def _finish(out: queue.Queue, name: str, t0: float, n: int, error: Exception | None = None) -> None:
+    status = {"_meta": "status", "source": name, "ok": error is None}
+    if error is not None:
+        status["error"] = f"{type(error).__name__}: {error}"
+    status.update(items=n, seconds=round(time.monotonic() - t0, 2))
+    out.put(status)
+    out.put(_DONE)
+
+def run_source(name: str, args: argparse.Namespace, out: queue.Queue) -> None:
+    t0 = time.monotonic()
+    n = 0
+    try:
+        mod = importlib.import_module(SOURCES[name])
+        for rec in mod.scrape(source_args(mod, args)):
+            out.put(rec)
+            n += 1
+    except Exception as e:
+        _finish(out, name, t0, n, e)
+        return
+    _finish(out, name, t0, n)
+
+def run_browser_sources(names: list[str], args: argparse.Namespace, out: queue.Queue) -> None:
+    """Roda as fontes Playwright em abas paralelas de um único navegador."""
+    t0 = time.monotonic()
+    try:
+        import browser_pool
+        mods = {name: importlib.import_module(SOURCES[name]) for name in names}
+    except Exception as e:
+        for name in names:
+            _finish(out, name, t0, 0, e)
+        return
+
+    pending = set(names)
+
+    async def one(pool, name):
+        mod = mods[name]
+        n = 0
+        try:
+            async for rec in mod.scrape_async(pool, source_args(mod, args)):
+                out.put(rec)
+                n += 1
+        except Exception as e:
+            pending.discard(name)
+            _finish(out, name, t0, n, e)
+            return
+        pending.discard(name)
+        _finish(out, name, t0, n)
+
+    async def all_sources():
+        async with browser_pool.BrowserPool() as pool:
+            await asyncio.gather(*(one(pool, name) for name in names))
+
+    try:
+        asyncio.run(all_sources())
+    except Exception as e:  # ex.: falha ao abrir o Chromium
+        for name in pending:
+            _finish(out, name, t0, 0, e)
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Roda todos os scrapers e emite um JSONL único")
+    ap.add_argument("--sources", default=",".join(SOURCES),
+                    help="fontes separadas por vírgula (padrão: todas)")
+    ap.add_argument("--workers", type=int, default=4,
+                    help="detalhes em paralelo por fonte (quando suportado)")
+    ap.add_argument("--dedup", action="store_true",
+                    help="descarta também o que já está no Notion (ver dedup.py)")
+    http_client.add_cli_args(ap)
+    html_parser.add_cli_args(ap)
+    state_index.add_cli_args(ap)
+    checkpoint.add_cli_args(ap)
+    paginate.add_cli_args(ap)
+    metrics.add_cli_args(ap)
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = [s.strip() for s in args.sources.split(",") if s.strip()]
+    unknown = [s for s in names if s not in SOURCES]
+    if unknown:
+        raise SystemExit(f"fontes desconhecidas: {', '.join(unknown)}")
+    http_client.apply_cli_args(args)
+    html_parser.apply_cli_args(args)
+    metrics.apply_cli_args(args)
+
+    known: set[str] = set()
+    if args.dedup:
+        index = dedup.DedupIndex()
+        database_id = os.environ.get("NOTION_DATABASE_ID", "")
+        if database_id and os.environ.get("NOTION_TOKEN"):
+            index.sync_from_notion(database_id, max_age=dedup.SYNC_MAX_AGE)
+        known = index.known()
+        index.close()
+
+    q: queue.Queue = queue.Queue()
+    browser_names = [n for n in names if n in BROWSER_SOURCES]
+    if browser_names:
+        threading.Thread(target=run_browser_sources, args=(browser_names, args, q),
+                         daemon=True).start()
+    for name in names:
+        if name not in BROWSER_SOURCES:
+            threading.Thread(target=run_source, args=(name, args, q), daemon=True).start()
+
+    pending = len(names)
+    failed = []
+    with JsonlWriter(source="run_all") as out:
+        while pending:
+            rec = q.get()
+            if rec is _DONE:
+                pending -= 1
+                continue
+            if "_meta" in rec:
+                if not rec.get("ok", True):
+                    failed.append(rec.get("source"))
+                out.write_meta(rec)
+                continue
+            keys = dedup.item_keys(rec, use_title=False)
+            if not metrics.count("run_all.dedup", kept=not dedup.is_duplicate(rec, keys, known)):
+                continue
+            known.update(keys)
+            out.write(rec)
+        out.close(failed_sources=failed)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+Agendador adaptativo por fonte (modo daemon), no lugar do Cron único do
+n8n (todas as fontes juntas, toda segunda às 9h).
+
+- cada fonte tem seu próprio intervalo, dentro de limites (BOUNDS): o PCI
+  muda todo dia, as chamadas da CAPES raramente
+- histórico por fonte em SQLite: quantos itens novos/alterados cada execução
+  viu (impressões digitais novas ou mudadas no state_index, entregues ou não:
+  a taxa mede o site, não o que falta entregar)
+- taxa de mudança = novos+alterados por hora nas últimas HISTORY_RUNS
+  execuções; o intervalo é o tempo esperado para juntar TARGET_CHANGES
+  mudanças (sem mudança nenhuma: o máximo), com jitter de ±JITTER para as
+  fontes não baterem juntas nos sites
+- a primeira execução de uma fonte (tudo é "new") não entra na taxa;
+  execução que falhou é repetida após o intervalo mínimo
+- cada execução roda `run_all.py --sources <fonte> --only-changed` num
+  processo à parte e grava só os registros novos/alterados em
+  .cache/runs/<fonte>-<data>.jsonl; --then roda o resto do pipeline sobre
+  o arquivo ({out} é trocado pelo caminho já entre aspas do shell, porque a
+  pasta pode ter espaço, ex. G:\Meu Drive\...; o caminho também vai na
+  variável SCRAPER_RUN_OUT). Se o --then sai com erro (num pipeline, vale o
+  código do último comando), a execução conta como falha: repete após o
+  intervalo mínimo, e o que não foi entregue (ver state_index.confirm) sai
+  de novo como new/changed
+
+Uso:
+    python scheduler.py                         # daemon: roda cada fonte quando vence
+    python scheduler.py --once                  # roda o que está vencido e sai (cron de hora em hora)
+    python scheduler.py --status                # intervalo, taxa e próxima execução por fonte
+    python scheduler.py --then "python dedup.py {out} | python classify.py --only-relevant | python notion_sink.py"
+
+Histórico: scripts/.cache/schedule.sqlite (ou variável SCRAPER_SCHEDULE).
+"""
+
+import os
+import sys
+import json
+import time
+import shlex
+import random
+import sqlite3
+import argparse
+import subprocess
+from datetime import datetime
+
+from state_index import StateIndex
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+# --------- Config ---------
+HERE = os.path.dirname(os.path.abspath(__file__))
+SCHEDULE_PATH = os.environ.get("SCRAPER_SCHEDULE", os.path.join(HERE, ".cache", "schedule.sqlite"))
+RUNS_DIR = os.path.join(HERE, ".cache", "runs")
+HOUR = 3600
+BOUNDS = {            # (mínimo, máximo) entre execuções, em horas
+    "pci":   (6, 48),
+    "ipea":  (12, 7 * 24),
+    "capes": (24, 14 * 24),
+    "un":    (12, 7 * 24),
+}
+START_INTERVAL = 24   # h: enquanto não há histórico para medir a taxa
+TARGET_CHANGES = 5    # novos/alterados esperados por execução
+HISTORY_RUNS = 8      # execuções consideradas na taxa
+JITTER = 0.15         # ± fração do intervalo
+POLL_SECONDS = 300    # o daemon nunca dorme mais que isso de uma vez
+SELF_TRACKED = ("pci", "ipea")   # têm índice próprio: o registro já vem com change
+# --------------------------
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    source   TEXT NOT NULL,
+    started  REAL NOT NULL,
+    finished REAL NOT NULL,
+    ok       INTEGER NOT NULL,
+    new      INTEGER NOT NULL,
+    changed  INTEGER NOT NULL,
+    emitted  INTEGER NOT NULL,
+    interval REAL NOT NULL,
+    next_at  REAL NOT NULL,
+    output   TEXT,
+    error    TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_source ON runs (source, started);
+"""
+
+class Schedule:
+    def __init__(self, path: str = SCHEDULE_PATH):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def history(self, source: str, n: int = HISTORY_RUNS + 1) -> list[tuple]:
+        """(started, ok, new, changed) das últimas execuções, da mais antiga à mais recente."""
+        rows = self.db.execute(
+            "SELECT started, ok, new, changed FROM runs WHERE source = ? "
+            "ORDER BY started DESC LIMIT ?", (source, n),
+        ).fetchall()
+        return rows[::-1]
+
+    def next_at(self, source: str) -> float:
+        """Quando a fonte deve rodar de novo (0 = nunca rodou: já)."""
+        row = self.db.execute(
+            "SELECT next_at FROM runs WHERE source = ? ORDER BY started DESC LIMIT 1", (source,),
+        ).fetchone()
+        return row[0] if row else 0.0
+
+    def add(self, source: str, started: float, finished: float, ok: bool, new: int,
+            changed: int, emitted: int, interval: float, next_at: float,
+            output: str | None, error: str | None) -> None:
+        with self.db:
+            self.db.execute("INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            (source, started, finished, int(ok), new, changed, emitted,
+                             interval, next_at, output, error))
+
+    def close(self) -> None:
+        self.db.close()
+
+def change_rate(history: list[tuple]) -> float | None:
+    """Novos+alterados por hora entre execuções bem-sucedidas consecutivas;
+    None sem pelo menos duas (a primeira de todas só diz o tamanho do acervo)."""
+    runs = [r for r in history if r[1]]
+    hours = sum(b[0] - a[0] for a, b in zip(runs, runs[1:])) / HOUR
+    if len(runs) < 2 or hours <= 0:
+        return None
+    return sum(r[2] + r[3] for r in runs[1:]) / hours
+
+def next_interval(source: str, history: list[tuple], ok: bool = True,
+                  rng: random.Random = random) -> float:
+    """Intervalo (s) até a próxima execução: TARGET_CHANGES / taxa, nos limites, com jitter."""
+    lo, hi = BOUNDS.get(source, (START_INTERVAL, START_INTERVAL))
+    rate = change_rate(history)
+    if not ok:
+        hours = lo
+    elif rate is None:
+        hours = min(max(START_INTERVAL, lo), hi)
+    elif rate <= 0:
+        hours = hi
+    else:
+        hours = min(max(TARGET_CHANGES / rate, lo), hi)
+    return hours * HOUR * rng.uniform(1 - JITTER, 1 + JITTER)
+
+def run_source(source: str, out_dir: str = RUNS_DIR, extra: list[str] | None = None) -> dict:
+    """Roda a fonte num processo à parte; grava só novos/alterados. Devolve o resumo."""
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"{source}-{datetime.now():%Y%m%d-%H%M%S}.jsonl")
+    cmd = [sys.executable, os.path.join(HERE, "run_all.py"), "--sources", source,
+           "--only-changed", *(extra or [])]
+    res = {"source": source, "ok": True, "new": 0, "changed": 0, "emitted": 0,
+           "output": path, "error": None}
+    # CAPES e UN não têm índice próprio: a impressão digital é feita aqui; PCI e
+    # IPEA deixam sem change de propósito o registro cujo detalhe falhou
+    index = StateIndex(source)
+    started = time.time()
+    try:
+        with open(path, "w", encoding="utf-8") as out, \
+                subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, encoding="utf-8") as proc:
+            for line in proc.stdout:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                if "_meta" in rec:
+                    if rec.get("_meta") == "status" and not rec.get("ok", True):
+                        res["ok"], res["error"] = False, rec.get("error") or "falhou"
+                    out.write(line)
+                    continue
+                change = rec.get("change") if source in SELF_TRACKED else index.track(rec)
+                if change == "unchanged":
+                    continue
+                res["emitted"] += 1
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        if proc.returncode and res["ok"]:
+            res["ok"], res["error"] = False, f"run_all.py saiu com {proc.returncode}"
+        res["new"], res["changed"] = index.changes_since(started)
+    finally:
+        index.close()
+    return res
+
+def shell_quote(path: str) -> str:
+    """Caminho como um único argumento do shell que o --then usa (cmd.exe no Windows)."""
+    return subprocess.list2cmdline([path]) if os.name == "nt" else shlex.quote(path)
+
+def run_due(sched: Schedule, names: list[str], args, now: float | None = None) -> list[dict]:
+    """Roda, em sequência, as fontes cujo horário já venceu."""
+    done = []
+    for name in names:
+        if sched.next_at(name) > (now or time.time()):
+            continue
+        started = time.time()
+        try:
+            res = run_source(name, args.out_dir, args.extra)
+        except Exception as e:
+            res = {"source": name, "ok": False, "new": 0, "changed": 0, "emitted": 0,
+                   "output": None, "error": f"{type(e).__name__}: {e}"}
+        if args.then and res["ok"] and res["emitted"]:
+            rc = subprocess.run(args.then.replace("{out}", shell_quote(res["output"])), shell=True,
+                                cwd=HERE, env={**os.environ, "SCRAPER_RUN_OUT": res["output"]}).returncode
+            if rc:
+                res["ok"], res["error"] = False, f"--then saiu com {rc}"
+        finished = time.time()
+        history = sched.history(name) + [(started, res["ok"], res["new"], res["changed"])]
+        interval = next_interval(name, history[-(HISTORY_RUNS + 1):], res["ok"])
+        sched.add(name, started, finished, res["ok"], res["new"], res["changed"],
+                  res["emitted"], interval, finished + interval, res["output"], res["error"])
+        res.update(seconds=round(finished - started, 1), next_in_hours=round(interval / HOUR, 1))
+        print("scheduler: " + ", ".join(f"{k}={v}" for k, v in res.items()), file=sys.stderr)
+        done.append(res)
+    return done
+
+def status(sched: Schedule, names: list[str]) -> None:
+    now = time.time()
+    print(f"{'fonte':<6} {'execuções':>9} {'mudanças/h':>10} {'próxima em (h)':>15}  limites (h)")
+    for name in names:
+        history = sched.history(name)
+        rate = change_rate(history)
+        n = sched.db.execute("SELECT COUNT(*) FROM runs WHERE source = ?", (name,)).fetchone()[0]
+        lo, hi = BOUNDS.get(name, (START_INTERVAL, START_INTERVAL))
+        print(f"{name:<6} {n:>9} {'—' if rate is None else f'{rate:.2f}':>10} "
+              f"{max(0.0, sched.next_at(name) - now) / HOUR:>15.1f}  {lo}–{hi}")
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Agenda cada fonte conforme a taxa de mudança observada")
+    ap.add_argument("--sources", default=",".join(BOUNDS),
+                    help="fontes separadas por vírgula (padrão: todas)")
+    ap.add_argument("--once", action="store_true", help="roda o que está vencido e sai")
+    ap.add_argument("--status", action="store_true", help="mostra o estado do agendamento e sai")
+    ap.add_argument("--out-dir", default=RUNS_DIR, help="onde gravar o JSONL de cada execução")
+    ap.add_argument("--then", default="",
+                    help="comando (shell) rodado após cada execução com itens; {out} = arquivo JSONL, "
+                         "já entre aspas (não pôr aspas em volta)")
+    ap.add_argument("extra", nargs="*",
+                    help="opções repassadas ao run_all.py (depois de --), ex.: -- --no-cache")
+    return ap.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    names = [s.strip() for s in args.sources.split(",") if s.strip()]
+    unknown = [s for s in names if s not in BOUNDS]
+    if unknown:
+        raise SystemExit(f"fontes desconhecidas: {', '.join(unknown)}")
+    sched = Schedule()
+    try:
+        if args.status:
+            status(sched, names)
+            return
+        while True:
+            run_due(sched, names, args)
+            if args.once:
+                return
+            wait = min(sched.next_at(n) for n in names) - time.time()
+            time.sleep(min(max(wait, 1), POLL_SECONDS))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sched.close()
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,142 @@
 # scraping_capes.py
-import json, re
+# A página de chamadas é renderizada no servidor (Plone): tenta primeiro
+# HTTP + BeautifulSoup e só abre o Chromium se o HTML estático não trouxer
+# nenhuma chamada (ou com --mode browser).
+# scrape() é um gerador: cada registro sai (e é descarregado) assim que pronto.
 import sys
+import asyncio
+import argparse
 sys.stdout.reconfigure(encoding='utf-8')
-from playwright.sync_api import sync_playwright
+import html_parser
+from html_parser import make_soup
+from http_client import get
+import dates
+import metrics
+from extract import norm
+from jsonl_writer import JsonlWriter
 
 BASE = "https://www.gov.br/capes/pt-br/acesso-a-informacao/licitacoes-e-contratos/chamadas-publicas/chamadas"
 
-def norm(s): 
-    return re.sub(r"\s+", " ", (s or "").strip())
+# extrai tudo numa única ida ao navegador (em vez de 3 chamadas por <a>)
+ANCHORS_JS = """els => els.map(a => ({
+    href: a.getAttribute('href') || '',
+    text: a.innerText || '',
+    wrap: a.closest('article,li,div')?.innerText || ''
+}))"""
 
-def run():
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Scraper CAPES — chamadas públicas (JSONL)")
+    ap.add_argument("--mode", choices=("auto", "static", "browser"), default="auto",
+                    help="auto: HTML estático e Playwright só se vier vazio")
+    html_parser.add_cli_args(ap)
+    metrics.add_cli_args(ap)
+    return ap.parse_args(argv)
+
+def parse_anchors(items) -> list[dict]:
+    """Filtra as chamadas a partir de dicts {href, text, wrap} (estático ou navegador)."""
+    with metrics.timer("capes.parse.anchors"):
+        return _parse_anchors(items)
+
+def _parse_anchors(items) -> list[dict]:
     out = []
-    with sync_playwright() as p:
-        b = p.chromium.launch(headless=True)
-        page = b.new_page()
-        page.goto(BASE, timeout=120000)
-        page.wait_for_load_state("domcontentloaded")
+    seen = set()
+    for a in items:
+        href = a["href"]
+        text = norm(a["text"])
+        if not metrics.count("capes.chamada", kept=bool(text) and "chamada" in text.lower()):
+            continue
+        if href.startswith("/"):
+            href = "https://www.gov.br" + href
+        key = text + "|" + href
+        if key in seen: 
+            continue
+        seen.add(key)
+        wrap = a["wrap"]
+        # tenta achar PDF e prazo
+        pdf = None
+        if href.lower().endswith(".pdf"): 
+            pdf = href
+        with metrics.timer("regex.deadline"):
+            deadline = dates.find_deadline_text(wrap, require_keyword=True)
+        out.append({
+            "title": text[:200],
+            "url": pdf or href,
+            "source": "CAPES",
+            "kind": "Chamada/Bolsa",
+            "deadline": deadline,
+            **dates.deadline_fields(deadline),
+            "location": "Brasil",
+            "summary": norm(wrap)[:800]
+        })
+    return out
+
+def static_anchors(html: str) -> list[dict]:
+    """Mesmos campos do ANCHORS_JS, lidos do HTML sem navegador."""
+    with metrics.timer("capes.parse.html"):
+        return _static_anchors(html)
+
+def _static_anchors(html: str) -> list[dict]:
+    soup = make_soup(html)
+    items = []
+    for a in soup.select("a[href]"):
+        parent = a.find_parent(["article", "li", "div"])
+        items.append({
+            "href": a.get("href") or "",
+            "text": a.get_text(" "),
+            "wrap": parent.get_text(" ") if parent else "",
+        })
+    return items
+
+def scrape_static() -> list[dict]:
+    return parse_anchors(static_anchors(get(BASE).text))
+
+async def scrape_browser(pool):
+    async with pool.page() as page:
+        with metrics.timer("browser.goto"):
+            await page.goto(BASE, timeout=120000)
+            await page.wait_for_load_state("domcontentloaded")
         # Estruturas no gov.br costumam ter cards/itens <a> com título
-        items = page.locator("a[href]").element_handles()
-        seen = set()
-        for a in items:
-            href = a.get_attribute("href") or ""
-            text = norm(a.inner_text())
-            if not text or "chamada" not in text.lower(): 
-                continue
-            if href.startswith("/"):
-                href = "https://www.gov.br" + href
-            key = text + "|" + href
-            if key in seen: 
-                continue
-            seen.add(key)
-            wrap = a.evaluate("el => el.closest('article,li,div')?.innerText || ''") or ""
-            # tenta achar PDF e prazo
-            pdf = None
-            if href.lower().endswith(".pdf"): 
-                pdf = href
-            deadline = None
-            m = re.search(r"(?i)(prazo|encerramento|inscri(?:ç|c)ões).*?(\\d{1,2}[\\/-]\\d{1,2}[\\/-]\\d{2,4})", wrap)
-            if m:
-                deadline = norm(m.group(2))
-            out.append({
-                "title": text[:200],
-                "url": pdf or href,
-                "source": "CAPES",
-                "kind": "Chamada/Bolsa",
-                "deadline": deadline,
-                "location": "Brasil",
-                "summary": norm(wrap)[:800]
-            })
-        b.close()
-    for it in out:
-        print(json.dumps(it, ensure_ascii=False))
+        with metrics.timer("browser.eval"):
+            items = await page.eval_on_selector_all("a[href]", ANCHORS_JS)
+    for rec in parse_anchors(items):
+        yield rec
+
+def _try_static(mode: str) -> list[dict]:
+    if mode == "static":
+        return scrape_static()
+    try:
+        return scrape_static()
+    except Exception:
+        return []  # cai para o navegador
+
+async def scrape_async(pool, args=None):
+    mode = getattr(args, "mode", "auto")
+    if mode != "browser":
+        out = await asyncio.to_thread(_try_static, mode)
+        if out or mode == "static":
+            for rec in out:
+                yield rec
+            return
+    async for rec in scrape_browser(pool):
+        yield rec
+
+def scrape(args=None):
+    mode = getattr(args, "mode", "auto")
+    if mode != "browser":
+        out = _try_static(mode)
+        if out or mode == "static":
+            yield from out
+            return
+    import browser_pool  # só quando o HTML estático não basta
+    yield from browser_pool.iterate(scrape_browser)
+
+def run(argv=None):
+    args = parse_args(argv)
+    html_parser.apply_cli_args(args)
+    metrics.apply_cli_args(args)
+    with JsonlWriter(source="capes") as out:
+        for it in scrape(args):
+            out.write(it)
 
 if __name__ == "__main__":
     run()
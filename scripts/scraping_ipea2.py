@@ -5,18 +5,30 @@ IPEA (Bolsas de Pesquisa) — lista + detalhe, restrito a:
   - subpáginas cujos paths começam com:
       /portal/bolsas-de-pesquisa
       /portal/bolsas-de-pesquisa-lista/
+  - a listagem segue a paginação, com páginas buscadas em paralelo (paginate.py)
 
 Saída (JSONL por linha):
-  title, url, source, kind, deadline, location, summary, description, status, program, year
+  title, url, source, kind, deadline, deadline_iso_start, deadline_iso_end, location,
+  summary, description, status, program, year
 """
 
 import sys
-import re
-import time
-import json
+import argparse
 from urllib.parse import urljoin, urlparse
-import requests
-from bs4 import BeautifulSoup
+import http_client
+import html_parser
+from html_parser import make_soup
+from http_client import get, throttle
+import state_index
+from state_index import StateIndex
+import dates
+from dates import find_deadline_text as extract_deadline
+from jsonl_writer import JsonlWriter
+import checkpoint
+from checkpoint import Checkpoint
+import metrics
+import paginate
+from extract import norm
 
 # --- saída UTF-8 no Windows ---
 try:
@@ -35,43 +47,14 @@ SOURCE   = "IPEA"
 KIND     = "Bolsa"
 LOCATION = "Brasil"
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                  "AppleWebKit/537.36 (KHTML, like Gecko) "
-                  "Chrome/123.0 Safari/537.36"
-}
-
-MAX_ITEMS = 120
+MAX_ITEMS = 120      # orçamento global de itens (todas as páginas da listagem)
+MAX_LIST_PAGES = 10  # páginas da listagem seguidas pela paginação
+LIST_WORKERS = 2     # páginas da listagem buscadas em paralelo
+# links de paginação (Joomla: ul.pagination, ?start=N) e "próxima"
+PAGE_LINK_SEL = ".pagination a[href], .pagenav a[href], a[rel~=next]"
 SLEEP_LIST   = 0.5
 SLEEP_DETAIL = 0.7
 
-# regex de datas (numérico e textual)
-DATE_NUM_PAT = re.compile(
-    r"(?:(?:inscri(?:ç|c)[õo]es?|prazo|per[íi]odo|submiss(?:ão|ões)|encerramento).{0,80})?"
-    r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}"
-    r"(?:\s*(?:a|até|–|-|ao)\s*\d{1,2}[/-]\d{1,2}[/-]\d{2,4})?)",
-    flags=re.I | re.S
-)
-DATE_TEXT_PAT = re.compile(
-    r"(\d{1,2}\s+de\s+[A-Za-zçãéêíóôúà]+\s+de\s+\d{4}"
-    r"(?:\s*(?:a|até|–|-|ao)\s*\d{1,2}\s+de\s+[A-Za-zçãéêíóôúà]+\s+de\s+\d{4})?)",
-    flags=re.I
-)
-
-def norm(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
-
-def extract_deadline(text: str) -> str | None:
-    if not text:
-        return None
-    m = DATE_NUM_PAT.search(text)
-    if m:
-        return norm(m.group(1))
-    m2 = DATE_TEXT_PAT.search(text)
-    if m2:
-        return norm(m2.group(1))
-    return None
-
 def is_allowed(url: str) -> bool:
     """Permite APENAS páginas do host ipea.gov.br com path autorizado."""
     if not url:
@@ -85,15 +68,35 @@ def is_allowed(url: str) -> bool:
         return False
     return True
 
-def get(url: str) -> requests.Response:
-    r = requests.get(url, headers=HEADERS, timeout=60)
-    r.raise_for_status()
-    return r
+def parse_listing(max_pages: int = MAX_LIST_PAGES, workers: int = LIST_WORKERS) -> list[dict]:
+    """Lê a página de bolsas (e as seguintes da paginação) e retorna items da lista."""
+    items, _ = paginate.crawl([START_URL], fetch_listing_page, max_pages=max_pages,
+                              max_items=MAX_ITEMS, workers=workers, name="ipea")
+    return items
 
-def parse_listing():
-    """Lê a página de bolsas e retorna items da lista."""
-    r = get(START_URL)
-    soup = BeautifulSoup(r.text, "html.parser")
+def fetch_listing_page(url: str) -> tuple[list[dict], list[str]]:
+    throttle(url, 1.0 / SLEEP_LIST)
+    return parse_listing_page(get(url).text, url)
+
+def parse_listing_html(html: str) -> list[dict]:
+    return parse_listing_page(html)[0]
+
+def parse_listing_page(html: str, page_url: str | None = None) -> tuple[list[dict], list[str]]:
+    """(itens, links para as outras páginas da listagem) de uma página."""
+    with metrics.timer("ipea.parse.list"):
+        soup = make_soup(html)
+        return _listing_items(soup), _listing_links(soup, page_url or START_URL)
+
+def _listing_links(soup, page_url: str) -> list[str]:
+    links = []
+    for a in soup.select(PAGE_LINK_SEL):
+        url = urljoin(page_url, a.get("href") or "").split("#")[0]
+        # só páginas da própria listagem: nada fora do domínio nem páginas de item
+        if is_allowed(url) and "/item/" not in url and url != page_url and url not in links:
+            links.append(url)
+    return links
+
+def _listing_items(soup) -> list[dict]:
     ul = soup.select_one("ul.search-resultsbolsas.list-striped")
     if not ul:
         return []
@@ -110,7 +113,7 @@ def parse_listing():
         href = a.get("href") or ""
         url = urljoin(BASE, href)
 
-        if not is_allowed(url) or not title:
+        if not metrics.count("ipea.is_allowed", kept=is_allowed(url)) or not title:
             continue
 
         # campos auxiliares na lista
@@ -131,11 +134,12 @@ def parse_listing():
         # prazo na listagem
         deadline = None
         prazos = [p for p in li.find_all("p") if "Prazo de inscrição" in p.get_text()]
-        if prazos:
-            deadline = extract_deadline(prazos[0].get_text())
-        if not deadline:
-            # fallback: tenta em todo o li
-            deadline = extract_deadline(li.get_text())
+        with metrics.timer("regex.deadline"):
+            if prazos:
+                deadline = extract_deadline(prazos[0].get_text())
+            if not deadline:
+                # fallback: tenta em todo o li
+                deadline = extract_deadline(li.get_text())
 
         key = (title.lower(), url)
         if key in seen:
@@ -164,12 +168,18 @@ def parse_detail(url: str) -> tuple[str, str, dict]:
     - deadline_detail: prazo (se houver)
     - meta: dict com chaves adicionais que achar (situação, ano, programa, etc.)
     """
-    if not is_allowed(url):
+    if not metrics.count("ipea.is_allowed.detail", kept=is_allowed(url)):
         return "", None, {}
 
-    time.sleep(SLEEP_DETAIL)
-    r = get(url)
-    soup = BeautifulSoup(r.text, "html.parser")
+    metrics.sleep(SLEEP_DETAIL)
+    return parse_detail_html(get(url).text)
+
+def parse_detail_html(html: str) -> tuple[str, str, dict]:
+    with metrics.timer("ipea.parse.detail"):
+        return _parse_detail_html(html)
+
+def _parse_detail_html(html: str) -> tuple[str, str, dict]:
+    soup = make_soup(html)
 
     # corpo principal
     body = soup.select_one("div[itemprop='articleBody']")
@@ -181,7 +191,7 @@ def parse_detail(url: str) -> tuple[str, str, dict]:
         main = soup.select_one("main") or soup.select_one("article") or soup.select_one("div#content") or soup
         description = norm(main.get_text(separator=" "))
 
-    deadline_detail = extract_deadline(description)
+    deadline_detail = metrics.timed("regex.deadline", extract_deadline, description)
 
     # metadados da lateral/box
     meta = {}
@@ -202,17 +212,55 @@ def parse_detail(url: str) -> tuple[str, str, dict]:
 
     return description[:15000], deadline_detail, meta
 
-def main():
-    rows = []
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Scraper IPEA — bolsas de pesquisa (JSONL)")
+    http_client.add_cli_args(ap)
+    html_parser.add_cli_args(ap)
+    state_index.add_cli_args(ap)
+    checkpoint.add_cli_args(ap)
+    paginate.add_cli_args(ap)
+    metrics.add_cli_args(ap)
+    return ap.parse_args(argv)
+
+def scrape(args):
+    """Gera os registros na ordem da listagem, cada um assim que seu detalhe chega."""
+    index = StateIndex("ipea")
+    ckpt = Checkpoint("ipea", resume=args.resume)
+    try:
+        yield from _scrape(args, index, ckpt)
+        ckpt.finish()
+    finally:
+        ckpt.save()
+        index.close()
+
+def _scrape(args, index: StateIndex, ckpt: Checkpoint):
     # 1) lista
-    candidates = parse_listing()
+    candidates = parse_listing(args.list_pages or MAX_LIST_PAGES)
 
-    # 2) detalhe por item
+    # 2) detalhe por item (só baixa o que é novo ou mudou na listagem)
     for it in candidates:
-        try:
-            desc, dedl, meta = parse_detail(it["url"])
-        except Exception:
-            desc, dedl, meta = "", None
+        if it["url"] in ckpt:  # concluído antes da interrupção: reemite
+            row = ckpt.get(it["url"])
+            if row and not (args.only_changed and row.get("change") == "unchanged"):
+                yield row
+            continue
+        fetched = True
+        h = state_index.content_hash(it["title"], it["summary"], it.get("status"),
+                                     it.get("deadline_guess"))
+        known = None if args.full else index.lookup(it["url"], h)
+        if known is not None and args.only_new:
+            continue
+        if known is not None and index.expired(it["url"], args.detail_max_age):
+            known = None  # baixa de novo: a página do edital pode ter mudado sozinha
+        if known is not None:
+            desc, dedl, meta = known["description"], known["deadline"], known["meta"]
+        else:
+            try:
+                desc, dedl, meta = parse_detail(it["url"])
+                index.put(it["url"], h, {"description": desc, "deadline": dedl, "meta": meta})
+            except Exception:
+                desc, dedl, meta = "", None, {}
+                fetched = False  # fica fora do checkpoint: --resume tenta de novo
 
         deadline = dedl or it.get("deadline_guess")
         status = it.get("status")
@@ -235,6 +283,7 @@ def main():
             "source": SOURCE,
             "kind": KIND,
             "deadline": deadline,
+            **dates.deadline_fields(deadline),
             "location": LOCATION,
             "summary": it["summary"],
             "description": desc,
@@ -242,11 +291,23 @@ def main():
             "program": program,
             "year": year
         }
-        rows.append(row)
-
-    # imprime JSONL
-    for r in rows:
-        print(json.dumps(r, ensure_ascii=False))
+        if fetched:  # sem detalhe, a impressão digital não diz nada
+            if index.track(row) == "unchanged" and args.only_changed:
+                row = None
+            ckpt.mark(it["url"], row)
+        if row:
+            yield row
+
+def main(argv=None):
+    args = parse_args(argv)
+    http_client.apply_cli_args(args)
+    html_parser.apply_cli_args(args)
+    metrics.apply_cli_args(args)
+
+    # imprime JSONL (cada linha sai assim que o item fica pronto)
+    with JsonlWriter(source="ipea") as out:
+        for r in scrape(args):
+            out.write(r)
 
 if __name__ == "__main__":
     main()
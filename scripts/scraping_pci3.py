@@ -1,26 +1,48 @@
 # -*- coding: utf-8 -*-
 """
 Scraper PCI Concursos (filtrado)
-- Página: https://www.pciconcursos.com.br/concursos/
+- Página: https://www.pciconcursos.com.br/concursos/, mais as listagens regionais
+  e a paginação que ela alcança (em paralelo, ver paginate.py)
 - Saída: JSONL apenas para itens com:
     - maior salário mencionado >= MIN_SALARY
     - e inscrição aberta (prazo final >= hoje)
-Campos: title, url, source, kind, deadline, deadline_end_iso, salary_max, location, summary, description
+- Os dois filtros são aplicados primeiro sobre a própria listagem (resumo e
+  prazo da linha); só vai para o detalhe o que passa ou ainda é indefinido,
+  como o item que divide a linha com outros
+Campos: title, url, source, kind, deadline, deadline_end_iso, deadline_iso_start,
+        deadline_iso_end, salary_max, location, summary, description
 """
 
 import sys
 import re
-import time
-import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
-from urllib.parse import urljoin
-import requests
-from bs4 import BeautifulSoup
+from urllib.parse import urljoin, urlparse
+import http_client
+import html_parser
+from html_parser import make_soup
+from http_client import get, throttle
+import state_index
+from state_index import StateIndex
+import dates
+from jsonl_writer import JsonlWriter
+import checkpoint
+from checkpoint import Checkpoint
+import metrics
+import paginate
+import extract
+from extract import norm
 
 # --------- Config ---------
 MIN_SALARY = 10000  # filtrar por salário mínimo desejado (R$)
-MAX_ITEMS  = 200
-SLEEP_BETWEEN = 0.7
+MAX_ITEMS  = 200      # orçamento global de itens da listagem (todas as páginas)
+MAX_LIST_PAGES = 20  # páginas de listagem: concursos/, regionais e paginação
+LIST_WORKERS = 3     # páginas de listagem buscadas em paralelo
+SLEEP_BETWEEN = 0.7  # intervalo médio entre requisições ao mesmo host (s)
+BURST = 1            # requisições que podem sair "de rajada" por host
+WORKERS = 4          # páginas de detalhe buscadas em paralelo (1 = sequencial)
+PREFILTER = True     # descarta pela listagem antes de baixar o detalhe
 # --------------------------
 
 try:
@@ -30,10 +52,6 @@ except Exception:
 
 BASE = "https://www.pciconcursos.com.br/"
 LIST_URL = urljoin(BASE, "concursos/")
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-                  "(KHTML, like Gecko) Chrome/123.0 Safari/537.36"
-}
 
 IGNORE_TITLES = {
     "Concursos", "Nacional", "Sudeste", "Sul", "Norte", "Nordeste", "Centro-Oeste",
@@ -45,33 +63,13 @@ IGNORE_HREF_PATTERNS = (
     "/concursos/norte/", "/concursos/nordeste/", "/concursos/centro-oeste/",
     "/concursos/area-", "/concursos/busca", "/concursos/cursos", "/cursos/"
 )
-
-DATE_PAT = re.compile(
-    r"(?:(?:inscri(?:ç|c)[õo]es?|prazo|per[ií]odo|encerramento).{0,60})?"
-    r"(\d{1,2}[/-]\d{1,2}[/-]\d{2,4}"
-    r"(?:\s*(?:a|até|–|-|ao)\s*\d{1,2}[/-]\d{1,2}[/-]\d{2,4})?)",
-    flags=re.I | re.S
-)
-DATE_TEXT_PAT = re.compile(
-    r"(\d{1,2})\s+de\s+(janeiro|fevereiro|março|marco|abril|maio|junho|julho|"
-    r"agosto|setembro|outubro|novembro|dezembro)\s+de\s+(\d{4})",
-    flags=re.I
-)
-
-# R$ 12.345,67 | R$12.000 | até R$ 18.000 | R$ 9.000 a R$ 14.000
-SAL_PAT = re.compile(
-    r"R\$\s*([0-9.\s]+(?:,[0-9]{2})?)"
-    r"(?:\s*(?:a|até|-|–|ao)\s*R?\$?\s*([0-9.\s]+(?:,[0-9]{2})?))?",
-    flags=re.I
+# outras páginas de listagem: regionais (/concursos/sudeste/) e paginação (/concursos/2/)
+LIST_PAGE_PAT = re.compile(
+    r"^/concursos/(?:(?:nacional|sudeste|sul|norte|nordeste|centro-oeste)/)?(?:\d+/?)?$"
 )
-
-MONTHS = {
-    'janeiro':1,'fevereiro':2,'março':3,'marco':3,'abril':4,'maio':5,'junho':6,
-    'julho':7,'agosto':8,'setembro':9,'outubro':10,'novembro':11,'dezembro':12
-}
-
-def norm(s: str) -> str:
-    return re.sub(r"\s+", " ", (s or "").strip())
+# linha de um concurso na listagem: <div class="ca"><a>órgão</a><div class="cc">UF</div>
+# <div class="cd">vagas, até R$ ...</div><div class="ce">período</div></div>
+ROW_CLASS = "ca"
 
 def looks_like_menu(title: str, href: str) -> bool:
     t = (title or "").strip()
@@ -83,78 +81,55 @@ def looks_like_menu(title: str, href: str) -> bool:
     for frag in IGNORE_HREF_PATTERNS:
         if frag in href:
             return True
+    if LIST_PAGE_PAT.match(urlparse(href).path):
+        return True  # outra página de listagem, não um concurso
     if len(t) < 8:
         return True
     return False
 
-def money_to_float(txt: str) -> float | None:
-    if not txt:
-        return None
-    val = txt.replace(".", "").replace(" ", "").replace("\xa0","")
-    val = val.replace(",", ".")
-    try:
-        return float(val)
-    except Exception:
-        return None
-
 def extract_salary_max(text: str) -> float | None:
     """Retorna o MAIOR salário (em R$) encontrado no texto."""
-    if not text:
-        return None
-    mx = None
-    for m in SAL_PAT.finditer(text):
-        a = money_to_float(m.group(1))
-        b = money_to_float(m.group(2)) if m.group(2) else None
-        cand = max([x for x in (a, b) if isinstance(x, (int,float))], default=None)
-        if cand is not None:
-            mx = cand if (mx is None or cand > mx) else mx
-    return mx
-
-def parse_dates_from_text(text: str) -> tuple[date|None, date|None, str|None]:
-    """Tenta extrair intervalo/última data (numérico e textual)."""
-    if not text:
-        return None, None, None
-    text_norm = norm(text)
-
-    # 1) datas numéricas
-    nums = re.findall(r"(\d{1,2})[/-](\d{1,2})[/-](\d{2,4})", text_norm)
-    dates = []
-    for d, m, y in nums:
-        dd = int(d); mm = int(m); yy = int(y)
-        if yy < 100: yy += 2000
-        try:
-            dates.append(date(yy, mm, dd))
-        except Exception:
-            pass
-
-    # 2) datas textuais
-    for d, mon, y in DATE_TEXT_PAT.findall(text_norm):
-        mm = MONTHS.get(mon.lower(), None)
-        if mm:
-            try:
-                dates.append(date(int(y), mm, int(d)))
-            except Exception:
-                pass
-
-    if not dates:
-        # nenhuma ISO possível
-        return None, None, None
-
-    # heurística: usa menor como início e maior como fim
-    d_start = min(dates)
-    d_end   = max(dates)
-    return d_start, d_end, None  # deadline_text já está no texto original
-
-def get(url: str) -> requests.Response:
-    r = requests.get(url, headers=HEADERS, timeout=60)
-    r.raise_for_status()
-    return r
-
-def parse_list():
-    r = get(LIST_URL)
-    soup = BeautifulSoup(r.text, "html.parser")
-    candidates, seen = [], set()
-
+    with metrics.timer("regex.salary"):
+        return extract.salary_max(text)
+
+def parse_list(max_pages: int = MAX_LIST_PAGES, workers: int = LIST_WORKERS) -> tuple[list[dict], int]:
+    """Itens de concursos/ e das listagens que ela alcança; devolve (itens, páginas lidas)."""
+    return paginate.crawl([LIST_URL], fetch_list_page, max_pages=max_pages,
+                          max_items=MAX_ITEMS, workers=workers, name="pci")
+
+def fetch_list_page(url: str) -> tuple[list[dict], list[str]]:
+    throttle(url, 1.0 / SLEEP_BETWEEN, BURST)
+    return parse_list_page(get(url).text, url)
+
+def parse_list_html(html: str) -> list[dict]:
+    return parse_list_page(html)[0]
+
+def parse_list_page(html: str, page_url: str | None = None) -> tuple[list[dict], list[str]]:
+    """(itens, links para outras páginas de listagem) de uma página."""
+    with metrics.timer("pci.parse.list"):
+        soup = make_soup(html)
+        return _list_items(soup), _list_links(soup, page_url or LIST_URL)
+
+def _list_links(soup, page_url: str) -> list[str]:
+    host = urlparse(page_url).netloc
+    links = []
+    for a in soup.select("a[href]"):
+        url = urljoin(page_url, a.get("href") or "").split("#")[0]
+        u = urlparse(url)
+        if u.netloc == host and LIST_PAGE_PAT.match(u.path) and url not in links:
+            links.append(url)
+    return links
+
+def _row_of(a):
+    """Elemento da linha do item: div.ca; fora dela, o article/li/div mais próximo."""
+    return a.find_parent("div", class_=ROW_CLASS) or a.find_parent(["article", "li", "div"])
+
+def _list_items(soup) -> list[dict]:
+    """Itens da listagem agrupados pela linha (_row_of). Texto e prazo de cada linha
+    são calculados uma única vez; linha com mais de um item (ex. o <div> das notícias)
+    é marcada shared: o resumo e a data dela não são de nenhum item em particular."""
+    anchors, seen = [], set()
+    row_urls: dict[int, set[str]] = {}
     for a in soup.select("a[href]"):
         href = a.get("href") or ""
         title = norm(a.get_text())
@@ -163,40 +138,54 @@ def parse_list():
         url = urljoin(BASE, href) if href.startswith("/") else href
         if not ("/noticias/" in url or "/concursos/" in url):
             continue
-        if looks_like_menu(title, url):
+        if not metrics.count("pci.menu", kept=not looks_like_menu(title, url)):
             continue
 
-        parent = a.find_parent(["article","li","div"])
-        wrap_text = norm(parent.get_text()) if parent else title
-
-        deadline_guess = None
-        m = DATE_PAT.search(wrap_text)
-        if m:
-            deadline_guess = norm(m.group(1))
-
         key = (title.lower(), url)
         if key in seen: 
             continue
         seen.add(key)
+        row = _row_of(a)
+        if row is not None:
+            row_urls.setdefault(id(row), set()).add(url)
+        anchors.append((title, url, row))
+
+    candidates = []
+    rows: dict[int, tuple[str, str | None]] = {}
+    for title, url, row in anchors[:MAX_ITEMS]:
+        cached = rows.get(id(row)) if row is not None else None
+        if cached is None:
+            wrap_text = norm(row.get_text()) if row is not None else title
+            cached = (wrap_text, metrics.timed("regex.deadline", dates.find_deadline_text, wrap_text))
+            if row is not None:
+                rows[id(row)] = cached
+        wrap_text, deadline_guess = cached
+        shared = row is not None and len(row_urls[id(row)]) > 1
 
         candidates.append({
             "title": title[:200],
             "url": url,
             "summary": wrap_text[:1000],
-            "deadline_guess": deadline_guess,
+            "deadline_guess": None if shared else deadline_guess,
+            "shared": shared,
         })
-        if len(candidates) >= MAX_ITEMS:
-            break
     return candidates
 
 def parse_detail(url: str) -> tuple[str, str]:
     """Retorna (description, deadline_text_melhorado)."""
     try:
-        time.sleep(SLEEP_BETWEEN)
+        throttle(url, 1.0 / SLEEP_BETWEEN, BURST)
         r = get(url)
     except Exception:
         return "", ""
-    soup = BeautifulSoup(r.text, "html.parser")
+    return parse_detail_html(r.text)
+
+def parse_detail_html(html: str) -> tuple[str, str]:
+    with metrics.timer("pci.parse.detail"):
+        return _parse_detail_html(html)
+
+def _parse_detail_html(html: str) -> tuple[str, str]:
+    soup = make_soup(html)
 
     article = (soup.select_one("article")
                or soup.select_one("div#content")
@@ -205,52 +194,152 @@ def parse_detail(url: str) -> tuple[str, str]:
                or soup.select_one("div[id*='conteudo'], div[class*='conteudo']"))
 
     if article:
-        tx = " ".join(norm(p.get_text()) for p in article.find_all(["p","li"]) if norm(p.get_text()))
+        tx = " ".join(filter(None, (norm(p.get_text()) for p in article.find_all(["p","li"]))))
         raw = norm(article.get_text(separator=" "))
     else:
-        tx = " ".join(norm(p.get_text()) for p in soup.find_all("p") if norm(p.get_text()))
+        tx = " ".join(filter(None, (norm(p.get_text()) for p in soup.find_all("p"))))
         raw = norm(soup.get_text())
 
     # tenta achar texto de prazo mais confiável
-    m = DATE_PAT.search(raw) or DATE_PAT.search(tx)
-    deadline_text = norm(m.group(1)) if m else ""
+    with metrics.timer("regex.deadline"):
+        deadline_text = dates.find_deadline_text(raw) or dates.find_deadline_text(tx) or ""
     description = tx if tx else raw
     return description[:15000], deadline_text
 
-def main():
-    today = date.today()
-    items = parse_list()
-
-    for it in items:
-        desc, deadline_detail_text = parse_detail(it["url"])
-        # texto para analisar salário
-        text_for_salary = " ".join([it.get("summary",""), desc])
-
-        salary_max = extract_salary_max(text_for_salary)
-        if salary_max is None or salary_max < MIN_SALARY:
-            continue  # pula salários abaixo do corte ou ausentes
-
-        # prioridade: prazo do detalhe; fallback: prazo da lista
-        deadline_text = deadline_detail_text or it.get("deadline_guess") or ""
-        d_start, d_end, _ = parse_dates_from_text(deadline_text)
-
-        # precisa ter data final válida e estar >= hoje
-        if not d_end or d_end < today:
-            continue
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Scraper PCI Concursos (JSONL)")
+    ap.add_argument("--workers", type=int, default=WORKERS,
+                    help="detalhes buscados em paralelo (1 = sequencial)")
+    ap.add_argument("--no-prefilter", dest="prefilter", action="store_false", default=PREFILTER,
+                    help="baixa o detalhe de todos os itens, sem filtrar pela listagem")
+    http_client.add_cli_args(ap)
+    html_parser.add_cli_args(ap)
+    state_index.add_cli_args(ap)
+    checkpoint.add_cli_args(ap)
+    paginate.add_cli_args(ap)
+    metrics.add_cli_args(ap)
+    return ap.parse_args(argv)
+
+def build_record(it: dict, desc: str, deadline_detail_text: str, today: date) -> dict | None:
+    """Aplica os filtros de salário/prazo; retorna o registro de saída ou None."""
+    # texto para analisar salário (o resumo de linha compartilhada é de vários itens)
+    text_for_salary = desc if it.get("shared") else " ".join([it.get("summary",""), desc])
+
+    salary_max = extract_salary_max(text_for_salary)
+    if not metrics.count("pci.salary", kept=salary_max is not None and salary_max >= MIN_SALARY):
+        return None  # pula salários abaixo do corte ou ausentes
+
+    # prioridade: prazo do detalhe; fallback: prazo da lista
+    deadline_text = deadline_detail_text or it.get("deadline_guess") or ""
+    d_start, d_end = metrics.timed("regex.deadline", dates.parse_range, deadline_text, today)
+
+    # precisa ter data final válida e estar >= hoje
+    if not metrics.count("pci.deadline", kept=bool(d_end) and d_end >= today):
+        return None
 
-        out = {
-            "title": it["title"],
-            "url": it["url"],
-            "source": "PCI Concursos",
-            "kind": "Concurso",
-            "deadline": deadline_text or None,
-            "deadline_end_iso": d_end.isoformat(),
-            "salary_max": salary_max,
-            "location": "",
-            "summary": it["summary"][:800],
-            "description": desc,
-        }
-        print(json.dumps(out, ensure_ascii=False))
+    return {
+        "title": it["title"],
+        "url": it["url"],
+        "source": "PCI Concursos",
+        "kind": "Concurso",
+        "deadline": deadline_text or None,
+        "deadline_end_iso": d_end.isoformat(),
+        "deadline_iso_start": d_start.isoformat() if d_start else None,
+        "deadline_iso_end": d_end.isoformat(),
+        "salary_max": salary_max,
+        "location": "",
+        "summary": it["summary"][:800],
+        "description": desc,
+    }
+
+def prefilter(it: dict, today: date) -> str | None:
+    """Decide pela listagem: 'salary'/'deadline' = descartar; None = segue para o detalhe.
+    A linha do PCI traz o teto salarial ("até R$ ...") e o período de inscrição;
+    item de linha compartilhada fica indefinido (o salário e a data podem ser de outro)."""
+    if it.get("shared"):
+        return None
+    salary = extract_salary_max(it.get("summary", ""))
+    if not metrics.count("pci.prefilter.salary", kept=salary is None or salary >= MIN_SALARY):
+        return "salary"
+    _, d_end = metrics.timed("regex.deadline", dates.parse_range, it.get("deadline_guess") or "", today)
+    if not metrics.count("pci.prefilter.deadline", kept=not d_end or d_end >= today):
+        return "deadline"
+    return None
+
+def scrape(args):
+    """Gera os registros filtrados, na ordem da listagem."""
+    today = date.today()
+    items, pages = parse_list(args.list_pages or MAX_LIST_PAGES)
+    index = StateIndex("pci")
+    ckpt = Checkpoint("pci", resume=args.resume)
+    stats = {"paginas": pages, "listagem": len(items), "pre_salario": 0, "pre_prazo": 0,
+             "detalhe_baixado": 0, "detalhe_indice": 0, "retomados": 0,
+             "novos": 0, "alterados": 0, "inalterados": 0, "emitidos": 0}
+
+    # busca os detalhes em paralelo, mas consome na ordem da lista:
+    # a saída JSONL continua determinística
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            jobs = []
+            for it in items:
+                if it["url"] in ckpt:  # concluído antes da interrupção
+                    jobs.append((it, None, None))
+                    continue
+                if args.prefilter:
+                    reason = prefilter(it, today)
+                    if reason:
+                        stats["pre_salario" if reason == "salary" else "pre_prazo"] += 1
+                        continue
+                h = state_index.content_hash(it["title"], it["summary"], it.get("deadline_guess"))
+                known = None if args.full else index.lookup(it["url"], h)
+                if known is not None and args.only_new:
+                    continue
+                if known is not None and index.expired(it["url"], args.detail_max_age):
+                    known = None  # baixa de novo: a página do edital pode ter mudado sozinha
+                job = known if known is not None else pool.submit(parse_detail, it["url"])
+                jobs.append((it, h, job))
+
+            for it, h, job in jobs:
+                if job is None:
+                    stats["retomados"] += 1
+                    out = ckpt.get(it["url"])
+                    if out and not (args.only_changed and out.get("change") == "unchanged"):
+                        stats["emitidos"] += 1
+                        yield out
+                    continue
+                if isinstance(job, dict):
+                    desc, deadline_detail_text = job["description"], job["deadline"]
+                    stats["detalhe_indice"] += 1
+                else:
+                    desc, deadline_detail_text = job.result()
+                    stats["detalhe_baixado"] += 1
+                    if desc:  # falha de download não entra no índice
+                        index.put(it["url"], h, {"description": desc, "deadline": deadline_detail_text})
+                out = build_record(it, desc, deadline_detail_text, today)
+                if out and desc:  # sem detalhe, a impressão digital não diz nada
+                    change = index.track(out)
+                    stats[{"new": "novos", "changed": "alterados"}.get(change, "inalterados")] += 1
+                    if args.only_changed and change == "unchanged":
+                        out = None
+                if desc:  # falha de download fica fora do checkpoint: --resume tenta de novo
+                    ckpt.mark(it["url"], out)
+                if out:
+                    stats["emitidos"] += 1
+                    yield out
+        ckpt.finish()
+    finally:
+        ckpt.save()
+        index.close()
+        print("pci: " + ", ".join(f"{k}={v}" for k, v in stats.items()), file=sys.stderr)
+
+def main(argv=None):
+    args = parse_args(argv)
+    http_client.apply_cli_args(args)
+    html_parser.apply_cli_args(args)
+    metrics.apply_cli_args(args)
+    with JsonlWriter(source="pci") as out:
+        for rec in scrape(args):
+            out.write(rec)
 
 if __name__ == "__main__":
     main()
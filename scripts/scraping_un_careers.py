@@ -1,53 +1,81 @@
 # scraping_un_careers.py
-import json, re
+import re
 import sys
+import argparse
 sys.stdout.reconfigure(encoding='utf-8')
-from playwright.sync_api import sync_playwright
+import browser_pool
+import dates
+import metrics
+from extract import norm
+from jsonl_writer import JsonlWriter
 
 BASE = "https://careers.un.org"
+MAX_CARDS = 120
 
-def norm(s): 
-    return re.sub(r"\s+", " ", (s or "").strip())
+# href, texto e texto do contêiner de todos os cards numa única chamada
+CARDS_JS = """(els, max) => els.slice(0, max).map(a => ({
+    href: a.getAttribute('href') || '',
+    text: a.innerText || '',
+    box: a.closest('div')?.innerText || ''
+}))"""
 
-def run():
-    out = []
-    with sync_playwright() as p:
-        b = p.chromium.launch(headless=True)
-        page = b.new_page()
-        page.goto(BASE + "/jobopening", timeout=120000)
-        page.wait_for_load_state("domcontentloaded")
+LOC_PAT = re.compile(r"(?i)(?:Duty Station|Location)\W{0,5}([\w ,/-]+)")
+
+def parse_args(argv=None):
+    ap = argparse.ArgumentParser(description="Scraper UN Careers (JSONL)")
+    metrics.add_cli_args(ap)
+    return ap.parse_args(argv)
+
+async def scrape_async(pool, args=None):
+    """Gera um registro por card, assim que ele é processado."""
+    async with pool.page() as page:
+        with metrics.timer("browser.goto"):
+            await page.goto(BASE + "/jobopening", timeout=120000)
+            await page.wait_for_load_state("domcontentloaded")
         # os cards costumam ter anchors para jobdetail
-        cards = page.locator("a[href*='jobdetail']").element_handles()
-        for a in cards[:120]:
-            href = a.get_attribute("href") or ""
-            if href.startswith("/"):
-                href = BASE + href
-            title = norm(a.inner_text())
-            if not title:
-                # alternativa: extrair do contêiner
-                title = norm(a.evaluate("el => el.closest('div')?.innerText || ''"))
-            # tenta capturar dados ao redor (deadline, duty station)
-            box = a.evaluate("el => el.closest('div')?.innerText || ''") or ""
-            deadline = None
-            m = re.search(r"(?i)(Deadline|Closing|Closes)\\D{0,10}([\\w\\s,:-]+\\d{4})", box)
-            if m:
-                deadline = norm(m.group(2))
-            loc = None
-            m2 = re.search(r"(?i)(Duty Station|Location)\\D{0,5}([\\w\\s,/-]+)", box)
-            if m2:
-                loc = norm(m2.group(2))
-            out.append({
-                "title": title[:200],
-                "url": href,
-                "source": "UN Careers",
-                "kind": "Internacional",
-                "deadline": deadline,
-                "location": loc or "",
-                "summary": norm(box)[:800]
-            })
-        b.close()
-    for it in out:
-        print(json.dumps(it, ensure_ascii=False))
+        with metrics.timer("browser.eval"):
+            cards = await page.eval_on_selector_all("a[href*='jobdetail']", CARDS_JS, MAX_CARDS)
+        for a in cards:
+            with metrics.timer("un.parse.card"):
+                rec = parse_card(a)
+            yield rec
+
+def parse_card(a: dict) -> dict:
+    href = a["href"]
+    if href.startswith("/"):
+        href = BASE + href
+    # tenta capturar dados ao redor (deadline, duty station)
+    box = a["box"]
+    title = norm(a["text"])
+    if not title:
+        # alternativa: extrair do contêiner
+        title = norm(box)
+    with metrics.timer("regex.deadline"):
+        deadline = dates.find_deadline_text(box, require_keyword=True)
+    loc = None
+    m2 = LOC_PAT.search(box)
+    if m2:
+        loc = norm(m2.group(1))
+    return {
+        "title": title[:200],
+        "url": href,
+        "source": "UN Careers",
+        "kind": "Internacional",
+        "deadline": deadline,
+        **dates.deadline_fields(deadline),
+        "location": loc or "",
+        "summary": norm(box)[:800]
+    }
+
+def scrape(args=None):
+    return browser_pool.iterate(scrape_async, args)
+
+def run(argv=None):
+    args = parse_args(argv)
+    metrics.apply_cli_args(args)
+    with JsonlWriter(source="un") as out:
+        for it in scrape(args):
+            out.write(it)
 
 if __name__ == "__main__":
     run()
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Índice local de estado (SQLite) para scraping incremental.
+- chave: (fonte, URL canônica)
+- guarda o hash do conteúdo da LISTAGEM e o resultado do parse_detail()
+- se o item da listagem não mudou, o scraper reaproveita o detalhe guardado
+  (ou pula o item com --only-new) em vez de baixar a página de novo
+- detalhe guardado há mais de DETAIL_MAX_AGE_HOURS (--detail-max-age) é
+  baixado de novo mesmo assim: prorrogação que só aparece na página do
+  edital não ficaria invisível para sempre; pelo cache HTTP (GET
+  condicional) a página que não mudou volta como 304, sem corpo
+- impressão digital do REGISTRO emitido (prazo, situação, salário, descrição):
+  cada registro sai com change = new | changed | unchanged em relação à
+  última versão ENTREGUE, e --only-changed omite os inalterados — edital
+  retificado (prazo prorrogado, situação que deixa de ser "aberta") segue
+  adiante sem reprocessar tudo
+- a coleta só guarda a impressão digital vista (e a leva no registro, campo
+  fingerprint); ela passa a valer como entregue quando o notion_sink cria ou
+  atualiza a página (confirm). Falha no classify ou no Notion deixa o item
+  new/changed e ele sai de novo na próxima coleta, em vez de virar unchanged
+
+Arquivo padrão: scripts/.cache/state.sqlite (ou variável SCRAPER_STATE).
+"""
+
+import os
+import re
+import time
+import json
+import hashlib
+import sqlite3
+import argparse
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# --------- Config ---------
+STATE_PATH = os.environ.get(
+    "SCRAPER_STATE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "state.sqlite"),
+)
+DETAIL_MAX_AGE_HOURS = 24   # idade máxima do detalhe reaproveitado
+# --------------------------
+
+TRACKING_PARAMS = ("utm_", "fbclid", "gclid")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS state (
+    source     TEXT NOT NULL,
+    url        TEXT NOT NULL,
+    hash       TEXT NOT NULL,
+    payload    TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen  REAL NOT NULL,
+    fetched    REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (source, url)
+);
+CREATE TABLE IF NOT EXISTS records (
+    source      TEXT NOT NULL,
+    url         TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    first_seen  REAL NOT NULL,
+    last_seen   REAL NOT NULL,
+    changed_at  REAL NOT NULL,
+    delivered   TEXT,
+    PRIMARY KEY (source, url)
+)
+"""
+# campos do registro que, quando mudam, fazem o item seguir de novo adiante
+FINGERPRINT_FIELDS = ("deadline", "status", "salary_max", "description")
+
+def canonical_url(url: str) -> str:
+    """Normaliza a URL: esquema/host minúsculos, sem fragmento, porta padrão,
+    parâmetros de rastreamento nem barra final; query ordenada."""
+    u = urlsplit((url or "").strip())
+    scheme = u.scheme.lower()
+    host = (u.hostname or "").lower()
+    if u.port and not ((scheme, u.port) in (("http", 80), ("https", 443))):
+        host = f"{host}:{u.port}"
+    path = u.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/")
+    query = sorted((k, v) for k, v in parse_qsl(u.query, keep_blank_values=True)
+                   if not k.lower().startswith(TRACKING_PARAMS))
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+def content_hash(*parts) -> str:
+    """Hash estável de textos (espaços normalizados, caixa ignorada)."""
+    h = hashlib.sha1()
+    for p in parts:
+        h.update(re.sub(r"\s+", " ", str(p or "")).strip().lower().encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+def record_fingerprint(rec: dict) -> str:
+    """Impressão digital do conteúdo do registro (FINGERPRINT_FIELDS normalizados)."""
+    return content_hash(*(rec.get(k) for k in FINGERPRINT_FIELDS))
+
+def _connect(path: str) -> sqlite3.Connection:
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    db = sqlite3.connect(path)
+    db.executescript(SCHEMA)
+    columns = [r[1] for r in db.execute("PRAGMA table_info(state)")]
+    if "fetched" not in columns:  # índice de antes da idade máxima: tudo vencido
+        with db:
+            db.execute("ALTER TABLE state ADD COLUMN fetched REAL NOT NULL DEFAULT 0")
+    columns = [r[1] for r in db.execute("PRAGMA table_info(records)")]
+    if "delivered" not in columns:  # antes a impressão vista já valia como entregue
+        with db:
+            db.execute("ALTER TABLE records ADD COLUMN delivered TEXT")
+            db.execute("UPDATE records SET delivered = fingerprint")
+    return db
+
+def confirm(url: str, fingerprint: str, path: str = STATE_PATH) -> bool:
+    """Marca a versão `fingerprint` do registro como entregue (página criada ou
+    atualizada). Não faz nada se desde então a coleta já viu outra versão."""
+    db = _connect(path)
+    try:
+        with db:
+            cur = db.execute("UPDATE records SET delivered = fingerprint "
+                             "WHERE url = ? AND fingerprint = ?", (canonical_url(url), fingerprint))
+        return cur.rowcount > 0
+    finally:
+        db.close()
+
+class StateIndex:
+    def __init__(self, source: str, path: str = STATE_PATH):
+        self.source = source
+        self.db = _connect(path)
+
+    def lookup(self, url: str, h: str) -> dict | None:
+        """Detalhe guardado para `url`, se o hash da listagem ainda é `h`."""
+        row = self.db.execute(
+            "SELECT hash, payload FROM state WHERE source = ? AND url = ?",
+            (self.source, canonical_url(url)),
+        ).fetchone()
+        if not row or row[0] != h:
+            return None
+        with self.db:
+            self.db.execute("UPDATE state SET last_seen = ? WHERE source = ? AND url = ?",
+                            (time.time(), self.source, canonical_url(url)))
+        return json.loads(row[1])
+
+    def expired(self, url: str, max_age_hours: float = DETAIL_MAX_AGE_HOURS) -> bool:
+        """True se o detalhe de `url` foi baixado há mais de max_age_hours (ou nunca)."""
+        row = self.db.execute(
+            "SELECT fetched FROM state WHERE source = ? AND url = ?",
+            (self.source, canonical_url(url)),
+        ).fetchone()
+        return not row or time.time() - row[0] > max_age_hours * 3600
+
+    def put(self, url: str, h: str, payload: dict) -> None:
+        now = time.time()
+        with self.db:
+            self.db.execute(
+                "INSERT INTO state VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(source, url) DO UPDATE SET "
+                "hash = excluded.hash, payload = excluded.payload, "
+                "last_seen = excluded.last_seen, fetched = excluded.fetched",
+                (self.source, canonical_url(url), h,
+                 json.dumps(payload, ensure_ascii=False), now, now, now),
+            )
+
+    def track(self, rec: dict) -> str:
+        """Compara o registro com a última versão entregue e grava a impressão vista
+        (sem confirmar a entrega: ver confirm). Preenche rec["fingerprint"] e
+        rec["change"] e devolve este: 'new', 'changed' ou 'unchanged'."""
+        url, fp, now = canonical_url(rec["url"]), record_fingerprint(rec), time.time()
+        row = self.db.execute(
+            "SELECT delivered FROM records WHERE source = ? AND url = ?",
+            (self.source, url),
+        ).fetchone()
+        change = ("new" if not row or row[0] is None
+                  else "unchanged" if row[0] == fp else "changed")
+        with self.db:
+            self.db.execute(
+                "INSERT INTO records VALUES (?, ?, ?, ?, ?, ?, NULL) "
+                "ON CONFLICT(source, url) DO UPDATE SET "
+                "fingerprint = excluded.fingerprint, last_seen = excluded.last_seen, "
+                "changed_at = CASE WHEN fingerprint = excluded.fingerprint "
+                "THEN changed_at ELSE excluded.changed_at END",
+                (self.source, url, fp, now, now, now),
+            )
+        rec["fingerprint"] = fp
+        rec["change"] = change
+        return change
+
+    def changes_since(self, t: float) -> tuple[int, int]:
+        """(novos, alterados) vistos pela coleta desde `t`, entregues ou não."""
+        row = self.db.execute(
+            "SELECT COALESCE(SUM(first_seen >= ?), 0), "
+            "COALESCE(SUM(first_seen < ? AND changed_at >= ?), 0) "
+            "FROM records WHERE source = ?", (t, t, t, self.source),
+        ).fetchone()
+        return row[0], row[1]
+
+    def close(self) -> None:
+        self.db.close()
+
+def add_cli_args(ap: argparse.ArgumentParser) -> None:
+    ap.add_argument("--full", action="store_true",
+                    help="ignora o índice de estado e baixa todos os detalhes")
+    ap.add_argument("--detail-max-age", type=float, default=DETAIL_MAX_AGE_HOURS, metavar="HORAS",
+                    help="detalhe guardado há mais tempo é baixado de novo (GET condicional: "
+                         "304 se a página não mudou)")
+    ap.add_argument("--only-new", action="store_true",
+                    help="não emite itens já conhecidos e sem mudança na listagem")
+    ap.add_argument("--only-changed", action="store_true",
+                    help="emite só registros novos ou alterados (prazo, situação, "
+                         "salário, descrição) desde a última coleta")
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""
+Cache HTTP (http_cache.py + http_client.get) contra um servidor local:
+- 304: o cliente manda If-None-Match/If-Modified-Since e reaproveita o corpo
+- página mudou: 200 com o corpo novo, que substitui o guardado
+- --refresh: baixa sem cabeçalhos condicionais e regrava o cache
+- despejo por idade (used_at) e por tamanho total (LRU)
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import time
+import sqlite3
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "scripts"))
+
+import http_client                # noqa: E402
+from http_cache import HttpCache  # noqa: E402
+
+LAST_MODIFIED = "Wed, 01 Oct 2026 12:00:00 GMT"
+
+class Site:
+    """Estado do servidor: versão da página e o que ele recebeu."""
+    etag = '"v1"'
+    body = "<html><p>Inscrições até 15/12/2026</p></html>"
+    requests: list[dict] = []
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *a):
+        pass
+
+    def do_GET(self):
+        Site.requests.append({"path": self.path,
+                              "if_none_match": self.headers.get("If-None-Match"),
+                              "if_modified_since": self.headers.get("If-Modified-Since")})
+        if self.path == "/sem-validador":
+            return self._send(200, b"sem ETag nem Last-Modified", {})
+        if self.headers.get("If-None-Match") == Site.etag:
+            self.send_response(304)
+            self.send_header("ETag", Site.etag)
+            self.end_headers()
+            return
+        self._send(200, Site.body.encode("utf-8"),
+                   {"ETag": Site.etag, "Last-Modified": LAST_MODIFIED,
+                    "Content-Type": "text/html; charset=utf-8"})
+
+    def _send(self, code: int, body: bytes, headers: dict):
+        self.send_response(code)
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class HttpCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        http_client.use_cache(False)
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "http.sqlite")
+        Site.etag, Site.body, Site.requests = '"v1"', "<html><p>Inscrições até 15/12/2026</p></html>", []
+        http_client.use_cache(path=self.path)
+
+    def tearDown(self):
+        http_client.use_cache(False)
+        self.tmp.cleanup()
+
+    def test_304_reuses_stored_body(self):
+        first = http_client.get(self.base + "/edital")
+        second = http_client.get(self.base + "/edital")
+        self.assertEqual(first.status_code, 200)
+        self.assertIsNone(Site.requests[0]["if_none_match"])
+        self.assertEqual(Site.requests[1]["if_none_match"], '"v1"')
+        self.assertEqual(Site.requests[1]["if_modified_since"], LAST_MODIFIED)
+        self.assertEqual(second.status_code, 200)
+        self.assertTrue(getattr(second, "from_cache", False))
+        self.assertEqual(second.text, first.text)
+        self.assertIn("15/12/2026", second.text)
+
+    def test_changed_page_replaces_stored_body(self):
+        http_client.get(self.base + "/edital")
+        Site.etag, Site.body = '"v2"', "<html><p>Inscrições prorrogadas até 20/12/2026</p></html>"
+        r = http_client.get(self.base + "/edital")
+        self.assertFalse(getattr(r, "from_cache", False))
+        self.assertIn("20/12/2026", r.text)
+        r = http_client.get(self.base + "/edital")  # agora revalida com a versão nova
+        self.assertEqual(Site.requests[-1]["if_none_match"], '"v2"')
+        self.assertTrue(getattr(r, "from_cache", False))
+        self.assertIn("20/12/2026", r.text)
+
+    def test_refresh_skips_validators_and_rewrites(self):
+        http_client.get(self.base + "/edital")
+        Site.body = "<html><p>versão nova com o mesmo ETag</p></html>"
+        http_client.use_cache(refresh=True, path=self.path)
+        r = http_client.get(self.base + "/edital")
+        self.assertIsNone(Site.requests[-1]["if_none_match"])
+        self.assertIsNone(Site.requests[-1]["if_modified_since"])
+        self.assertIn("versão nova", r.text)
+        http_client.use_cache(path=self.path)  # leitura normal: o 304 devolve o corpo regravado
+        r = http_client.get(self.base + "/edital")
+        self.assertTrue(getattr(r, "from_cache", False))
+        self.assertIn("versão nova", r.text)
+
+    def test_no_cache_sends_no_validators(self):
+        http_client.get(self.base + "/edital")
+        http_client.use_cache(False)
+        http_client.get(self.base + "/edital")
+        self.assertIsNone(Site.requests[-1]["if_none_match"])
+
+    def test_page_without_validators_is_not_stored(self):
+        http_client.get(self.base + "/sem-validador")
+        http_client.get(self.base + "/sem-validador")
+        self.assertIsNone(Site.requests[-1]["if_none_match"])
+
+class EvictionTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "http.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _set_used_at(self, url: str, when: float) -> None:
+        db = sqlite3.connect(self.path)
+        with db:
+            db.execute("UPDATE http_cache SET used_at = ? WHERE url = ?", (when, url))
+        db.close()
+
+    def test_evicts_entries_unused_for_too_long(self):
+        cache = HttpCache(self.path, max_age_days=1)
+        cache.store("http://x/velha", {"etag": '"a"'}, "utf-8", b"a" * 10)
+        cache.store("http://x/nova", {"etag": '"b"'}, "utf-8", b"b" * 10)
+        cache.close()
+        self._set_used_at("http://x/velha", time.time() - 2 * 86400)
+        cache = HttpCache(self.path, max_age_days=1)  # despeja ao abrir
+        self.assertIsNone(cache.lookup("http://x/velha"))
+        self.assertEqual(cache.lookup("http://x/nova")["body"], b"b" * 10)
+        cache.close()
+
+    def test_evicts_least_recently_used_over_max_bytes(self):
+        cache = HttpCache(self.path, max_bytes=250)
+        for i, url in enumerate(("http://x/1", "http://x/2", "http://x/3")):
+            cache.store(url, {"etag": f'"{i}"'}, "utf-8", bytes([48 + i]) * 100)
+        cache.close()
+        now = time.time()
+        self._set_used_at("http://x/1", now - 30)
+        self._set_used_at("http://x/2", now - 10)
+        self._set_used_at("http://x/3", now - 20)
+        cache = HttpCache(self.path, max_bytes=250)
+        self.assertIsNone(cache.lookup("http://x/1"))   # a menos usada sai primeiro
+        self.assertIsNotNone(cache.lookup("http://x/2"))
+        self.assertIsNotNone(cache.lookup("http://x/3"))
+        cache.touch("http://x/3")
+        cache.store("http://x/4", {"etag": '"4"'}, "utf-8", b"4" * 100)
+        cache.evict()
+        self.assertIsNone(cache.lookup("http://x/2"))
+        self.assertIsNotNone(cache.lookup("http://x/3"))
+        self.assertIsNotNone(cache.lookup("http://x/4"))
+        cache.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+NotionWriter (notion_sink.py) contra uma API do Notion simulada num
+http.server local (NOTION_API_URL):
+- recusa mais de 100 blocos por requisição e rich_text acima de 2000 caracteres
+- responde 429 (Retry-After) a cada 4ª criação de página
+- em algumas criações só responde depois do timeout do cliente (a página
+  já foi criada): o cliente precisa achá-la pelo Link em vez de recriar
+- atualização com descrição nova troca os parágrafos do corpo
+
+Confere que não há página duplicada e que o corpo chega inteiro.
+
+Uso:
+    python -m unittest discover tests
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "scripts"))
+
+import notion_api                       # noqa: E402
+from notion_sink import NotionWriter    # noqa: E402
+
+CLIENT_TIMEOUT = 0.5   # s: o timeout de leitura do cliente durante o teste
+SLOW_REPLY = 1.2       # s: resposta atrasada das criações "lentas"
+
+class Notion:
+    """Estado da API simulada."""
+    lock = threading.Lock()
+    pages: dict[str, dict] = {}          # id -> {"link", "properties", "blocks"}
+    creates = 0
+    rate_limited = 0
+    rejected: list[str] = []
+    slow_links: set[str] = set()         # criação responde depois do timeout
+    failing_appends: set[str] = set()    # links cujo append dá 500
+
+    @classmethod
+    def reset(cls):
+        cls.pages, cls.creates, cls.rate_limited, cls.rejected = {}, 0, 0, []
+        cls.slow_links, cls.failing_appends = set(), set()
+
+    @classmethod
+    def by_link(cls, link: str) -> list[dict]:
+        return [p for p in cls.pages.values() if p["link"] == link]
+
+def invalid(body: dict) -> str | None:
+    if len(body.get("children") or []) > notion_api.MAX_CHILDREN:
+        return "children > 100"
+
+    def walk(o):
+        if isinstance(o, dict):
+            if isinstance(o.get("content"), str) and len(o["content"]) > 2000:
+                return "content > 2000"
+            return next(filter(None, map(walk, o.values())), None)
+        if isinstance(o, list):
+            return next(filter(None, map(walk, o)), None)
+        return None
+    return walk(body)
+
+def stored_blocks(children: list[dict]) -> list[dict]:
+    return [{"id": str(uuid.uuid4()), "type": "paragraph",
+             "paragraph": {"rich_text": [{"plain_text": t["text"]["content"]}
+                                         for t in b["paragraph"]["rich_text"]]}}
+            for b in children]
+
+class Handler(BaseHTTPRequestHandler):
+    def log_message(self, *a):
+        pass
+
+    def _reply(self, code: int, obj: dict, headers: dict | None = None):
+        body = json.dumps(obj).encode("utf-8")
+        try:
+            self.send_response(code)
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # o cliente desistiu (timeout): a página já foi criada
+
+    def _body(self) -> dict:
+        return json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+
+    def do_POST(self):
+        body = self._body()
+        if self.path.startswith("/v1/databases/"):
+            link = body["filter"]["url"]["equals"]
+            with Notion.lock:
+                found = [{"id": p["id"], "properties": p["properties"]} for p in Notion.by_link(link)]
+            return self._reply(200, {"results": found[:1], "has_more": False, "next_cursor": None})
+        if self.path == "/v1/pages":
+            bad = invalid(body)
+            link = body["properties"][notion_api.PROP_LINK]["url"]
+            with Notion.lock:
+                Notion.creates += 1
+                if bad:
+                    Notion.rejected.append(bad)
+                    return self._reply(400, {"code": "validation_error", "message": bad})
+                if Notion.creates % 4 == 0:
+                    Notion.rate_limited += 1
+                    return self._reply(429, {"code": "rate_limited"}, {"Retry-After": "0.2"})
+                pid = str(uuid.uuid4())
+                Notion.pages[pid] = {"id": pid, "link": link, "properties": body["properties"],
+                                     "blocks": stored_blocks(body.get("children") or [])}
+                slow = link in Notion.slow_links
+                Notion.slow_links.discard(link)
+            if slow:
+                time.sleep(SLOW_REPLY)
+            return self._reply(200, {"id": pid})
+        self._reply(404, {})
+
+    def do_PATCH(self):
+        body = self._body()
+        parts = self.path.split("/")
+        if self.path.startswith("/v1/pages/"):
+            with Notion.lock:
+                Notion.pages[parts[3]]["properties"].update(body["properties"])
+            return self._reply(200, {"id": parts[3]})
+        if self.path.startswith("/v1/blocks/") and self.path.endswith("/children"):
+            bad = invalid(body)
+            with Notion.lock:
+                page = Notion.pages[parts[3]]
+                if bad:
+                    Notion.rejected.append(bad)
+                    return self._reply(400, {"code": "validation_error", "message": bad})
+                if page["link"] in Notion.failing_appends:
+                    return self._reply(500, {"code": "internal_server_error"})
+                page["blocks"] += stored_blocks(body["children"])
+            return self._reply(200, {"results": []})
+        self._reply(404, {})
+
+    def do_GET(self):
+        u = urlparse(self.path)
+        q = parse_qs(u.query)
+        parts = u.path.split("/")
+        with Notion.lock:
+            blocks = list(Notion.pages[parts[3]]["blocks"])
+        start, n = int(q.get("start_cursor", ["0"])[0]), int(q.get("page_size", ["100"])[0])
+        more = start + n < len(blocks)
+        self._reply(200, {"results": blocks[start:start + n], "has_more": more,
+                          "next_cursor": str(start + n) if more else None})
+
+    def do_DELETE(self):
+        bid = self.path.rsplit("/", 1)[1]
+        with Notion.lock:
+            for page in Notion.pages.values():
+                page["blocks"] = [b for b in page["blocks"] if b["id"] != bid]
+        self._reply(200, {"id": bid, "archived": True})
+
+def body_text(page: dict) -> str:
+    return "".join(t["plain_text"] for b in page["blocks"] for t in b["paragraph"]["rich_text"])
+
+def item(i: int, size: int, **extra) -> dict:
+    desc = "".join(f"Parágrafo {k} do edital {i}. " for k in range(size // 25 + 1))[:size]
+    return {"title": f"Concurso {i}", "link": f"https://www.pciconcursos.com.br/noticias/c-{i}",
+            "source": "PCI Concursos", "kind": "Concurso", "summary": f"Resumo {i}",
+            "description": desc, "deadline_iso_end": "2026-12-15", **extra}
+
+class NotionSinkTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.saved = notion_api.NOTION_API_URL, notion_api.TIMEOUT
+        notion_api.NOTION_API_URL = f"http://127.0.0.1:{cls.server.server_port}/v1"
+        notion_api.TIMEOUT = CLIENT_TIMEOUT
+
+    @classmethod
+    def tearDownClass(cls):
+        notion_api.NOTION_API_URL, notion_api.TIMEOUT = cls.saved
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        Notion.reset()
+        self.writer = NotionWriter("db", token="teste", rate=50, burst=10)
+
+    def write_all(self, items: list[dict]) -> list[dict]:
+        with ThreadPoolExecutor(max_workers=3) as ex:  # como o main()
+            return list(ex.map(self.writer.write, items))
+
+    def test_creates_each_page_once_with_full_body(self):
+        items = [item(i, size) for i, size in
+                 enumerate((500, 1900, 1901, 250_000, 12_000, 3_000, 190_000, 800, 40, 7_000, 1, 5_000))]
+        Notion.slow_links = {items[1]["link"], items[3]["link"], items[7]["link"]}
+        results = self.write_all(items)
+
+        self.assertEqual([r["status"] for r in results], ["created"] * len(items), results)
+        self.assertEqual(Notion.rejected, [])
+        self.assertGreater(Notion.rate_limited, 0)
+        self.assertEqual(self.writer.rate_limited, Notion.rate_limited)
+        self.assertEqual(len(Notion.pages), len(items))
+        for it, res in zip(items, results):
+            pages = Notion.by_link(it["link"])
+            self.assertEqual(len(pages), 1, f"{it['link']} duplicada")
+            self.assertEqual(res["page_id"], pages[0]["id"])
+            self.assertEqual(body_text(pages[0]), it["description"])
+            self.assertEqual(res["blocks"], len(notion_api.chunks(it["description"])))
+
+    def test_update_replaces_body_when_description_changed(self):
+        old = item(1, 230_000)
+        self.assertEqual(self.writer.write(old)["status"], "created")
+        new = item(1, 30_000, change="changed")
+        new["description"] = "Prazo prorrogado. " + new["description"]
+        res = self.writer.write(new)
+        self.assertEqual(res["status"], "updated", res)
+        pages = Notion.by_link(old["link"])
+        self.assertEqual(len(pages), 1)
+        self.assertEqual(body_text(pages[0]), new["description"])
+
+    def test_update_with_same_description_keeps_body(self):
+        it = item(2, 4_000)
+        self.writer.write(it)
+        ids = [b["id"] for b in Notion.by_link(it["link"])[0]["blocks"]]
+        res = self.writer.write({**it, "change": "changed", "deadline_iso_end": "2026-12-20"})
+        self.assertEqual(res["status"], "updated")
+        page = Notion.by_link(it["link"])[0]
+        self.assertEqual([b["id"] for b in page["blocks"]], ids)
+        self.assertEqual(page["properties"][notion_api.PROP_DEADLINE]["date"]["start"], "2026-12-20")
+
+    def test_changed_item_without_page_is_created(self):
+        res = self.writer.write(item(3, 100, change="changed"))
+        self.assertEqual(res["status"], "created")
+        self.assertEqual(len(Notion.pages), 1)
+
+    def test_failed_append_is_partial_not_resent(self):
+        it = item(4, 250_000)
+        Notion.failing_appends = {it["link"]}
+        res = self.writer.write(it)
+        self.assertEqual(res["status"], "partial")
+        self.assertEqual(res["blocks"], notion_api.MAX_CHILDREN)
+        self.assertEqual(len(Notion.by_link(it["link"])), 1)
+
+if __name__ == "__main__":
+    unittest.main()